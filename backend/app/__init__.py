@@ -43,10 +43,34 @@ def create_app(config=None):
         }
     })
     
+    # 빠른 JSON 응답 직렬화 (orjson)
+    from app import json_provider
+    json_provider.init_app(app)
+    
+    # 쿼리/요청 지표 수집과 /metrics 엔드포인트
+    from app import metrics
+    metrics.init_app(app)
+    
+    # 읽기 복제본 사용 시 쓰기 직후 주 서버 읽기 쿠키 설정
+    from app.db import replicas
+    replicas.init_app(app)
+    
     # 라우트 등록
     from app.routes.report import report_bp
     app.register_blueprint(report_bp)
     
+    # 빌드된 정적 파일(static/dist/manifest.json) 사용 설정
+    from app import assets
+    assets.init_app(app)
+    
+    # 보고서 서버 렌더링(페이지 조각 조립) 설정
+    from app import rendering
+    rendering.init_app(app, template_dir)
+    
+    # CLI 명령 등록
+    from app.commands import register_commands
+    register_commands(app)
+    
     # 에러 핸들러
     @app.errorhandler(404)
     def not_found(error):
@@ -97,6 +121,41 @@ def create_app(config=None):
         # 2. 하나라도 없으면 에러
         if not patient_code or not birth_date:
             return render_template('error.html')
+        expected = f"{birth_date[0:4]}-{birth_date[4:6]}-{birth_date[6:8]}"
+
+        # 3. 보고서를 불러오기 전에 생년월일부터 확인 (틀린 요청은 인덱스 조회/캐시만 사용)
+        from app.services.verification_service import LOCKED, VERIFIED, get_patient_verifier
+
+        try:
+            result, retry_after = get_patient_verifier().verify(patient_code, expected)
+        except Exception as e:
+            print("Verification error:", e)
+            return render_template('error.html')
+
+        if result == LOCKED:
+            return render_template('error.html'), 429, {'Retry-After': str(retry_after)}
+        if result != VERIFIED:
+            return render_template('error.html')
+
+        # 서버 렌더링 모드면 모든 페이지 조각을 채워서 한 번에 응답 (?render=client로 기존 방식 사용 가능)
+        render_mode = request.args.get('render') or app.config.get('REPORT_RENDER_MODE', 'server')
+
+        # 완료된 보고서는 미리 렌더링한 스냅샷을 그대로 응답 (없거나 오래되었으면 아래에서 직접 렌더링)
+        snapshots = None
+        if render_mode == 'server' and app.config.get('SNAPSHOT_ENABLED', True):
+            from app.services.snapshot_service import get_snapshot_service
+
+            try:
+                snapshots = get_snapshot_service()
+                ref, snapshot = snapshots.find(patient_code)
+                if ref is not None and str(ref.get('birth_date')) != expected:
+                    return render_template('error.html')
+                if snapshot:
+                    fmt = 'pdf' if request.args.get('format') == 'pdf' and snapshot.get('pdf') else 'html'
+                    return snapshots.send(snapshot, fmt)
+            except Exception as e:
+                print("Snapshot lookup error:", e)
+
         # patient_code가 있으면 기존 로직대로 리포트 조회 후 report.html로 렌더
         try:
             from app.services.report_service import ReportService
@@ -112,14 +171,18 @@ def create_app(config=None):
             if not patient_birth:
                 return render_template('error.html')
 
-            expected = f"{birth_date[0:4]}-{birth_date[4:6]}-{birth_date[6:8]}"
-
             # birth_date 틀림
             if str(patient_birth) != expected:
                 return render_template('error.html')
 
             # 성공
-            return render_template('report.html', report=report)
+            if snapshots is not None and report.get('report', {}).get('status') == 'completed':
+                # 다음 요청부터는 스냅샷으로 제공되도록 백그라운드에서 생성
+                try:
+                    snapshots.record_fallback(report['report']['report_id'])
+                except Exception as e:
+                    print("Snapshot schedule error:", e)
+            return render_template('report.html', report=report, prerendered=(render_mode == 'server'))
 
         except Exception as e:
 
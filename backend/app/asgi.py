@@ -0,0 +1,277 @@
+"""
+ASGI 애플리케이션 팩토리 - 비동기 보고서 API
+
+Flask 앱(create_app)과 같은 /api/reports 조회 엔드포인트를 Starlette + aiomysql로 제공합니다.
+DB를 기다리는 동안 워커 스레드를 붙잡지 않으므로 느린 쿼리가 몰려도 동시 요청을 더 많이 처리합니다.
+응답 형식({'success', 'message', 'data', ...})은 Flask 라우트와 같습니다.
+
+실행:
+    uvicorn --factory app.asgi:create_asgi_app --host 0.0.0.0 --port 8000
+"""
+from datetime import datetime
+
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import JSONResponse
+from starlette.routing import Mount, Route
+
+from app.config.settings import get_config
+from app.db.async_database import AsyncDatabase
+from app.json_provider import dumps_bytes
+from app.routes.report import MAX_PER_PAGE
+from app.services.async_report_service import AsyncReportService
+from app.services.cache import create_cache
+
+
+class ReportJSONResponse(JSONResponse):
+    def render(self, content):
+        # Flask 앱(FastJSONProvider)과 같은 인코더/변환 규칙
+        return dumps_bytes(content)
+
+
+def _json(payload, status_code=200):
+    return ReportJSONResponse(payload, status_code=status_code)
+
+
+def _int_arg(request, name, default):
+    """request.args.get(name, default, type=int)와 같은 동작 (변환 실패 시 기본값)"""
+    try:
+        return int(request.query_params.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _service(request):
+    return request.app.state.report_service
+
+
+async def get_patient_report(request):
+    """
+    환자 코드로 최신 보고서 조회
+
+    GET /api/reports/patient/{patient_code}
+    """
+    patient_code = request.path_params['patient_code']
+    try:
+        report = await _service(request).get_patient_report(patient_code)
+
+        if not report:
+            return _json({
+                'success': False,
+                'message': f'Patient with code {patient_code} not found',
+                'data': None
+            }, 404)
+
+        return _json({
+            'success': True,
+            'message': 'Report retrieved successfully',
+            'data': report
+        })
+
+    except Exception as e:
+        return _json({
+            'success': False,
+            'message': f'Error retrieving report: {str(e)}',
+            'data': None
+        }, 500)
+
+
+async def get_patient_history(request):
+    """
+    환자 ID로 검사 이력 조회
+
+    GET /api/reports/patient/{patient_id}/history
+    """
+    try:
+        history = await _service(request).get_patient_history(request.path_params['patient_id'])
+
+        return _json({
+            'success': True,
+            'message': 'History retrieved successfully',
+            'data': history
+        })
+
+    except Exception as e:
+        return _json({
+            'success': False,
+            'message': f'Error retrieving history: {str(e)}',
+            'data': None
+        }, 500)
+
+
+async def get_all_patients(request):
+    """
+    모든 환자 목록 조회 (페이징 지원)
+
+    GET /api/reports/patients?page=1&per_page=20
+    GET /api/reports/patients?cursor=&per_page=20
+    """
+    service = _service(request)
+    try:
+        page = max(_int_arg(request, 'page', 1), 1)
+        per_page = min(max(_int_arg(request, 'per_page', 20), 1), MAX_PER_PAGE)
+
+        if 'cursor' in request.query_params:
+            try:
+                patients, next_cursor = await service.get_patients_after(
+                    request.query_params.get('cursor', ''), per_page
+                )
+            except ValueError as e:
+                return _json({
+                    'success': False,
+                    'message': str(e),
+                    'data': None
+                }, 400)
+
+            total = await service.count_patients()
+
+            return _json({
+                'success': True,
+                'message': 'Patients retrieved successfully',
+                'data': patients,
+                'total': total,
+                'per_page': per_page,
+                'next_cursor': next_cursor
+            })
+
+        patients = await service.get_patients_page(page, per_page)
+        total = await service.count_patients()
+
+        return _json({
+            'success': True,
+            'message': 'Patients retrieved successfully',
+            'data': patients,
+            'total': total,
+            'page': page,
+            'per_page': per_page
+        })
+
+    except Exception as e:
+        return _json({
+            'success': False,
+            'message': f'Error retrieving patients: {str(e)}',
+            'data': None
+        }, 500)
+
+
+async def search_patients(request):
+    """
+    환자명 또는 코드로 검색
+
+    GET /api/reports/patients/search?keyword=홍길동
+    """
+    try:
+        keyword = request.query_params.get('keyword', '').strip()
+
+        if not keyword:
+            return _json({
+                'success': False,
+                'message': 'Keyword is required',
+                'data': None
+            }, 400)
+
+        limit = min(max(_int_arg(request, 'limit', 50), 1), MAX_PER_PAGE)
+
+        results = await _service(request).search_patients(keyword, limit=limit)
+
+        return _json({
+            'success': True,
+            'message': 'Search completed successfully',
+            'data': results
+        })
+
+    except Exception as e:
+        return _json({
+            'success': False,
+            'message': f'Error searching patients: {str(e)}',
+            'data': None
+        }, 500)
+
+
+async def health_check(request):
+    """
+    헬스 체크
+
+    GET /api/reports/health
+    """
+    state = request.app.state
+    return _json({
+        'success': True,
+        'message': 'Report service is running',
+        'timestamp': datetime.now().isoformat(),
+        'pool': state.db.pool_stats(),
+        'report_cache': state.report_service.cache.stats()
+    })
+
+
+async def not_found(request, exc):
+    return _json({
+        'success': False,
+        'message': 'Resource not found',
+        'data': None
+    }, 404)
+
+
+async def internal_error(request, exc):
+    return _json({
+        'success': False,
+        'message': 'Internal server error',
+        'data': None
+    }, 500)
+
+
+def create_asgi_app(config=None):
+    """
+    ASGI 앱 생성 및 초기화
+
+    Args:
+        config: 설정 클래스 (없으면 환경에 따라 자동 선택)
+
+    Returns:
+        Starlette: ASGI 애플리케이션 인스턴스
+    """
+    if config is None:
+        config = get_config()
+    # Flask의 app.config.from_object와 같이 대문자 속성만 설정으로 사용
+    settings = {key: getattr(config, key) for key in dir(config) if key.isupper()}
+
+    db = AsyncDatabase(settings)
+
+    async def startup():
+        await db.connect()
+
+    async def shutdown():
+        await db.close()
+
+    routes = [
+        Mount('/api/reports', routes=[
+            Route('/patient/{patient_code}', get_patient_report, methods=['GET']),
+            Route('/patient/{patient_id:int}/history', get_patient_history, methods=['GET']),
+            Route('/patients', get_all_patients, methods=['GET']),
+            Route('/patients/search', search_patients, methods=['GET']),
+            Route('/health', health_check, methods=['GET']),
+        ]),
+    ]
+
+    middleware = [
+        Middleware(
+            CORSMiddleware,
+            allow_origins=['http://localhost:3000', 'http://127.0.0.1:3000'],
+            allow_methods=['GET', 'POST', 'PUT', 'DELETE', 'OPTIONS'],
+            allow_headers=['Content-Type', 'Authorization'],
+        ),
+    ]
+
+    app = Starlette(
+        debug=settings.get('DEBUG', False),
+        routes=routes,
+        middleware=middleware,
+        exception_handlers={404: not_found, 500: internal_error},
+        on_startup=[startup],
+        on_shutdown=[shutdown],
+    )
+    app.state.config = settings
+    app.state.db = db
+    app.state.report_service = AsyncReportService(db, create_cache(settings), settings)
+    return app
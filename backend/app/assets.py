@@ -0,0 +1,271 @@
+"""
+정적 파일 빌드 및 제공 - 파일명 해시, 사전 압축(gzip/brotli), WebP/AVIF 변형
+
+`flask assets build`로 static/ 아래 파일을 static/dist/ 에 빌드하고 manifest.json을 만듭니다.
+앱은 manifest가 있으면 url_for('static', filename=...)가 해시된 파일명을 돌려주도록 하고,
+해시된 파일은 Cache-Control: immutable 로 제공합니다.
+"""
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import shutil
+from io import BytesIO
+
+from flask import request, send_from_directory
+
+DIST_DIR = 'dist'
+MANIFEST_NAME = 'manifest.json'
+
+# 해시 파일명과 사전 압축 대상
+FINGERPRINT_EXTENSIONS = {'.css', '.js', '.png', '.jpg', '.jpeg', '.gif', '.svg', '.webp', '.ico'}
+COMPRESS_EXTENSIONS = {'.css', '.js', '.svg', '.json', '.html'}
+# WebP/AVIF 변형을 만들 이미지
+IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg'}
+
+# 해시된 파일의 캐시 기간 (1년)
+IMMUTABLE_MAX_AGE = 31536000
+
+
+def _hash_bytes(data, length=10):
+    return hashlib.sha256(data).hexdigest()[:length]
+
+
+def _hashed_name(rel_path, digest, suffix=None):
+    """'css/report.css' → 'css/report.<hash>.css' (suffix가 있으면 확장자 교체)"""
+    root, ext = os.path.splitext(rel_path)
+    return f'{root}.{digest}{suffix or ext}'
+
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def _compress(path, data, stats):
+    """gzip(항상)과 brotli(패키지가 있을 때) 사전 압축본 생성"""
+    # mtime=0 으로 빌드 결과가 항상 같도록 함
+    _write(path + '.gz', gzip.compress(data, compresslevel=9, mtime=0))
+    stats['gzip'] += 1
+    try:
+        import brotli
+    except ImportError:
+        return
+    _write(path + '.br', brotli.compress(data, quality=11))
+    stats['brotli'] += 1
+
+
+def _image_variants(src_path, rel_path, dist_root, widths, stats):
+    """
+    WebP/AVIF 변형과 너비별 축소본 생성 (Pillow 필요)
+
+    Returns:
+        dict: {'width': 원본 너비, 'webp': 'dist/...', 'avif': 'dist/...', 'widths': {'480': {'webp': ...}}}
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+
+    variants = {'widths': {}}
+    with Image.open(src_path) as image:
+        image.load()
+        variants['width'] = image.width
+        sizes = [(None, image)]
+        for width in widths:
+            if width < image.width:
+                height = round(image.height * width / image.width)
+                sizes.append((width, image.resize((width, height), Image.LANCZOS)))
+
+        for width, resized in sizes:
+            for fmt in ('webp', 'avif'):
+                try:
+                    buffer = BytesIO()
+                    resized.save(buffer, format=fmt.upper(), quality=80)
+                except (KeyError, OSError, ValueError):
+                    # 설치된 Pillow가 AVIF 인코더를 지원하지 않는 경우
+                    continue
+                data = buffer.getvalue()
+                root, _ = os.path.splitext(rel_path)
+                base = f'{root}.w{width}' if width else root
+                out_rel = _hashed_name(base + '.' + fmt, _hash_bytes(data))
+                _write(os.path.join(dist_root, out_rel), data)
+                stats[fmt] += 1
+                target = variants if width is None else variants['widths'].setdefault(str(width), {})
+                target[fmt] = f'{DIST_DIR}/{out_rel}'
+    return variants
+
+
+def build_assets(static_dir, widths=(480, 960), clean=True):
+    """
+    static/ 아래 파일을 static/dist/ 에 빌드
+
+    - 모든 파일을 원래 이름으로 복사 (JS 모듈의 상대 경로 import가 깨지지 않도록)
+    - 해시 대상 파일은 '<이름>.<해시>.<확장자>' 로도 저장
+    - CSS/JS 등 텍스트 파일은 .gz/.br 사전 압축본 생성
+    - PNG/JPG 이미지는 WebP/AVIF 및 너비별 축소본 생성
+
+    Args:
+        static_dir: static 폴더 경로
+        widths: 축소본 너비 목록
+        clean: 기존 dist 폴더 삭제 여부
+
+    Returns:
+        dict: 빌드 통계
+    """
+    dist_root = os.path.join(static_dir, DIST_DIR)
+    if clean and os.path.isdir(dist_root):
+        shutil.rmtree(dist_root)
+
+    manifest = {'files': {}, 'variants': {}}
+    stats = {'files': 0, 'hashed': 0, 'gzip': 0, 'brotli': 0, 'webp': 0, 'avif': 0}
+
+    for root, dirs, files in os.walk(static_dir):
+        # 빌드 결과 폴더는 건너뜀
+        dirs[:] = sorted(d for d in dirs if os.path.join(root, d) != dist_root)
+        for filename in sorted(files):
+            src_path = os.path.join(root, filename)
+            rel_path = os.path.relpath(src_path, static_dir).replace(os.sep, '/')
+            ext = os.path.splitext(filename)[1].lower()
+            with open(src_path, 'rb') as f:
+                data = f.read()
+
+            outputs = [rel_path]
+            if ext in FINGERPRINT_EXTENSIONS:
+                hashed = _hashed_name(rel_path, _hash_bytes(data))
+                outputs.append(hashed)
+                manifest['files'][rel_path] = f'{DIST_DIR}/{hashed}'
+                stats['hashed'] += 1
+
+            for out_rel in outputs:
+                out_path = os.path.join(dist_root, out_rel)
+                _write(out_path, data)
+                if ext in COMPRESS_EXTENSIONS:
+                    _compress(out_path, data, stats)
+            stats['files'] += 1
+
+            if ext in IMAGE_EXTENSIONS:
+                variants = _image_variants(src_path, rel_path, dist_root, widths, stats)
+                if variants:
+                    manifest['variants'][rel_path] = variants
+
+    _write(os.path.join(dist_root, MANIFEST_NAME),
+           json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+    return stats
+
+
+class AssetManifest:
+    """빌드된 manifest.json 조회"""
+
+    def __init__(self, static_dir):
+        self.static_dir = static_dir
+        self.files = {}
+        self.variants = {}
+        self.hashed = set()
+        self._originals = {}
+        self.load()
+
+    def load(self):
+        path = os.path.join(self.static_dir, DIST_DIR, MANIFEST_NAME)
+        if not os.path.exists(path):
+            return
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        self.files = data.get('files', {})
+        self.variants = data.get('variants', {})
+        self.hashed = set(self.files.values())
+        self._originals = {hashed: original for original, hashed in self.files.items()}
+        for variant in self.variants.values():
+            self.hashed.update(v for k, v in variant.items() if k not in ('width', 'widths'))
+            for sized in variant.get('widths', {}).values():
+                self.hashed.update(sized.values())
+
+    def resolve(self, filename):
+        """원본 경로 → 해시된 경로 (manifest에 없으면 원본)"""
+        return self.files.get(filename, filename)
+
+    def negotiate_image(self, filename, accept):
+        """브라우저가 지원하면 같은 이미지의 AVIF/WebP 변형 경로 반환"""
+        original = self._original_of(filename)
+        variant = self.variants.get(original)
+        if not variant:
+            return None
+        for fmt in ('avif', 'webp'):
+            if f'image/{fmt}' in accept and fmt in variant:
+                return variant[fmt]
+        return None
+
+    def srcset(self, filename, fmt='webp', url_prefix='/static'):
+        """너비별 축소본과 원본 크기 변형의 srcset 문자열 (변형이 없으면 빈 문자열)"""
+        variant = self.variants.get(filename, {})
+        entries = [(int(width), sized[fmt]) for width, sized in variant.get('widths', {}).items()
+                   if fmt in sized]
+        if variant.get('width') and fmt in variant:
+            entries.append((variant['width'], variant[fmt]))
+        return ', '.join(f'{url_prefix}/{path} {width}w' for width, path in sorted(entries))
+
+    def _original_of(self, filename):
+        if filename in self.variants:
+            return filename
+        return self._originals.get(filename)
+
+
+def init_app(app):
+    """manifest가 있으면 url_for 파일명 치환과 캐시/압축 제공을 설정"""
+    # 서버 렌더링 조각의 정적 이미지가 사용 (빌드 전에는 srcset 없이 원본만)
+    app.jinja_env.globals['asset_srcset'] = lambda filename, fmt='webp': ''
+    if not app.config.get('ASSET_MANIFEST_ENABLED', True):
+        return
+
+    manifest = AssetManifest(app.static_folder)
+    app.extensions['asset_manifest'] = manifest
+    if not manifest.files:
+        return
+
+    app.jinja_env.globals['asset_srcset'] = \
+        lambda filename, fmt='webp': manifest.srcset(filename, fmt, app.static_url_path)
+
+    @app.url_defaults
+    def hashed_static_url(endpoint, values):
+        if endpoint == 'static' and 'filename' in values:
+            values['filename'] = manifest.resolve(values['filename'])
+
+    def static_with_cache(filename):
+        """해시된 파일은 immutable, 사전 압축본과 이미지 변형을 Accept 헤더에 따라 제공"""
+        served = filename
+        headers = {}
+        image_variant = None
+        if os.path.splitext(filename)[1].lower() in IMAGE_EXTENSIONS:
+            image_variant = manifest.negotiate_image(filename, request.headers.get('Accept', ''))
+            headers['Vary'] = 'Accept'
+            if image_variant:
+                served = image_variant
+
+        mimetype = mimetypes.guess_type(served)[0]
+        encoding = None
+        accept_encoding = request.headers.get('Accept-Encoding', '')
+        for candidate, suffix in (('br', '.br'), ('gzip', '.gz')):
+            if candidate in accept_encoding and \
+                    os.path.exists(os.path.join(app.static_folder, served + suffix)):
+                encoding = candidate
+                served = served + suffix
+                break
+        if os.path.splitext(filename)[1].lower() in COMPRESS_EXTENSIONS:
+            headers['Vary'] = 'Accept-Encoding'
+
+        response = send_from_directory(app.static_folder, served, mimetype=mimetype)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        for key, value in headers.items():
+            response.headers[key] = value
+
+        if filename in manifest.hashed:
+            response.cache_control.no_cache = None
+            response.cache_control.public = True
+            response.cache_control.max_age = IMMUTABLE_MAX_AGE
+            response.cache_control.immutable = True
+        return response
+
+    app.view_functions['static'] = static_with_cache
@@ -0,0 +1,250 @@
+"""
+Flask CLI 명령 - `flask <그룹> <명령>` 형태로 실행
+"""
+import os
+
+import click
+from flask.cli import AppGroup
+
+summary_cli = AppGroup('summary', help='환자 요약(patient_summaries) 관리')
+
+@summary_cli.command('rebuild')
+@click.option('--patient-id', type=int, default=None, help='이 환자만 다시 계산')
+def summary_rebuild(patient_id):
+    """환자 요약을 reports에서 다시 계산"""
+    from app.services.summary_service import SummaryService
+
+    if patient_id is not None:
+        SummaryService.refresh_patient(patient_id)
+        click.echo(f'Patient summary refreshed: patient_id={patient_id}')
+        return
+
+    affected = SummaryService.rebuild()
+    click.echo(f'Patient summaries rebuilt ({affected} rows affected)')
+
+@summary_cli.command('verify')
+@click.option('--limit', type=int, default=20, help='출력할 최대 불일치 행 수')
+def summary_verify(limit):
+    """환자 요약과 실제 reports 집계가 일치하는지 검사"""
+    from app.services.summary_service import SummaryService
+
+    mismatches = SummaryService.verify()
+    if not mismatches:
+        click.echo('Patient summaries are consistent')
+        return
+
+    click.echo(f'{len(mismatches)} patient summaries are out of date:')
+    for row in mismatches[:limit]:
+        click.echo(
+            f"  patient_id={row['patient_id']} "
+            f"total_reports={row['total_reports']} (expected {row['expected_total_reports']}) "
+            f"latest_exam_date={row['latest_exam_date']} (expected {row['expected_latest_exam_date']}) "
+            f"latest_report_id={row['latest_report_id']} (expected {row['expected_latest_report_id']})"
+        )
+    click.echo('Run `flask summary rebuild` to fix them.')
+    raise SystemExit(1)
+
+assets_cli = AppGroup('assets', help='정적 파일 빌드')
+
+@assets_cli.command('build')
+@click.option('--width', 'widths', type=int, multiple=True, default=(480, 960),
+              help='이미지 축소본 너비 (여러 번 지정 가능)')
+def assets_build(widths):
+    """static/ 파일을 static/dist/ 에 해시 파일명·사전 압축·이미지 변형으로 빌드"""
+    from flask import current_app
+    from app.assets import build_assets
+
+    stats = build_assets(current_app.static_folder, widths=widths)
+    click.echo(
+        f"Built {stats['files']} files ({stats['hashed']} hashed, "
+        f"{stats['gzip']} gzip, {stats['brotli']} brotli, "
+        f"{stats['webp']} webp, {stats['avif']} avif)"
+    )
+    if not stats['brotli']:
+        click.echo('  brotli 패키지가 없어 .br 파일을 만들지 않았습니다 (pip install brotli)')
+    if not stats['webp']:
+        click.echo('  Pillow 패키지가 없어 이미지 변형을 만들지 않았습니다 (pip install Pillow)')
+    click.echo('Restart the server to pick up the new manifest.')
+
+export_cli = AppGroup('export', help='데이터 내보내기')
+
+@export_cli.command('reports')
+@click.option('--format', 'export_format', type=click.Choice(['csv', 'ndjson']), default='csv')
+@click.option('--output', '-o', type=click.Path(dir_okay=False, writable=True), default='-',
+              help='저장할 파일 (기본값: 표준 출력)')
+@click.option('--date-from', default=None, help='시작 검사일 (YYYY-MM-DD)')
+@click.option('--date-to', default=None, help='종료 검사일 (YYYY-MM-DD)')
+@click.option('--status', default=None, help='보고서 상태 (pending/in_progress/completed/failed)')
+def export_reports(export_format, output, date_from, date_to, status):
+    """모든 보고서를 CSV/NDJSON으로 내보내기 (서버 측 커서로 스트리밍)"""
+    from app.services.export_service import ExportService
+
+    try:
+        filters = ExportService.build_filters(date_from, date_to, status)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+
+    with click.open_file(output, 'w', encoding='utf-8', lazy=False) as f:
+        for chunk in ExportService.iter_export(export_format, filters):
+            f.write(chunk)
+
+ingest_cli = AppGroup('ingest', help='데이터 일괄 적재')
+
+@ingest_cli.command('reports')
+@click.argument('source', type=click.File('r', encoding='utf-8'), default='-')
+@click.option('--chunk-size', type=int, default=None, help='한 트랜잭션에 넣을 보고서 수 (기본: INGEST_CHUNK_SIZE)')
+@click.option('--batch-size', type=int, default=10000, help='한 번에 읽어 처리할 보고서 수 (NDJSON)')
+def ingest_reports(source, chunk_size, batch_size):
+    """
+    보고서 일괄 적재 (JSON 배열 또는 한 줄에 하나씩인 NDJSON)
+    
+    입력 형식은 POST /api/reports/ingest 의 reports 항목과 같습니다.
+    """
+    import json
+    from itertools import chain
+    from flask import current_app
+    from app.services.ingest_service import IngestService
+
+    chunk_size = chunk_size or current_app.config.get('INGEST_CHUNK_SIZE', 500)
+
+    def batches():
+        first = source.read(1)
+        while first.isspace():
+            first = source.read(1)
+        if first == '[':
+            items = json.loads(first + source.read())
+            for start in range(0, len(items), batch_size):
+                yield items[start:start + batch_size]
+            return
+        batch = []
+        for line in chain([first + source.readline()], source):
+            if line.strip():
+                batch.append(json.loads(line))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    offset = inserted = failed = 0
+    for batch in batches():
+        for result in IngestService.ingest_reports(batch, chunk_size=chunk_size):
+            if result['success']:
+                inserted += 1
+            else:
+                failed += 1
+                click.echo(f"  #{offset + result['index']} {result['patient_code']}: {result['message']}", err=True)
+        offset += len(batch)
+    click.echo(f'{inserted} reports inserted, {failed} failed')
+    if failed:
+        raise SystemExit(1)
+
+snapshot_cli = AppGroup('snapshot', help='보고서 스냅샷 관리')
+
+@snapshot_cli.command('build')
+@click.option('--report-id', 'report_ids', type=int, multiple=True,
+              help='이 보고서만 생성 (여러 번 지정 가능, 기본: 완료된 모든 보고서)')
+@click.option('--workers', type=int, default=os.cpu_count() or 1, show_default=True, help='렌더링 프로세스 수')
+@click.option('--force', is_flag=True, help='최신 스냅샷도 다시 생성')
+def snapshot_build(report_ids, workers, force):
+    """완료된 보고서의 스냅샷(HTML, 설정 시 PDF)을 병렬로 생성"""
+    from app.db.database import Database
+    from app.db.models import QUERIES
+    from app.services.snapshot_service import build_snapshots
+
+    if not report_ids:
+        report_ids = [row['id'] for row in Database.fetch_all(QUERIES['get_completed_report_ids']) or []]
+    counts = {'built': 0, 'fresh': 0, 'skipped': 0, 'failed': 0}
+    for report_id, status, error in build_snapshots(list(report_ids), workers=workers, force=force):
+        counts[status] += 1
+        if error:
+            click.echo(f'  report_id={report_id}: {error}', err=True)
+    click.echo(f"Snapshots: {counts['built']} built, {counts['fresh']} up to date, "
+               f"{counts['skipped']} skipped, {counts['failed']} failed")
+    if counts['failed']:
+        raise SystemExit(1)
+
+@snapshot_cli.command('gc')
+def snapshot_gc():
+    """어떤 보고서도 가리키지 않는 스냅샷 파일 삭제"""
+    from app.services.snapshot_service import get_snapshot_service
+
+    removed = get_snapshot_service().store.gc()
+    click.echo(f'{removed} unreferenced snapshot files removed')
+
+db_cli = AppGroup('db', help='스키마/인덱스 관리')
+
+@db_cli.command('migrate')
+@click.option('--to', 'target', type=int, default=None, help='이 버전까지만 적용 (기본: 최신)')
+def db_migrate(target):
+    """아직 적용하지 않은 스키마 마이그레이션 적용"""
+    from app.db.schema import migrate
+
+    applied = migrate(target)
+    for migration in applied:
+        click.echo(f'  applied {migration.version}: {migration.description}')
+    click.echo(f'{len(applied)} migrations applied' if applied else 'Schema is up to date')
+
+@db_cli.command('status')
+def db_status():
+    """마이그레이션 적용 상태"""
+    from app.db.schema import migration_status
+
+    pending = 0
+    for item in migration_status():
+        mark = 'x' if item['applied'] else ' '
+        pending += not item['applied']
+        click.echo(f"  [{mark}] {item['version']}: {item['description']}")
+    click.echo(f'{pending} pending' if pending else 'Schema is up to date')
+
+@db_cli.command('schema')
+def db_schema():
+    """최신 스키마 DDL 출력 (mysql 클라이언트용)"""
+    from app.db.schema import schema_sql
+
+    click.echo(schema_sql(), nl=False)
+
+@db_cli.command('check-plans')
+@click.option('--query', 'names', multiple=True, help='이 쿼리만 검사 (여러 번 지정 가능)')
+@click.option('--ignore-below', type=int, default=0, help='예상 행 수가 이보다 적은 스캔은 무시')
+@click.option('--verbose', '-v', is_flag=True, help='EXPLAIN 결과 전체 출력')
+def db_check_plans(names, ignore_below, verbose):
+    """QUERIES의 모든 SELECT에 EXPLAIN을 실행해 전체 테이블 스캔이 있으면 실패"""
+    from app.db.query_plans import check_plans
+
+    results = check_plans(set(names), ignore_below=ignore_below)
+    failed = 0
+    for result in results:
+        failed += result['status'] in ('full_scan', 'error')
+        detail = f" - {result['detail']}" if result['detail'] else ''
+        click.echo(f"  {result['status']:<9} {result['name']}{detail}")
+        if verbose:
+            for row in result['plan']:
+                click.echo(f"      {row.get('table')}: type={row.get('type')} key={row.get('key')} "
+                           f"rows={row.get('rows')} {row.get('Extra') or ''}")
+    click.echo(f'{len(results)} queries checked, {failed} failed')
+    if failed:
+        raise SystemExit(1)
+
+@db_cli.command('export-sqlite')
+@click.argument('output', type=click.Path(dir_okay=False), required=False)
+@click.option('--batch-size', type=int, default=5000, show_default=True, help='한 번에 복사할 행 수')
+def db_export_sqlite(output, batch_size):
+    """MySQL 테이블을 읽기 전용 SQLite 스냅샷 파일로 내보내기 (기본: SQLITE_PATH)"""
+    from flask import current_app
+    from app.db.sqlite_export import export_snapshot
+
+    output = output or current_app.config['SQLITE_PATH']
+    counts = export_snapshot(output, batch_size=batch_size)
+    for table, rows in counts.items():
+        click.echo(f'  {table}: {rows} rows')
+    click.echo(f'SQLite snapshot written to {output}')
+
+def register_commands(app):
+    """앱에 CLI 명령 등록"""
+    app.cli.add_command(summary_cli)
+    app.cli.add_command(assets_cli)
+    app.cli.add_command(export_cli)
+    app.cli.add_command(ingest_cli)
+    app.cli.add_command(snapshot_cli)
+    app.cli.add_command(db_cli)
@@ -0,0 +1,81 @@
+"""
+조건부 GET - ETag/Last-Modified 검증자와 304 Not Modified 응답
+
+보고서/환자 목록처럼 자주 다시 여는 응답은 전체 조인을 실행하기 전에 수정 시각만 읽는
+가벼운 쿼리로 검증자를 만들고, 클라이언트가 가진 것과 같으면 본문 없이 304를 보냅니다.
+
+    version = ReportService.get_patient_report_version(code)
+    validators = Validators.of('report', version['token'], last_modified=version['updated_at'])
+    if validators.not_modified():
+        return validators.not_modified_response()
+    ...
+    return validators.apply(jsonify(...))
+
+ETag는 약한(W/) 검증자입니다. 같은 데이터라도 디버그 모드 들여쓰기 등으로 바이트가
+달라질 수 있으므로 내용이 같다는 의미로만 사용합니다.
+"""
+import hashlib
+from datetime import timezone
+
+from flask import current_app, request
+
+# 응답 형식(스키마)이 바뀌면 올려서 이전 ETag가 일치하지 않도록 함
+ETAG_VERSION = 1
+
+# 환자 정보가 담긴 응답이므로 공유 캐시에는 저장하지 않고 매번 재검증
+CACHE_CONTROL = 'private, no-cache'
+
+
+def _http_datetime(value):
+    """DB의 TIMESTAMP(초 단위, 시간대 없음) → UTC 기준 aware datetime"""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.replace(microsecond=0)
+
+
+class Validators:
+    """응답 하나의 ETag/Last-Modified"""
+
+    def __init__(self, etag, last_modified=None):
+        self.etag = etag
+        self.last_modified = _http_datetime(last_modified)
+
+    @classmethod
+    def of(cls, *parts, last_modified=None):
+        """
+        검증자 생성
+
+        Args:
+            parts: 응답 내용을 결정하는 값들 (ID, 개수, 수정 시각 등)
+            last_modified: 마지막 수정 시각 (datetime, 없으면 Last-Modified 생략)
+        """
+        source = repr((ETAG_VERSION,) + parts).encode('utf-8')
+        return cls(hashlib.sha1(source).hexdigest()[:20], last_modified)
+
+    def not_modified(self):
+        """
+        요청의 If-None-Match / If-Modified-Since와 비교
+
+        If-None-Match가 있으면 그것만 사용합니다 (RFC 9110 13.2.2).
+        """
+        if request.if_none_match:
+            return request.if_none_match.contains_weak(self.etag)
+        if_modified_since = request.if_modified_since
+        if if_modified_since is not None and self.last_modified is not None:
+            return self.last_modified <= if_modified_since
+        return False
+
+    def apply(self, response):
+        """응답에 ETag/Last-Modified/Cache-Control 설정"""
+        response.set_etag(self.etag, weak=True)
+        if self.last_modified is not None:
+            response.last_modified = self.last_modified
+        response.headers['Cache-Control'] = CACHE_CONTROL
+        return response
+
+    def not_modified_response(self):
+        """본문 없는 304 응답"""
+        return self.apply(current_app.response_class(status=304))
+
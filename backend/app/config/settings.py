@@ -10,6 +10,87 @@ class Config:
     JSON_AS_ASCII = False
     JSON_SORT_KEYS = False
 
+    # MySQL 커넥션 풀 설정
+    MYSQL_POOL_MIN_SIZE = int(os.getenv('MYSQL_POOL_MIN_SIZE', 1))
+    MYSQL_POOL_MAX_SIZE = int(os.getenv('MYSQL_POOL_MAX_SIZE', 10))
+    MYSQL_POOL_TIMEOUT = float(os.getenv('MYSQL_POOL_TIMEOUT', 10))        # 연결 대기 최대 시간 (초)
+    MYSQL_POOL_RECYCLE = int(os.getenv('MYSQL_POOL_RECYCLE', 3600))        # 연결 재생성 주기 (초)
+    MYSQL_POOL_PING_AFTER = float(os.getenv('MYSQL_POOL_PING_AFTER', 5))   # 유휴 후 ping 확인 기준 (초)
+
+    # 데이터베이스 백엔드 (mysql / sqlite: 읽기 전용 스냅샷 파일, flask db export-sqlite로 생성)
+    DB_BACKEND = os.getenv('DB_BACKEND', 'mysql')
+    SQLITE_PATH = os.getenv('SQLITE_PATH', 'data/bone_report.sqlite3')
+    SQLITE_MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))   # 메모리 매핑 크기 (바이트, 0이면 끔)
+    SQLITE_CACHE_SIZE = int(os.getenv('SQLITE_CACHE_SIZE', 8192))              # 연결별 페이지 캐시 (KiB)
+
+    # 읽기 복제본 설정 (비우면 모든 쿼리를 주 서버에서 실행)
+    MYSQL_REPLICAS = os.getenv('MYSQL_REPLICAS', '')                                   # 'host:port,host:port'
+    MYSQL_REPLICA_MAX_LAG = float(os.getenv('MYSQL_REPLICA_MAX_LAG', 5))               # 허용 복제 지연 (초)
+    MYSQL_REPLICA_CHECK_INTERVAL = float(os.getenv('MYSQL_REPLICA_CHECK_INTERVAL', 5))  # 상태 확인 주기 (초)
+    MYSQL_READ_AFTER_WRITE = float(os.getenv('MYSQL_READ_AFTER_WRITE', 5))             # 쓰기 후 주 서버 읽기 시간 (초)
+    MYSQL_REPLICA_LAG_QUERY = os.getenv('MYSQL_REPLICA_LAG_QUERY', '')                 # 지연을 'lag' 컬럼으로 돌려주는 쿼리
+
+    # 보고서 캐시 설정 (memory / redis / none)
+    REPORT_CACHE_BACKEND = os.getenv('REPORT_CACHE_BACKEND', 'memory')
+    REPORT_CACHE_TTL = int(os.getenv('REPORT_CACHE_TTL', 300))                # 캐시 유지 시간 (초)
+    REPORT_CACHE_MAX_ENTRIES = int(os.getenv('REPORT_CACHE_MAX_ENTRIES', 1024))  # memory 백엔드 최대 항목 수
+    REPORT_CACHE_REDIS_URL = os.getenv('REPORT_CACHE_REDIS_URL', 'redis://localhost:6379/0')
+    # 같은 보고서의 동시 조회를 DB 조회 한 번으로 합칠 때 결과를 기다리는 최대 시간 (초, 0이면 무제한)
+    REPORT_SINGLE_FLIGHT_TIMEOUT = float(os.getenv('REPORT_SINGLE_FLIGHT_TIMEOUT', 10))
+
+    # 보고서 렌더링 방식
+    # server: 서버에서 모든 페이지 조각을 채워 한 번에 응답 / client: report.js가 조각을 fetch 후 채움
+    REPORT_RENDER_MODE = os.getenv('REPORT_RENDER_MODE', 'server')
+
+    # 빌드된 정적 파일 사용 여부 (flask assets build 결과가 있을 때만 적용)
+    ASSET_MANIFEST_ENABLED = os.getenv('ASSET_MANIFEST_ENABLED', 'true').lower() == 'true'
+
+    # 환자 검색 인덱스 갱신 주기 (초)
+    SEARCH_INDEX_SYNC_INTERVAL = int(os.getenv('SEARCH_INDEX_SYNC_INTERVAL', 30))        # 변경분 반영
+    SEARCH_INDEX_REBUILD_INTERVAL = int(os.getenv('SEARCH_INDEX_REBUILD_INTERVAL', 3600))  # 전체 재적재
+
+    # 보고서 일괄 적재 시 한 트랜잭션에 넣을 보고서 수
+    INGEST_CHUNK_SIZE = int(os.getenv('INGEST_CHUNK_SIZE', 500))
+
+    # X-ray 이미지 (원본 폴더, 축소본 디스크 캐시)
+    XRAY_IMAGE_ROOT = os.getenv('XRAY_IMAGE_ROOT')                 # 상대 image_path의 기준 폴더 (기본: static)
+    XRAY_CACHE_DIR = os.getenv('XRAY_CACHE_DIR')                   # 기본: instance/xray_cache
+    XRAY_CACHE_MAX_BYTES = int(os.getenv('XRAY_CACHE_MAX_BYTES', 512 * 1024 * 1024))
+    XRAY_RESIZE_WORKERS = int(os.getenv('XRAY_RESIZE_WORKERS', 2))  # 축소본 생성 스레드 수
+    XRAY_PENDING_MAX_AGE = int(os.getenv('XRAY_PENDING_MAX_AGE', 0))  # 축소본 생성 중 제공하는 원본의 캐시 시간 (초)
+    XRAY_MAX_AGE = int(os.getenv('XRAY_MAX_AGE', 86400))            # 브라우저 캐시 시간 (초)
+
+    # 보고서 스냅샷 (완료된 보고서를 미리 렌더링해 디스크에서 제공)
+    SNAPSHOT_ENABLED = os.getenv('SNAPSHOT_ENABLED', 'true').lower() == 'true'
+    SNAPSHOT_DIR = os.getenv('SNAPSHOT_DIR')                        # 기본: instance/snapshots
+    SNAPSHOT_WORKERS = int(os.getenv('SNAPSHOT_WORKERS', 2))        # 백그라운드 렌더링 프로세스 수 (0이면 CLI로만 생성)
+    SNAPSHOT_PDF = os.getenv('SNAPSHOT_PDF', 'false').lower() == 'true'  # PDF도 생성 (weasyprint 필요)
+
+    # 보고서 페이지(/) 본인 확인 - 생년월일 캐시와 환자 코드별 실패 횟수 제한
+    VERIFY_CACHE_TTL = int(os.getenv('VERIFY_CACHE_TTL', 300))                 # 생년월일 캐시 유지 시간 (초)
+    VERIFY_CACHE_MAX_ENTRIES = int(os.getenv('VERIFY_CACHE_MAX_ENTRIES', 10000))
+    VERIFY_MAX_FAILURES = int(os.getenv('VERIFY_MAX_FAILURES', 5))             # 이 횟수만큼 틀리면 잠금 (0이면 제한 없음)
+    VERIFY_FAILURE_WINDOW = int(os.getenv('VERIFY_FAILURE_WINDOW', 300))       # 실패 횟수를 세는 시간 (초)
+
+    # 환자 성장 추이 캐시 (새 검사만 반영해 갱신)
+    TREND_CACHE_MAX_ENTRIES = int(os.getenv('TREND_CACHE_MAX_ENTRIES', 4096))
+    TREND_CACHE_TTL = int(os.getenv('TREND_CACHE_TTL', 3600))       # 같은 초 안의 수정은 감지하지 못하므로 이 시간 안에 다시 계산
+
+    # 성능 지표 수집 (/metrics) 및 느린 쿼리 로그 기준 (밀리초, 0이면 로그 끔)
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'true').lower() == 'true'
+    SLOW_QUERY_THRESHOLD_MS = float(os.getenv('SLOW_QUERY_THRESHOLD_MS', 200))
+
+    # 운영 서버 설정 (FLASK_ENV=production python run.py, app/server.py)
+    SERVER_BIND = os.getenv('SERVER_BIND', '0.0.0.0:5000')
+    SERVER_WORKERS = int(os.getenv('SERVER_WORKERS', 0))                        # 워커 프로세스 수 (0이면 CPU 수)
+    SERVER_THREADS = int(os.getenv('SERVER_THREADS', 4))                        # 워커당 요청 처리 스레드 수
+    SERVER_MAX_REQUESTS = int(os.getenv('SERVER_MAX_REQUESTS', 10000))          # 이만큼 처리한 워커는 교체 (0이면 끔)
+    SERVER_MAX_REQUESTS_JITTER = int(os.getenv('SERVER_MAX_REQUESTS_JITTER', 1000))
+    SERVER_TIMEOUT = int(os.getenv('SERVER_TIMEOUT', 30))                       # 응답 없는 워커 재시작 기준 (초)
+    SERVER_GRACEFUL_TIMEOUT = int(os.getenv('SERVER_GRACEFUL_TIMEOUT', 30))     # 종료/교체 시 요청을 마칠 시간 (초)
+    SERVER_KEEPALIVE = int(os.getenv('SERVER_KEEPALIVE', 5))                    # keep-alive 연결 유지 시간 (초)
+    SERVER_ACCESS_LOG = os.getenv('SERVER_ACCESS_LOG', '')                      # 접근 로그 파일 ('-'이면 stdout)
+
 class DevelopmentConfig(Config):
     """개발 환경 설정"""
     DEBUG = True
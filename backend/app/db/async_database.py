@@ -0,0 +1,142 @@
+"""
+비동기 MySQL 데이터베이스 - aiomysql 커넥션 풀 기반
+
+ASGI 앱(app.asgi)에서 사용합니다. 쿼리 문자열은 동기 버전과 같은 QUERIES를 사용하며,
+aiomysql은 PyMySQL 위에서 동작하므로 파라미터 형식(%s)과 예외 종류도 동일합니다.
+"""
+import asyncio
+import time
+
+import pymysql
+
+from app.db.pool import PoolTimeoutError
+
+
+class AsyncDatabase:
+    """aiomysql 풀을 사용하는 비동기 쿼리 실행"""
+
+    def __init__(self, config):
+        """
+        Args:
+            config: MYSQL_* 설정이 들어 있는 dict
+        """
+        self.config = config
+        self._pool = None
+        self.stats_counters = {'checkouts': 0, 'timeouts': 0, 'discarded': 0, 'wait_time_total': 0.0}
+
+    async def connect(self):
+        """커넥션 풀 생성 (앱 시작 시 한 번 호출)"""
+        if self._pool is not None:
+            return
+        # 선택 의존성이므로 ASGI 앱을 쓸 때만 import
+        import aiomysql
+
+        config = self.config
+        self._pool = await aiomysql.create_pool(
+            host=config['MYSQL_HOST'],
+            user=config['MYSQL_USER'],
+            password=config['MYSQL_PASSWORD'] or '',
+            db=config['MYSQL_DB'],
+            port=config['MYSQL_PORT'],
+            charset='utf8mb4',
+            cursorclass=aiomysql.DictCursor,
+            # 동기 풀과 같이 재사용되는 연결이 이전 스냅샷을 보지 않도록 autocommit 사용
+            autocommit=True,
+            minsize=config.get('MYSQL_POOL_MIN_SIZE', 1),
+            maxsize=config.get('MYSQL_POOL_MAX_SIZE', 10),
+            pool_recycle=config.get('MYSQL_POOL_RECYCLE', 3600),
+        )
+
+    async def close(self):
+        """커넥션 풀 종료 (앱 종료 시 호출)"""
+        if self._pool is None:
+            return
+        self._pool.close()
+        await self._pool.wait_closed()
+        self._pool = None
+
+    async def _acquire(self):
+        if self._pool is None:
+            await self.connect()
+        timeout = self.config.get('MYSQL_POOL_TIMEOUT', 10.0)
+        started = time.monotonic()
+        try:
+            connection = await asyncio.wait_for(self._pool.acquire(), timeout)
+        except asyncio.TimeoutError:
+            self.stats_counters['timeouts'] += 1
+            raise PoolTimeoutError(
+                f'Timed out after {timeout}s waiting for a connection '
+                f'(max_size={self._pool.maxsize})'
+            )
+        self.stats_counters['checkouts'] += 1
+        self.stats_counters['wait_time_total'] += time.monotonic() - started
+        return connection
+
+    def _release(self, connection, discard=False):
+        if discard:
+            # 닫힌 연결은 풀이 반납 시 버리고 필요하면 새로 만든다
+            self.stats_counters['discarded'] += 1
+            connection.close()
+        self._pool.release(connection)
+
+    async def _run(self, query, args, fetch):
+        connection = await self._acquire()
+        discard = False
+        try:
+            async with connection.cursor() as cursor:
+                if args:
+                    await cursor.execute(query, args)
+                else:
+                    await cursor.execute(query)
+                return await fetch(cursor)
+        except (pymysql.err.OperationalError, pymysql.err.InterfaceError):
+            # 연결 자체가 깨졌을 수 있으므로 재사용하지 않음
+            discard = True
+            raise
+        finally:
+            self._release(connection, discard=discard)
+
+    async def execute_query(self, query, args=None):
+        """쿼리 실행 (INSERT, UPDATE, DELETE)"""
+        async def lastrowid(cursor):
+            return cursor.lastrowid
+        try:
+            return await self._run(query, args, lastrowid)
+        except pymysql.Error as e:
+            print(f"Query execution error: {e}")
+            raise
+
+    async def fetch_one(self, query, args=None):
+        """단일 행 조회"""
+        async def fetchone(cursor):
+            return await cursor.fetchone()
+        try:
+            return await self._run(query, args, fetchone)
+        except pymysql.Error as e:
+            print(f"Query fetch error: {e}")
+            raise
+
+    async def fetch_all(self, query, args=None):
+        """다중 행 조회"""
+        async def fetchall(cursor):
+            return await cursor.fetchall()
+        try:
+            return await self._run(query, args, fetchall)
+        except pymysql.Error as e:
+            print(f"Query fetch error: {e}")
+            raise
+
+    def pool_stats(self):
+        """커넥션 풀 통계 (풀이 아직 없으면 None)"""
+        if self._pool is None:
+            return None
+        checkouts = self.stats_counters['checkouts']
+        return {
+            **self.stats_counters,
+            'wait_time_avg': self.stats_counters['wait_time_total'] / checkouts if checkouts else 0.0,
+            'size': self._pool.size,
+            'idle': self._pool.freesize,
+            'in_use': self._pool.size - self._pool.freesize,
+            'min_size': self._pool.minsize,
+            'max_size': self._pool.maxsize,
+        }
@@ -1,85 +1,393 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+
 import pymysql
 from flask import current_app
 
+from app.db.pool import ConnectionPool
+from app.db.replicas import create_router, primary_reads
+from app.db.sqlite_backend import SQLitePool
+from app.metrics import QueryTimer, get_metrics
+
+_pool_lock = threading.Lock()
+
+
 class Database:
-    """MySQL 데이터베이스 연결 및 쿼리 실행"""
-    
+    """MySQL 데이터베이스 연결 및 쿼리 실행 (DB_BACKEND=sqlite면 읽기 전용 SQLite 스냅샷)"""
+
+    @staticmethod
+    def _connect_kwargs():
+        """pymysql.connect에 전달할 연결 설정"""
+        return {
+            'host': current_app.config['MYSQL_HOST'],
+            'user': current_app.config['MYSQL_USER'],
+            'password': current_app.config['MYSQL_PASSWORD'],
+            'database': current_app.config['MYSQL_DB'],
+            'port': current_app.config['MYSQL_PORT'],
+            'charset': 'utf8mb4',
+            'cursorclass': pymysql.cursors.DictCursor,
+            # 풀에서 재사용되는 연결이 이전 트랜잭션의 스냅샷을 계속 보지 않도록 autocommit 사용
+            'autocommit': True,
+        }
+
     @staticmethod
     def get_connection():
-        """MySQL 연결 객체 반환"""
+        """MySQL 연결 객체 반환 (풀을 거치지 않는 단독 연결)"""
+        if Database.embedded():
+            raise pymysql.err.NotSupportedError('DB_BACKEND=sqlite does not open MySQL connections')
         try:
-            connection = pymysql.connect(
-                host=current_app.config['MYSQL_HOST'],
-                user=current_app.config['MYSQL_USER'],
-                password=current_app.config['MYSQL_PASSWORD'],
-                database=current_app.config['MYSQL_DB'],
-                port=current_app.config['MYSQL_PORT'],
-                charset='utf8mb4',
-                cursorclass=pymysql.cursors.DictCursor
-            )
+            connection = pymysql.connect(**Database._connect_kwargs())
             return connection
         except pymysql.Error as e:
             print(f"Database connection error: {e}")
             raise
-    
+
     @staticmethod
-    def execute_query(query, args=None):
-        """쿼리 실행 (INSERT, UPDATE, DELETE)"""
-        connection = None
+    def embedded():
+        """읽기 전용 SQLite 스냅샷을 사용하는지 (DB_BACKEND=sqlite)"""
+        return current_app.config.get('DB_BACKEND', 'mysql') == 'sqlite'
+
+    @staticmethod
+    def get_pool():
+        """
+        현재 앱/프로세스의 커넥션 풀 반환 (없으면 생성)
+        
+        DB_BACKEND=sqlite면 MySQL 풀 대신 SQLite 스냅샷 연결 풀(app/db/sqlite_backend.py)을 사용합니다.
+        """
+        pool = current_app.extensions.get('mysql_pool')
+        # fork 이후 자식 프로세스는 부모의 소켓을 공유하면 안 되므로 새 풀을 만든다
+        if pool is not None and pool.pid == os.getpid():
+            return pool
+        with _pool_lock:
+            pool = current_app.extensions.get('mysql_pool')
+            if pool is None or pool.pid != os.getpid():
+                config = current_app.config
+                if Database.embedded():
+                    pool = SQLitePool(
+                        config['SQLITE_PATH'],
+                        mmap_size=config.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024),
+                        cache_size=config.get('SQLITE_CACHE_SIZE', 8192),
+                    )
+                    current_app.extensions['mysql_pool'] = pool
+                    return pool
+                pool = ConnectionPool(
+                    Database._connect_kwargs(),
+                    min_size=config.get('MYSQL_POOL_MIN_SIZE', 1),
+                    max_size=config.get('MYSQL_POOL_MAX_SIZE', 10),
+                    timeout=config.get('MYSQL_POOL_TIMEOUT', 10.0),
+                    recycle=config.get('MYSQL_POOL_RECYCLE', 3600),
+                    ping_after=config.get('MYSQL_POOL_PING_AFTER', 5.0),
+                )
+                current_app.extensions['mysql_pool'] = pool
+            return pool
+
+    @staticmethod
+    def get_router():
+        """현재 앱/프로세스의 읽기 복제본 라우터 (MYSQL_REPLICAS가 없거나 SQLite 스냅샷이면 None)"""
+        if not current_app.config.get('MYSQL_REPLICAS') or Database.embedded():
+            return None
+        router = current_app.extensions.get('mysql_replicas')
+        if router is not None and router.pid == os.getpid():
+            return router
+        with _pool_lock:
+            router = current_app.extensions.get('mysql_replicas')
+            if router is None or router.pid != os.getpid():
+                router = create_router(current_app.config, Database._connect_kwargs())
+                current_app.extensions['mysql_replicas'] = router
+            return router
+
+    @staticmethod
+    def primary_reads():
+        """
+        블록 안의 조회를 복제본 대신 주 서버에서 실행
+        
+        결과를 캐시에 넣는 조회처럼 복제 지연으로 오래된 값을 읽으면 안 되는 곳에 사용합니다.
+        
+            with Database.primary_reads():
+                row = Database.fetch_one(query, args)
+        """
+        return primary_reads()
+
+    @staticmethod
+    def replica_stats():
+        """복제본 라우팅 통계 (복제본을 쓰지 않으면 None)"""
+        router = current_app.extensions.get('mysql_replicas')
+        if router is None or router.pid != os.getpid():
+            return None
+        return router.stats()
+
+    @staticmethod
+    def pool_stats():
+        """커넥션 풀 통계 (풀이 아직 없으면 None)"""
+        pool = current_app.extensions.get('mysql_pool')
+        if pool is None or pool.pid != os.getpid():
+            return None
+        return pool.stats()
+
+    @staticmethod
+    @contextmanager
+    def connection():
+        """주 서버 풀에서 연결을 빌려오고 블록이 끝나면 반납"""
+        with Database._borrow(Database.get_pool()) as connection:
+            yield connection
+
+    @staticmethod
+    @contextmanager
+    def _borrow(pool):
+        metrics = get_metrics()
+        started = time.perf_counter()
+        connection = pool.acquire()
+        if metrics is not None:
+            metrics.observe_acquire(time.perf_counter() - started)
+        discard = False
         try:
-            connection = Database.get_connection()
-            with connection.cursor() as cursor:
-                if args:
-                    cursor.execute(query, args)
-                else:
-                    cursor.execute(query)
+            yield connection
+        except (pymysql.err.OperationalError, pymysql.err.InterfaceError):
+            # 연결 자체가 깨졌을 수 있으므로 재사용하지 않음
+            discard = True
+            raise
+        finally:
+            pool.release(connection, discard=discard)
+
+    @staticmethod
+    @contextmanager
+    def transaction():
+        """
+        풀에서 연결을 빌려 하나의 트랜잭션으로 실행
+        
+        블록이 정상 종료되면 커밋, 예외가 나면 롤백합니다.
+        블록 안에서는 execute_query/execute_many/fetch_all에 connection을 넘겨 같은 트랜잭션을 사용하세요.
+        
+            with Database.transaction() as connection:
+                Database.execute_many(query, rows, connection=connection)
+        """
+        Database._mark_write()
+        with Database.connection() as connection:
+            connection.begin()
+            try:
+                yield connection
                 connection.commit()
-                return cursor.lastrowid
+            except BaseException:
+                try:
+                    connection.rollback()
+                except pymysql.Error:
+                    # 연결이 끊겨 롤백할 수 없으면 서버가 트랜잭션을 폐기함
+                    pass
+                raise
+
+    @staticmethod
+    def execute_query(query, args=None, connection=None):
+        """
+        쿼리 실행 (INSERT, UPDATE, DELETE)
+        
+        connection이 주어지면 그 연결(트랜잭션)에서 실행하고 커밋하지 않습니다.
+        """
+        try:
+            if connection is not None:
+                with connection.cursor() as cursor, \
+                        QueryTimer(get_metrics(), query, args) as timer:
+                    if args:
+                        cursor.execute(query, args)
+                    else:
+                        cursor.execute(query)
+                    timer.rows = cursor.rowcount
+                    return cursor.lastrowid
+            Database._mark_write()
+            with Database.connection() as connection:
+                try:
+                    with connection.cursor() as cursor, \
+                            QueryTimer(get_metrics(), query, args) as timer:
+                        if args:
+                            cursor.execute(query, args)
+                        else:
+                            cursor.execute(query)
+                        connection.commit()
+                        timer.rows = cursor.rowcount
+                        return cursor.lastrowid
+                except pymysql.Error:
+                    connection.rollback()
+                    raise
         except pymysql.Error as e:
-            if connection:
-                connection.rollback()
             print(f"Query execution error: {e}")
             raise
-        finally:
-            if connection:
-                connection.close()
-    
+
+    @staticmethod
+    def execute_many(query, args_list, connection=None):
+        """
+        같은 쿼리를 여러 파라미터로 실행
+        
+        'INSERT ... VALUES (%s, ...)' 형식이면 PyMySQL이 다중 행 INSERT로 묶어 보냅니다.
+        connection이 주어지면 그 연결(트랜잭션)에서 실행하고 커밋하지 않으며,
+        없으면 풀에서 연결을 빌려 전체를 하나의 트랜잭션으로 커밋합니다.
+        
+        Returns:
+            int: 영향받은 행 수
+        """
+        if not args_list:
+            return 0
+        try:
+            if connection is not None:
+                return Database._execute_many(connection, query, args_list)
+            with Database.transaction() as connection:
+                return Database._execute_many(connection, query, args_list)
+        except pymysql.Error as e:
+            print(f"Query execution error: {e}")
+            raise
+
+    @staticmethod
+    def _execute_many(connection, query, args_list):
+        with connection.cursor() as cursor, \
+                QueryTimer(get_metrics(), query, args_list[0]) as timer:
+            affected = cursor.executemany(query, args_list)
+            timer.rows = affected
+            return affected
+
+    @staticmethod
+    def _mark_write():
+        router = Database.get_router()
+        if router is not None:
+            router.mark_write()
+
+    @staticmethod
+    def _read(run):
+        """
+        조회 실행 - 복제본을 쓰면 복제본 연결로, 아니면 주 서버 연결로 run(connection) 실행
+        
+        복제본 연결 오류는 그 복제본을 다음 상태 확인까지 제외하고 주 서버에서 한 번 더 실행합니다.
+        """
+        router = Database.get_router()
+        replica = router.choose() if router is not None else None
+        if replica is not None:
+            try:
+                with Database._borrow(replica.pool) as connection:
+                    return run(connection)
+            except (pymysql.err.OperationalError, pymysql.err.InterfaceError) as e:
+                print(f"Replica {replica.name} read error, retrying on primary: {e}")
+                router.mark_failed(replica, e)
+        with Database.connection() as connection:
+            return run(connection)
+
     @staticmethod
     def fetch_one(query, args=None):
-        """단일 행 조회"""
-        connection = None
+        """단일 행 조회 (복제본이 있으면 복제본에서)"""
         try:
-            connection = Database.get_connection()
-            with connection.cursor() as cursor:
-                if args:
-                    cursor.execute(query, args)
-                else:
-                    cursor.execute(query)
-                result = cursor.fetchone()
-                return result
+            return Database._read(lambda connection: Database._fetch_one(connection, query, args))
         except pymysql.Error as e:
             print(f"Query fetch error: {e}")
             raise
-        finally:
-            if connection:
-                connection.close()
-    
+
     @staticmethod
-    def fetch_all(query, args=None):
-        """다중 행 조회"""
+    def _fetch_one(connection, query, args):
+        with connection.cursor() as cursor, \
+                QueryTimer(get_metrics(), query, args) as timer:
+            if args:
+                cursor.execute(query, args)
+            else:
+                cursor.execute(query)
+            result = cursor.fetchone()
+            timer.rows = 1 if result else 0
+            return result
+
+    @staticmethod
+    def fetch_all(query, args=None, connection=None):
+        """
+        다중 행 조회
+        
+        connection이 주어지면 그 연결(트랜잭션)에서, 아니면 복제본이 있으면 복제본에서 조회합니다.
+        """
+        try:
+            if connection is not None:
+                return Database._fetch_all(connection, query, args)
+            return Database._read(lambda connection: Database._fetch_all(connection, query, args))
+        except pymysql.Error as e:
+            print(f"Query fetch error: {e}")
+            raise
+
+    @staticmethod
+    def _fetch_all(connection, query, args):
+        with connection.cursor() as cursor, \
+                QueryTimer(get_metrics(), query, args) as timer:
+            if args:
+                cursor.execute(query, args)
+            else:
+                cursor.execute(query)
+            result = cursor.fetchall()
+            timer.rows = len(result)
+            return result
+
+    @staticmethod
+    def fetch_rows(query, args=None):
+        """
+        다중 행을 튜플로 조회 (행마다 dict를 만들지 않음, Schema.dump_rows와 함께 사용)
+        
+        Returns:
+            tuple: (컬럼 이름 튜플, 튜플 행 리스트)
+        """
+        try:
+            return Database._read(lambda connection: Database._fetch_rows(connection, query, args))
+        except pymysql.Error as e:
+            print(f"Query fetch error: {e}")
+            raise
+
+    @staticmethod
+    def _fetch_rows(connection, query, args):
+        with connection.cursor(pymysql.cursors.Cursor) as cursor, \
+                QueryTimer(get_metrics(), query, args) as timer:
+            if args:
+                cursor.execute(query, args)
+            else:
+                cursor.execute(query)
+            rows = cursor.fetchall()
+            timer.rows = len(rows)
+            columns = tuple(column[0] for column in cursor.description or ())
+            return columns, rows
+
+    @staticmethod
+    def stream(query, args=None):
+        """
+        다중 행을 한 행씩 조회 (서버 측 커서, 결과를 메모리에 모두 올리지 않음)
+        
+        제너레이터가 끝날 때까지 풀의 연결 하나를 사용합니다 (복제본이 있으면 복제본 풀).
+        중간에 중단되면 남은 결과를 읽어 버리는 대신 연결을 닫습니다.
+        """
+        pool = Database.get_pool()
+        metrics = get_metrics()
+        started = time.perf_counter()
+        router = Database.get_router()
+        replica = router.choose() if router is not None else None
         connection = None
+        if replica is not None:
+            try:
+                connection = replica.pool.acquire()
+                pool = replica.pool
+            except pymysql.Error as e:
+                print(f"Replica {replica.name} stream error, using primary: {e}")
+                router.mark_failed(replica, e)
+        if connection is None:
+            connection = pool.acquire()
+        if metrics is not None:
+            metrics.observe_acquire(time.perf_counter() - started)
+        discard = True
+        # 스트림 전체(첫 행부터 마지막 행까지 읽는 시간)를 하나의 쿼리로 기록
+        timer = QueryTimer(metrics, query, args)
+        timer.rows = 0
         try:
-            connection = Database.get_connection()
-            with connection.cursor() as cursor:
+            with timer:
+                # with 블록을 쓰면 중단 시 cursor.close()가 남은 행을 모두 읽으므로 직접 닫음
+                cursor = connection.cursor(pymysql.cursors.SSDictCursor)
                 if args:
                     cursor.execute(query, args)
                 else:
                     cursor.execute(query)
-                result = cursor.fetchall()
-                return result
+                for row in cursor:
+                    timer.rows += 1
+                    yield row
+                cursor.close()
+            discard = False
         except pymysql.Error as e:
-            print(f"Query fetch error: {e}")
+            print(f"Query stream error: {e}")
             raise
         finally:
-            if connection:
-                connection.close()
+            pool.release(connection, discard=discard)
@@ -99,8 +99,21 @@ class XRayAnalysis:
         'updated_at'
     ]
 
+class PatientSummary:
+    """환자 요약 테이블 (reports 트리거로 갱신되는 파생 데이터)"""
+    TABLE_NAME = 'patient_summaries'
+    COLUMNS = [
+        'patient_id',
+        'latest_exam_date',  # 최근 검사 일자
+        'total_reports',     # 검사 보고서 수
+        'latest_report_id',  # 최신 보고서 ID
+        'sort_exam_date',    # 목록 정렬용 (검사 없음은 1000-01-01)
+        'updated_at'
+    ]
+
 # SQL 쿼리 템플릿
 QUERIES = {
+    # 최신 보고서는 환자 요약의 latest_report_id (검사일, ID 순) - 버전/스냅샷 조회와 같은 보고서를 고름
     'get_patient_report': """
         SELECT 
             p.id, p.patient_code, p.name, p.gender, p.birth_date,
@@ -111,14 +124,14 @@ QUERIES = {
             wi.weight, wi.percentile as weight_percentile, wi.bmi, wi.bmi_category, wi.obesity_rate, wi.obesity_grade,
             xa.image_path, xa.analysis_result, xa.confidence_score
         FROM patients p
-        LEFT JOIN reports r ON p.id = r.patient_id
+        LEFT JOIN patient_summaries s ON s.patient_id = p.id
+        LEFT JOIN reports r ON r.id = s.latest_report_id
         LEFT JOIN bone_ages ba ON r.id = ba.report_id
         LEFT JOIN genetic_info gi ON r.id = gi.report_id
         LEFT JOIN height_percentiles hp ON r.id = hp.report_id
         LEFT JOIN weight_info wi ON r.id = wi.report_id
         LEFT JOIN xray_analysis xa ON r.id = xa.report_id
         WHERE p.patient_code = %s
-        ORDER BY r.exam_date DESC
         LIMIT 1
     """,
     
@@ -135,11 +148,348 @@ QUERIES = {
     'get_all_patients': """
         SELECT 
             p.id, p.patient_code, p.name, p.gender, p.birth_date,
-            MAX(r.exam_date) as latest_exam_date,
-            COUNT(r.id) as total_reports
+            s.latest_exam_date, s.total_reports
+        FROM patient_summaries s
+        JOIN patients p ON p.id = s.patient_id
+        ORDER BY s.sort_exam_date DESC, s.patient_id DESC
+    """,
+
+    # 페이지 단위 환자 목록 (OFFSET 방식)
+    # 검사 이력이 없는 환자는 가장 뒤로 보내고(sort_exam_date), 같은 날짜는 id로 정렬 순서를 고정
+    'get_patients_page': """
+        SELECT 
+            p.id, p.patient_code, p.name, p.gender, p.birth_date,
+            s.latest_exam_date, s.total_reports
+        FROM patient_summaries s
+        JOIN patients p ON p.id = s.patient_id
+        ORDER BY s.sort_exam_date DESC, s.patient_id DESC
+        LIMIT %s OFFSET %s
+    """,
+
+    # 커서(keyset) 방식 환자 목록 - (sort_exam_date, id) 기준 다음 페이지
+    'get_patients_after_cursor': """
+        SELECT 
+            p.id, p.patient_code, p.name, p.gender, p.birth_date,
+            s.latest_exam_date, s.total_reports
+        FROM patient_summaries s
+        JOIN patients p ON p.id = s.patient_id
+        WHERE s.sort_exam_date < %s
+            OR (s.sort_exam_date = %s AND s.patient_id < %s)
+        ORDER BY s.sort_exam_date DESC, s.patient_id DESC
+        LIMIT %s
+    """,
+
+    'count_patients': """
+        SELECT COUNT(*) as total FROM patients
+    """,
+
+    # 보고서 페이지 본인 확인 (patient_code 고유 인덱스로 생년월일만 조회)
+    'get_patient_birth_date': """
+        SELECT birth_date FROM patients WHERE patient_code = %s
+    """,
+
+    # 환자 목록 조건부 GET - 환자 수와 마지막 수정 시각만 (idx_updated_at 인덱스로 MAX 조회)
+    'get_patients_version': """
+        SELECT
+            (SELECT COUNT(*) FROM patients) as total,
+            (SELECT MAX(updated_at) FROM patients) as patients_updated_at,
+            (SELECT MAX(updated_at) FROM patient_summaries) as summaries_updated_at
+    """,
+
+    # 보고서 조건부 GET - 최신 보고서 ID와 각 테이블의 수정 시각만 (보고서 컬럼 조인 없이)
+    'get_patient_report_version': """
+        SELECT
+            p.id, r.id as report_id,
+            p.updated_at as patient_updated_at, r.updated_at as report_updated_at,
+            ba.updated_at as bone_age_updated_at, gi.updated_at as genetic_info_updated_at,
+            hp.updated_at as height_percentile_updated_at, wi.updated_at as weight_info_updated_at,
+            xa.updated_at as xray_updated_at
+        FROM patients p
+        LEFT JOIN patient_summaries s ON s.patient_id = p.id
+        LEFT JOIN reports r ON r.id = s.latest_report_id
+        LEFT JOIN bone_ages ba ON r.id = ba.report_id
+        LEFT JOIN genetic_info gi ON r.id = gi.report_id
+        LEFT JOIN height_percentiles hp ON r.id = hp.report_id
+        LEFT JOIN weight_info wi ON r.id = wi.report_id
+        LEFT JOIN xray_analysis xa ON r.id = xa.report_id
+        WHERE p.patient_code = %s
+        LIMIT 1
+    """,
+
+    # 여러 환자의 get_patient_report_version - {placeholders}에 코드 개수만큼 %s를 채워 사용
+    'get_patient_report_versions_batch': """
+        SELECT
+            p.id, p.patient_code, r.id as report_id,
+            p.updated_at as patient_updated_at, r.updated_at as report_updated_at,
+            ba.updated_at as bone_age_updated_at, gi.updated_at as genetic_info_updated_at,
+            hp.updated_at as height_percentile_updated_at, wi.updated_at as weight_info_updated_at,
+            xa.updated_at as xray_updated_at
+        FROM patients p
+        LEFT JOIN patient_summaries s ON s.patient_id = p.id
+        LEFT JOIN reports r ON r.id = s.latest_report_id
+        LEFT JOIN bone_ages ba ON r.id = ba.report_id
+        LEFT JOIN genetic_info gi ON r.id = gi.report_id
+        LEFT JOIN height_percentiles hp ON r.id = hp.report_id
+        LEFT JOIN weight_info wi ON r.id = wi.report_id
+        LEFT JOIN xray_analysis xa ON r.id = xa.report_id
+        WHERE p.patient_code IN ({placeholders})
+    """,
+
+    # 여러 환자의 최신 보고서를 한 번에 조회 - {placeholders}에 코드 개수만큼 %s를 채워 사용
+    # 환자마다 최신 보고서 1건만 환자 요약의 latest_report_id로 골라 조인 (get_patient_report와 같은 컬럼)
+    'get_patient_reports_batch': """
+        SELECT 
+            p.id, p.patient_code, p.name, p.gender, p.birth_date,
+            r.id as report_id, r.exam_date, r.requested_doctor, r.status,
+            ba.chronological_age, ba.bone_age, ba.age_difference, ba.current_height, ba.predicted_height_ai,
+            gi.father_height, gi.mother_height, gi.predicted_height_genetic,
+            hp.percentile, hp.percentile_rank, hp.assessment,
+            wi.weight, wi.percentile as weight_percentile, wi.bmi, wi.bmi_category, wi.obesity_rate, wi.obesity_grade,
+            xa.image_path, xa.analysis_result, xa.confidence_score
+        FROM patients p
+        LEFT JOIN patient_summaries s ON s.patient_id = p.id
+        LEFT JOIN reports r ON r.id = s.latest_report_id
+        LEFT JOIN bone_ages ba ON r.id = ba.report_id
+        LEFT JOIN genetic_info gi ON r.id = gi.report_id
+        LEFT JOIN height_percentiles hp ON r.id = hp.report_id
+        LEFT JOIN weight_info wi ON r.id = wi.report_id
+        LEFT JOIN xray_analysis xa ON r.id = xa.report_id
+        WHERE p.patient_code IN ({placeholders})
+    """,
+
+    # 보고서 전체 내보내기 (검사일 범위/상태 필터, NULL이면 조건 없음)
+    'export_reports': """
+        SELECT 
+            p.id, p.patient_code, p.name, p.gender, p.birth_date,
+            r.id as report_id, r.exam_date, r.requested_doctor, r.status,
+            ba.chronological_age, ba.bone_age, ba.age_difference, ba.current_height, ba.predicted_height_ai,
+            gi.father_height, gi.mother_height, gi.predicted_height_genetic,
+            hp.percentile, hp.percentile_rank, hp.assessment,
+            wi.weight, wi.percentile as weight_percentile, wi.bmi, wi.bmi_category, wi.obesity_rate, wi.obesity_grade,
+            xa.image_path, xa.analysis_result, xa.confidence_score
+        FROM reports r
+        JOIN patients p ON p.id = r.patient_id
+        LEFT JOIN bone_ages ba ON r.id = ba.report_id
+        LEFT JOIN genetic_info gi ON r.id = gi.report_id
+        LEFT JOIN height_percentiles hp ON r.id = hp.report_id
+        LEFT JOIN weight_info wi ON r.id = wi.report_id
+        LEFT JOIN xray_analysis xa ON r.id = xa.report_id
+        WHERE (%(date_from)s IS NULL OR r.exam_date >= %(date_from)s)
+            AND (%(date_to)s IS NULL OR r.exam_date <= %(date_to)s)
+            AND (%(status)s IS NULL OR r.status = %(status)s)
+        ORDER BY r.id
+    """,
+
+    # 검색 인덱스 적재용
+    'get_search_index_rows': """
+        SELECT id, patient_code, name, updated_at FROM patients
+    """,
+
+    'get_search_index_changes': """
+        SELECT id, patient_code, name, updated_at
+        FROM patients
+        WHERE updated_at >= %s
+    """,
+
+    # 검색 결과(ID 목록)의 목록 정보 조회 - {placeholders}에 ID 개수만큼 %s를 채워 사용
+    'get_patients_by_ids': """
+        SELECT 
+            p.id, p.patient_code, p.name, p.gender, p.birth_date,
+            s.latest_exam_date, s.total_reports
+        FROM patients p
+        LEFT JOIN patient_summaries s ON s.patient_id = p.id
+        WHERE p.id IN ({placeholders})
+    """,
+
+    # 환자 요약 전체 재계산 (flask summary rebuild)
+    'rebuild_patient_summaries': """
+        INSERT INTO patient_summaries (patient_id, latest_exam_date, total_reports, latest_report_id)
+        SELECT
+            p.id,
+            agg.latest_exam_date,
+            COALESCE(agg.total_reports, 0),
+            (SELECT r2.id FROM reports r2
+             WHERE r2.patient_id = p.id
+             ORDER BY r2.exam_date DESC, r2.id DESC
+             LIMIT 1)
+        FROM patients p
+        LEFT JOIN (
+            SELECT patient_id, MAX(exam_date) as latest_exam_date, COUNT(*) as total_reports
+            FROM reports
+            GROUP BY patient_id
+        ) agg ON agg.patient_id = p.id
+        ON DUPLICATE KEY UPDATE
+            latest_exam_date = VALUES(latest_exam_date),
+            total_reports = VALUES(total_reports),
+            latest_report_id = VALUES(latest_report_id)
+    """,
+
+    # 환자 한 명의 요약 재계산 (setup.sql의 저장 프로시저)
+    'refresh_patient_summary': """
+        CALL refresh_patient_summary(%s)
+    """,
+
+    # 실제 reports 집계와 다른 요약 행 조회 (flask summary verify)
+    'verify_patient_summaries': """
+        SELECT
+            p.id as patient_id,
+            s.latest_exam_date, s.total_reports, s.latest_report_id,
+            agg.latest_exam_date as expected_latest_exam_date,
+            COALESCE(agg.total_reports, 0) as expected_total_reports,
+            (SELECT r2.id FROM reports r2
+             WHERE r2.patient_id = p.id
+             ORDER BY r2.exam_date DESC, r2.id DESC
+             LIMIT 1) as expected_latest_report_id
+        FROM patients p
+        LEFT JOIN patient_summaries s ON s.patient_id = p.id
+        LEFT JOIN (
+            SELECT patient_id, MAX(exam_date) as latest_exam_date, COUNT(*) as total_reports
+            FROM reports
+            GROUP BY patient_id
+        ) agg ON agg.patient_id = p.id
+        HAVING s.total_reports IS NULL
+            OR s.total_reports <> expected_total_reports
+            OR NOT (s.latest_exam_date <=> expected_latest_exam_date)
+            OR NOT (s.latest_report_id <=> expected_latest_report_id)
+    """,
+
+    # 성장 추이 (TrendService) - 검사일 순 이력, %s 이후 보고서 ID만 (전체는 0)
+    'get_patient_trend_rows': """
+        SELECT
+            r.id as report_id, r.exam_date,
+            ba.chronological_age, ba.bone_age, ba.current_height, ba.predicted_height_ai,
+            GREATEST(r.updated_at, COALESCE(ba.updated_at, r.updated_at)) as updated_at
+        FROM reports r
+        LEFT JOIN bone_ages ba ON r.id = ba.report_id
+        WHERE r.patient_id = %s AND r.id > %s
+        ORDER BY r.exam_date, r.id
+    """,
+
+    # 캐시된 추이가 최신인지 확인 - 검사 수, 마지막 보고서 ID, 캐시에 있던 보고서(ID <= %s)의 마지막 수정 시각
+    'get_patient_trend_version': """
+        SELECT
+            COUNT(*) as exams, MAX(r.id) as last_report_id,
+            MAX(CASE WHEN r.id <= %s
+                THEN GREATEST(r.updated_at, COALESCE(ba.updated_at, r.updated_at)) END) as cached_updated_at
+        FROM reports r
+        LEFT JOIN bone_ages ba ON r.id = ba.report_id
+        WHERE r.patient_id = %s
+    """,
+
+    # 보고서의 X-ray 원본 경로 (/api/reports/report/<report_id>/xray)
+    'get_xray_image': """
+        SELECT image_path
+        FROM xray_analysis
+        WHERE report_id = %s
+        ORDER BY id DESC
+        LIMIT 1
+    """,
+
+    # 보고서 스냅샷 (SnapshotService)
+    # 환자의 최신 보고서 ID/상태와 내용이 마지막으로 바뀐 시각 - 전체 컬럼 조인 없이 스냅샷이 최신인지 확인
+    'get_report_snapshot_ref': """
+        SELECT
+            p.birth_date, r.id as report_id, r.status,
+            GREATEST(
+                p.updated_at, r.updated_at,
+                COALESCE(ba.updated_at, r.updated_at), COALESCE(gi.updated_at, r.updated_at),
+                COALESCE(hp.updated_at, r.updated_at), COALESCE(wi.updated_at, r.updated_at),
+                COALESCE(xa.updated_at, r.updated_at)
+            ) as content_updated_at
         FROM patients p
-        LEFT JOIN reports r ON p.id = r.patient_id
-        GROUP BY p.id
-        ORDER BY MAX(r.exam_date) DESC
+        JOIN patient_summaries s ON s.patient_id = p.id
+        JOIN reports r ON r.id = s.latest_report_id
+        LEFT JOIN bone_ages ba ON r.id = ba.report_id
+        LEFT JOIN genetic_info gi ON r.id = gi.report_id
+        LEFT JOIN height_percentiles hp ON r.id = hp.report_id
+        LEFT JOIN weight_info wi ON r.id = wi.report_id
+        LEFT JOIN xray_analysis xa ON r.id = xa.report_id
+        WHERE p.patient_code = %s
+        LIMIT 1
+    """,
+
+    # 스냅샷 렌더링용 보고서 한 건 (get_patient_report와 같은 컬럼 + content_updated_at)
+    'get_report_for_snapshot': """
+        SELECT 
+            p.id, p.patient_code, p.name, p.gender, p.birth_date,
+            r.id as report_id, r.exam_date, r.requested_doctor, r.status,
+            ba.chronological_age, ba.bone_age, ba.age_difference, ba.current_height, ba.predicted_height_ai,
+            gi.father_height, gi.mother_height, gi.predicted_height_genetic,
+            hp.percentile, hp.percentile_rank, hp.assessment,
+            wi.weight, wi.percentile as weight_percentile, wi.bmi, wi.bmi_category, wi.obesity_rate, wi.obesity_grade,
+            xa.image_path, xa.analysis_result, xa.confidence_score,
+            GREATEST(
+                p.updated_at, r.updated_at,
+                COALESCE(ba.updated_at, r.updated_at), COALESCE(gi.updated_at, r.updated_at),
+                COALESCE(hp.updated_at, r.updated_at), COALESCE(wi.updated_at, r.updated_at),
+                COALESCE(xa.updated_at, r.updated_at)
+            ) as content_updated_at
+        FROM reports r
+        JOIN patients p ON p.id = r.patient_id
+        LEFT JOIN bone_ages ba ON r.id = ba.report_id
+        LEFT JOIN genetic_info gi ON r.id = gi.report_id
+        LEFT JOIN height_percentiles hp ON r.id = hp.report_id
+        LEFT JOIN weight_info wi ON r.id = wi.report_id
+        LEFT JOIN xray_analysis xa ON r.id = xa.report_id
+        WHERE r.id = %s
+        LIMIT 1
+    """,
+
+    # 스냅샷을 만들 보고서 목록 (flask snapshot build)
+    'get_completed_report_ids': """
+        SELECT id FROM reports WHERE status = 'completed' ORDER BY id
+    """,
+
+    # 일괄 적재 (IngestService)
+    'get_patients_by_codes': """
+        SELECT id, patient_code, name, gender
+        FROM patients
+        WHERE patient_code IN ({placeholders})
+    """,
+
+    'insert_patients': """
+        INSERT IGNORE INTO patients (patient_code, name, gender, birth_date)
+        VALUES (%s, %s, %s, %s)
+    """,
+
+    # 한 문장의 다중 행 INSERT ({values}에 '(%s, %s, %s, %s)'를 행 수만큼 채움)
+    # lastrowid가 첫 행의 ID이므로 get_inserted_reports로 연속 할당 여부를 확인합니다.
+    'insert_reports': """
+        INSERT INTO reports (patient_id, exam_date, requested_doctor, status)
+        VALUES {values}
+    """,
+
+    'get_inserted_reports': """
+        SELECT id, patient_id, exam_date
+        FROM reports
+        WHERE id BETWEEN %s AND %s
+        ORDER BY id
+    """,
+
+    'insert_bone_ages': """
+        INSERT INTO bone_ages (report_id, chronological_age, bone_age, age_difference,
+                               current_height, predicted_height_ai)
+        VALUES (%s, %s, %s, %s, %s, %s)
+    """,
+
+    'insert_genetic_info': """
+        INSERT INTO genetic_info (report_id, father_height, mother_height, predicted_height_genetic)
+        VALUES (%s, %s, %s, %s)
+    """,
+
+    'insert_height_percentiles': """
+        INSERT INTO height_percentiles (report_id, gender, percentile, percentile_rank, assessment)
+        VALUES (%s, %s, %s, %s, %s)
+    """,
+
+    'insert_weight_info': """
+        INSERT INTO weight_info (report_id, weight, percentile, bmi, bmi_category,
+                                 obesity_rate, obesity_grade)
+        VALUES (%s, %s, %s, %s, %s, %s, %s)
+    """,
+
+    'insert_xray_analysis': """
+        INSERT INTO xray_analysis (report_id, image_path, analysis_result, confidence_score)
+        VALUES (%s, %s, %s, %s)
     """
 }
@@ -0,0 +1,238 @@
+"""
+MySQL 커넥션 풀 - 프로세스 단위로 연결을 재사용
+"""
+import os
+import threading
+import time
+from collections import deque
+
+import pymysql
+
+
+class PoolTimeoutError(pymysql.err.OperationalError):
+    """풀에서 제한 시간 내에 연결을 얻지 못한 경우"""
+
+
+class _PooledConnection:
+    """풀에 보관되는 연결과 메타데이터"""
+
+    __slots__ = ('connection', 'created_at', 'last_used')
+
+    def __init__(self, connection):
+        now = time.monotonic()
+        self.connection = connection
+        self.created_at = now
+        self.last_used = now
+
+
+class ConnectionPool:
+    """
+    스레드 안전한 MySQL 커넥션 풀
+
+    - min_size: 풀 생성 시 미리 열어두는 연결 수
+    - max_size: 동시에 열 수 있는 최대 연결 수
+    - timeout: 연결이 모두 사용 중일 때 대기하는 최대 시간 (초)
+    - recycle: 연결 재생성 주기 (초, 0이면 사용 안 함)
+    - ping_after: 이 시간 이상 유휴 상태였던 연결은 대여 전에 ping으로 확인 (초)
+    """
+
+    def __init__(self, connect_kwargs, min_size=1, max_size=10, timeout=10.0,
+                 recycle=3600, ping_after=5.0):
+        if max_size < 1:
+            raise ValueError('max_size must be at least 1')
+        self.connect_kwargs = dict(connect_kwargs)
+        self.min_size = max(0, min(min_size, max_size))
+        self.max_size = max_size
+        self.timeout = timeout
+        self.recycle = recycle
+        self.ping_after = ping_after
+        self.pid = os.getpid()
+
+        self._idle = deque()
+        self._in_use = set()
+        self._size = 0
+        self._cond = threading.Condition(threading.Lock())
+        self._closed = False
+
+        self._stats = {
+            'checkouts': 0,
+            'created': 0,
+            'recycled': 0,
+            'discarded': 0,
+            'timeouts': 0,
+            'waits': 0,
+            'wait_time_total': 0.0,
+            'wait_time_max': 0.0,
+        }
+
+        self._prefill()
+
+    def _prefill(self):
+        """min_size 만큼 연결을 미리 생성 (실패해도 풀은 사용 가능)"""
+        for _ in range(self.min_size):
+            try:
+                item = self._create()
+            except pymysql.Error as e:
+                print(f"Connection pool prefill error: {e}")
+                return
+            with self._cond:
+                self._size += 1
+                self._idle.append(item)
+
+    def _create(self):
+        connection = pymysql.connect(**self.connect_kwargs)
+        with self._cond:
+            self._stats['created'] += 1
+        return _PooledConnection(connection)
+
+    def _close_quietly(self, item):
+        try:
+            item.connection.close()
+        except Exception:
+            pass
+
+    def _is_expired(self, item, now):
+        return bool(self.recycle) and now - item.created_at >= self.recycle
+
+    def _is_alive(self, item, now):
+        """유휴 시간이 길었던 연결만 ping으로 생존 여부를 확인"""
+        if now - item.last_used < self.ping_after:
+            return True
+        try:
+            item.connection.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    def acquire(self):
+        """
+        풀에서 연결 대여
+
+        Returns:
+            pymysql.Connection: 사용 가능한 연결
+
+        Raises:
+            PoolTimeoutError: timeout 내에 연결을 얻지 못한 경우
+        """
+        start = time.monotonic()
+        deadline = start + self.timeout
+        waited = False
+
+        while True:
+            item = None
+            create = False
+            with self._cond:
+                if self._closed:
+                    raise pymysql.err.InterfaceError('Connection pool is closed')
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats['timeouts'] += 1
+                        raise PoolTimeoutError(
+                            f'Timed out after {self.timeout}s waiting for a connection '
+                            f'(max_size={self.max_size})'
+                        )
+                    waited = True
+                    self._cond.wait(remaining)
+                if self._idle:
+                    # LIFO: 최근에 쓴 연결을 재사용해 오래된 연결이 자연스럽게 만료되도록 함
+                    item = self._idle.pop()
+                else:
+                    self._size += 1
+                    create = True
+
+            if create:
+                try:
+                    item = self._create()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+            else:
+                now = time.monotonic()
+                if self._is_expired(item, now) or not self._is_alive(item, now):
+                    self._close_quietly(item)
+                    with self._cond:
+                        self._size -= 1
+                        if self._is_expired(item, now):
+                            self._stats['recycled'] += 1
+                        else:
+                            self._stats['discarded'] += 1
+                        self._cond.notify()
+                    continue
+
+            waited_for = time.monotonic() - start
+            with self._cond:
+                self._in_use.add(item.connection)
+                self._stats['checkouts'] += 1
+                if waited:
+                    self._stats['waits'] += 1
+                    self._stats['wait_time_total'] += waited_for
+                    self._stats['wait_time_max'] = max(self._stats['wait_time_max'], waited_for)
+            item.connection._pool_item = item
+            return item.connection
+
+    def release(self, connection, discard=False):
+        """
+        대여한 연결 반납
+
+        Args:
+            connection: acquire()로 받은 연결
+            discard: True면 재사용하지 않고 닫음 (오류가 난 연결 등)
+        """
+        item = getattr(connection, '_pool_item', None)
+        with self._cond:
+            if connection not in self._in_use:
+                return
+            self._in_use.discard(connection)
+
+        now = time.monotonic()
+        if item is None or discard or self._closed or self._is_expired(item, now) \
+                or not connection.open:
+            if item is not None:
+                self._close_quietly(item)
+            else:
+                try:
+                    connection.close()
+                except Exception:
+                    pass
+            with self._cond:
+                self._size -= 1
+                if discard or item is None or not connection.open:
+                    self._stats['discarded'] += 1
+                else:
+                    self._stats['recycled'] += 1
+                self._cond.notify()
+            return
+
+        item.last_used = now
+        with self._cond:
+            self._idle.append(item)
+            self._cond.notify()
+
+    def close(self):
+        """유휴 연결을 모두 닫고 풀을 종료 (사용 중인 연결은 반납 시 닫힘)"""
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for item in idle:
+            self._close_quietly(item)
+
+    def stats(self):
+        """풀 상태 통계 반환"""
+        with self._cond:
+            stats = dict(self._stats)
+            stats.update({
+                'size': self._size,
+                'in_use': len(self._in_use),
+                'idle': len(self._idle),
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+            })
+        waits = stats['waits']
+        stats['wait_time_avg'] = stats['wait_time_total'] / waits if waits else 0.0
+        return stats
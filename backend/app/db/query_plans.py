@@ -0,0 +1,150 @@
+"""
+쿼리 실행 계획 검사 - QUERIES의 모든 SELECT에 EXPLAIN을 실행해 전체 테이블 스캔을 찾음
+
+    flask db check-plans
+
+EXPLAIN의 type이 ALL(전체 테이블 스캔)인 테이블이 있으면 실패로 보고합니다.
+모든 행을 읽는 것이 목적인 쿼리(내보내기, 요약 재계산 등)는 FULL_SCAN_ALLOWED에 이유와 함께 등록합니다.
+
+EXPLAIN에 넘길 인자는 실제 데이터에서 고른 값(sample_values)으로 만듭니다. 없는 환자 코드를 넘기면
+MySQL이 'Impossible WHERE'로 나머지 조인의 계획을 보여주지 않기 때문입니다. 행이 몇 개뿐인 테이블은
+인덱스가 있어도 옵티마이저가 전체 스캔을 고르므로, 운영과 비슷한 양의 데이터에서 실행하세요
+(ignore_below로 예상 행 수가 적은 스캔은 무시할 수 있습니다).
+"""
+from datetime import date, datetime
+
+from app.db.database import Database
+from app.db.models import QUERIES
+
+# 전체 스캔이 정상인 쿼리 → 이유
+FULL_SCAN_ALLOWED = {
+    'get_all_patients': '전체 환자 목록 (페이징 없는 이전 API)',
+    'export_reports': '필터 없는 전체 내보내기',
+    'get_search_index_rows': '검색 인덱스 전체 적재',
+    'rebuild_patient_summaries': '모든 환자 요약 재계산',
+    'verify_patient_summaries': '모든 환자 요약 검사',
+    'get_completed_report_ids': '스냅샷 일괄 생성 (대부분의 보고서가 completed)',
+}
+
+# EXPLAIN 인자 (sample_values()의 결과 → 쿼리 인자)
+EXPLAIN_ARGS = {
+    'get_patient_report': lambda s: (s['patient_code'],),
+    'get_patient_history': lambda s: (s['patient_id'],),
+    'get_patients_page': lambda s: (20, 0),
+    'get_patients_after_cursor': lambda s: (s['sort_exam_date'], s['sort_exam_date'], s['patient_id'], 20),
+    'get_patient_birth_date': lambda s: (s['patient_code'],),
+    'get_patient_report_version': lambda s: (s['patient_code'],),
+    'get_patient_report_versions_batch': lambda s: (s['patient_code'],),
+    'get_patient_reports_batch': lambda s: (s['patient_code'],),
+    'export_reports': lambda s: {'date_from': None, 'date_to': None, 'status': None},
+    'get_search_index_changes': lambda s: (s['updated_at'],),
+    'get_patients_by_ids': lambda s: (s['patient_id'],),
+    'get_patient_trend_rows': lambda s: (s['patient_id'], 0),
+    'get_patient_trend_version': lambda s: (0, s['patient_id']),
+    'get_xray_image': lambda s: (s['report_id'],),
+    'get_report_snapshot_ref': lambda s: (s['patient_code'],),
+    'get_report_for_snapshot': lambda s: (s['report_id'],),
+    'get_patients_by_codes': lambda s: (s['patient_code'],),
+    'get_inserted_reports': lambda s: (s['report_id'], s['report_id']),
+}
+
+_SAMPLE_QUERY = """
+    SELECT p.id as patient_id, p.patient_code, p.updated_at,
+           s.latest_report_id as report_id, s.sort_exam_date
+    FROM patients p
+    JOIN patient_summaries s ON s.patient_id = p.id
+    ORDER BY s.latest_report_id IS NULL, p.id DESC
+    LIMIT 1
+"""
+
+_DEFAULT_SAMPLE = {
+    'patient_id': 1,
+    'patient_code': '2024-001234',
+    'report_id': 1,
+    'sort_exam_date': date(2024, 1, 1),
+    'updated_at': datetime(2024, 1, 1),
+}
+
+
+def sample_values():
+    """EXPLAIN 인자로 쓸 실제 환자/보고서 값 (데이터가 없으면 기본값)"""
+    row = Database.fetch_one(_SAMPLE_QUERY)
+    sample = dict(_DEFAULT_SAMPLE)
+    if row:
+        sample.update({key: value for key, value in row.items() if value is not None})
+    return sample
+
+
+def _explainable(sql):
+    """EXPLAIN할 수 있는 문장인지 (SELECT, INSERT ... SELECT)"""
+    words = sql.split()
+    if not words:
+        return False
+    keyword = words[0].upper()
+    if keyword == 'SELECT':
+        return True
+    return keyword == 'INSERT' and 'SELECT' in (word.upper() for word in words)
+
+
+def _prepare(name, sql, sample):
+    sql = sql.format(placeholders='%s')
+    make_args = EXPLAIN_ARGS.get(name)
+    if make_args is not None:
+        return sql, make_args(sample)
+    if '%s' in sql or '%(' in sql:
+        raise KeyError(f'EXPLAIN_ARGS has no sample arguments for {name}')
+    return sql, None
+
+
+def full_scans(plan, ignore_below=0):
+    """EXPLAIN 결과에서 전체 테이블 스캔인 행 (파생 테이블 제외)"""
+    scans = []
+    for row in plan:
+        table = row.get('table') or ''
+        if row.get('type') != 'ALL' or table.startswith('<'):
+            continue
+        if ignore_below and (row.get('rows') or 0) < ignore_below:
+            continue
+        scans.append(row)
+    return scans
+
+
+def check_query(name, sql, sample, ignore_below=0):
+    """
+    쿼리 하나의 실행 계획 검사
+
+    Returns:
+        dict: {'name', 'status', 'detail', 'plan'}
+            status: ok | full_scan | allowed | skipped | error
+    """
+    if not _explainable(sql):
+        return {'name': name, 'status': 'skipped', 'detail': 'not a SELECT', 'plan': []}
+    try:
+        query, args = _prepare(name, sql, sample)
+        plan = Database.fetch_all('EXPLAIN ' + query, args) or []
+    except Exception as e:
+        return {'name': name, 'status': 'error', 'detail': str(e), 'plan': []}
+
+    scans = full_scans(plan, ignore_below)
+    if not scans:
+        return {'name': name, 'status': 'ok', 'detail': '', 'plan': plan}
+    tables = ', '.join(f"{row['table']} (~{row.get('rows')} rows)" for row in scans)
+    if name in FULL_SCAN_ALLOWED:
+        return {'name': name, 'status': 'allowed', 'detail': f'{tables}: {FULL_SCAN_ALLOWED[name]}', 'plan': plan}
+    return {'name': name, 'status': 'full_scan', 'detail': f'full table scan on {tables}', 'plan': plan}
+
+
+def check_plans(names=None, ignore_below=0):
+    """
+    QUERIES 전체(또는 names)의 실행 계획 검사
+
+    Returns:
+        list: check_query() 결과 목록 (QUERIES 순서)
+    """
+    sample = sample_values()
+    results = []
+    for name, sql in QUERIES.items():
+        if names and name not in names:
+            continue
+        results.append(check_query(name, sql, sample, ignore_below))
+    return results
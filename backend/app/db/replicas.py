@@ -0,0 +1,303 @@
+"""
+읽기 복제본 라우팅 - 조회 쿼리를 복제본으로 분산하고 쓰기는 주 서버(MYSQL_HOST)에 유지
+
+    MYSQL_REPLICAS=replica1:3306,replica2:3306
+
+Database.fetch_one/fetch_all/fetch_rows/stream은 사용할 수 있는 복제본 중 하나에서 실행하고,
+execute_query/execute_many/transaction과 connection()을 직접 쓰는 코드는 항상 주 서버를 사용합니다.
+
+복제본 선택:
+    - 상태 확인: check_interval마다 백그라운드에서 복제 지연(SHOW REPLICA STATUS의 Seconds_Behind_Source)을 확인
+      연결할 수 없거나 복제가 멈췄거나 지연이 max_lag초를 넘는 복제본은 다음 확인까지 제외
+    - 부하 분산: 사용할 수 있는 복제본 두 개를 무작위로 골라 빌려간 연결이 적은 쪽 (power of two choices)
+    - 복제본이 하나도 없으면 주 서버에서 읽음
+
+쓰기 직후 읽기(read-your-writes):
+    쓰기를 한 스레드와, 쓰기를 한 요청의 클라이언트(쿠키)는 read_after_write초 동안 주 서버에서 읽습니다.
+    복제본에 아직 반영되지 않은 방금 쓴 데이터를 읽지 못하는 일을 막기 위함입니다.
+    캐시를 채우는 조회처럼 다른 클라이언트에게도 오래된 값이 퍼지면 안 되는 읽기는 primary_reads() 블록에서 실행합니다.
+
+복제가 설정되지 않은 서버(SHOW REPLICA STATUS 결과가 없음)는 지연 0으로 취급하므로,
+로컬 MySQL 두 개를 띄워 MYSQL_REPLICAS로 지정하면 복제 없이도 라우팅을 시험할 수 있습니다.
+"""
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+import pymysql
+from flask import g, has_request_context, request
+
+from app.db.pool import ConnectionPool
+
+# 쓰기 이후 주 서버에서 읽어야 하는 시각(epoch 초)을 담는 쿠키
+PRIMARY_COOKIE = 'db_primary_until'
+
+_REPLICA_STATUS_QUERIES = ('SHOW REPLICA STATUS', 'SHOW SLAVE STATUS')
+_LAG_COLUMNS = ('Seconds_Behind_Source', 'Seconds_Behind_Master')
+
+_local = threading.local()
+
+
+def parse_replicas(value, default_port=3306):
+    """'host1:3306,host2' → [('host1', 3306), ('host2', 3306)]"""
+    replicas = []
+    for item in (value or '').split(','):
+        item = item.strip()
+        if not item:
+            continue
+        host, _, port = item.rpartition(':') if ':' in item else (item, '', '')
+        replicas.append((host, int(port) if port else default_port))
+    return replicas
+
+
+class Replica:
+    """복제본 하나 (커넥션 풀과 상태)"""
+
+    def __init__(self, host, port, pool):
+        self.host = host
+        self.port = port
+        self.pool = pool
+        self.healthy = False
+        self.lag = None
+        self.error = None
+        self.checked_at = None          # time.monotonic(), 아직 확인 전이면 None
+        self.check_lock = threading.Lock()
+        self.reads = 0
+        self.failures = 0
+
+    @property
+    def name(self):
+        return f'{self.host}:{self.port}'
+
+    def in_use(self):
+        return self.pool.stats()['in_use']
+
+    def stats(self):
+        return {
+            'healthy': self.healthy,
+            'lag': self.lag,
+            'error': self.error,
+            'reads': self.reads,
+            'failures': self.failures,
+            'pool': self.pool.stats(),
+        }
+
+
+class ReplicaRouter:
+    """
+    복제본 선택과 상태 확인
+
+    Args:
+        replicas: Replica 목록
+        connect_kwargs: 상태 확인 연결 설정 (host/port 제외)
+        max_lag: 허용하는 최대 복제 지연 (초)
+        check_interval: 상태 확인 주기 (초)
+        read_after_write: 쓰기 이후 주 서버에서 읽는 시간 (초)
+        lag_query: 지연(초)을 'lag' 컬럼 하나로 돌려주는 쿼리 (예: heartbeat 테이블, 기본: SHOW REPLICA STATUS)
+    """
+
+    def __init__(self, replicas, connect_kwargs, max_lag=5, check_interval=5, read_after_write=5,
+                 lag_query=None):
+        self.replicas = list(replicas)
+        self.connect_kwargs = dict(connect_kwargs)
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.read_after_write = read_after_write
+        self.lag_query = lag_query
+        self.pid = os.getpid()
+        self._lock = threading.Lock()
+        self._stats = {'replica_reads': 0, 'primary_reads': 0, 'pinned_reads': 0, 'fallbacks': 0}
+
+    # --- 상태 확인 ---
+
+    def _read_lag(self, cursor):
+        if self.lag_query:
+            cursor.execute(self.lag_query)
+            row = cursor.fetchone()
+            return float(row['lag']) if row and row.get('lag') is not None else None
+        for query in _REPLICA_STATUS_QUERIES:
+            try:
+                cursor.execute(query)
+            except pymysql.err.ProgrammingError:
+                continue  # MySQL 8.0.22 이전은 SHOW SLAVE STATUS만 지원
+            row = cursor.fetchone()
+            if not row:
+                return 0.0  # 복제가 설정되지 않은 단독 서버
+            for column in _LAG_COLUMNS:
+                if column in row:
+                    return None if row[column] is None else float(row[column])
+            return None
+        return None
+
+    def check(self, replica):
+        """복제본 하나의 연결/지연 확인"""
+        kwargs = dict(self.connect_kwargs, host=replica.host, port=replica.port,
+                      connect_timeout=2, read_timeout=2, cursorclass=pymysql.cursors.DictCursor)
+        try:
+            connection = pymysql.connect(**kwargs)
+            try:
+                with connection.cursor() as cursor:
+                    lag = self._read_lag(cursor)
+            finally:
+                connection.close()
+        except Exception as e:
+            replica.healthy, replica.lag, replica.error = False, None, str(e)
+        else:
+            replica.lag = lag
+            if lag is None:
+                replica.healthy, replica.error = False, 'replication is not running'
+            elif lag > self.max_lag:
+                replica.healthy, replica.error = False, f'lag {lag:.0f}s exceeds {self.max_lag}s'
+            else:
+                replica.healthy, replica.error = True, None
+        replica.checked_at = time.monotonic()
+        return replica.healthy
+
+    def _refresh(self, replica, now):
+        """
+        확인 주기가 지났으면 백그라운드 스레드에서 다시 확인
+
+        요청은 확인을 기다리지 않고 이전 상태를 사용합니다 (처음 확인이 끝나기 전에는 주 서버).
+        """
+        if replica.checked_at is not None and now - replica.checked_at < self.check_interval:
+            return
+        if not replica.check_lock.acquire(blocking=False):
+            return
+
+        def run():
+            try:
+                self.check(replica)
+            finally:
+                replica.check_lock.release()
+
+        threading.Thread(target=run, name=f'replica-check-{replica.name}', daemon=True).start()
+
+    # --- 선택 ---
+
+    def pinned(self):
+        """지금 읽기를 주 서버에서 해야 하는지 (쓰기 직후, primary_reads() 블록 안)"""
+        if getattr(_local, 'primary_depth', 0):
+            return True
+        if getattr(_local, 'primary_until', 0) > time.monotonic():
+            return True
+        if has_request_context():
+            if g.get('db_wrote'):
+                return True
+            try:
+                return float(request.cookies.get(PRIMARY_COOKIE, 0)) > time.time()
+            except ValueError:
+                return False
+        return False
+
+    def choose(self):
+        """
+        읽기에 사용할 복제본 (주 서버에서 읽어야 하면 None)
+        """
+        if self.pinned():
+            self._count('pinned_reads')
+            return None
+        now = time.monotonic()
+        for replica in self.replicas:
+            self._refresh(replica, now)
+        candidates = [replica for replica in self.replicas if replica.healthy]
+        if not candidates:
+            self._count('primary_reads')
+            return None
+        if len(candidates) == 1:
+            replica = candidates[0]
+        else:
+            first, second = random.sample(candidates, 2)
+            replica = first if first.in_use() <= second.in_use() else second
+        with self._lock:
+            self._stats['replica_reads'] += 1
+            replica.reads += 1
+        return replica
+
+    def mark_failed(self, replica, error):
+        """읽기 중 연결 오류 - 다음 확인 주기까지 제외하고 주 서버로 재시도"""
+        with self._lock:
+            replica.failures += 1
+            self._stats['fallbacks'] += 1
+        replica.healthy = False
+        replica.error = str(error)
+        replica.checked_at = time.monotonic()
+
+    def mark_write(self):
+        """쓰기 발생 - 이 스레드와 요청의 클라이언트는 잠시 주 서버에서 읽음"""
+        if not self.read_after_write:
+            return
+        _local.primary_until = time.monotonic() + self.read_after_write
+        if has_request_context():
+            g.db_wrote = True
+
+    def _count(self, key):
+        with self._lock:
+            self._stats[key] += 1
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats['max_lag'] = self.max_lag
+        stats['read_after_write'] = self.read_after_write
+        stats['replicas'] = {replica.name: replica.stats() for replica in self.replicas}
+        return stats
+
+    def close(self):
+        for replica in self.replicas:
+            replica.pool.close()
+
+
+@contextmanager
+def primary_reads():
+    """블록 안에서 이 스레드의 조회는 모두 주 서버에서 실행 (중첩 가능)"""
+    _local.primary_depth = getattr(_local, 'primary_depth', 0) + 1
+    try:
+        yield
+    finally:
+        _local.primary_depth -= 1
+
+
+def create_router(config, connect_kwargs):
+    """설정의 MYSQL_REPLICAS로 라우터 생성 (복제본이 없으면 None)"""
+    hosts = parse_replicas(config.get('MYSQL_REPLICAS'), config.get('MYSQL_PORT', 3306))
+    if not hosts:
+        return None
+    replicas = []
+    for host, port in hosts:
+        pool = ConnectionPool(
+            dict(connect_kwargs, host=host, port=port),
+            # 복제본이 내려가 있어도 앱 시작이 늦어지지 않도록 미리 연결하지 않음
+            min_size=0,
+            max_size=config.get('MYSQL_POOL_MAX_SIZE', 10),
+            timeout=config.get('MYSQL_POOL_TIMEOUT', 10.0),
+            recycle=config.get('MYSQL_POOL_RECYCLE', 3600),
+            ping_after=config.get('MYSQL_POOL_PING_AFTER', 5.0),
+        )
+        replicas.append(Replica(host, port, pool))
+    check_kwargs = {key: value for key, value in connect_kwargs.items()
+                    if key not in ('host', 'port', 'cursorclass')}
+    return ReplicaRouter(
+        replicas,
+        check_kwargs,
+        max_lag=config.get('MYSQL_REPLICA_MAX_LAG', 5),
+        check_interval=config.get('MYSQL_REPLICA_CHECK_INTERVAL', 5),
+        read_after_write=config.get('MYSQL_READ_AFTER_WRITE', 5),
+        lag_query=config.get('MYSQL_REPLICA_LAG_QUERY') or None,
+    )
+
+
+def init_app(app):
+    """쓰기를 한 요청의 응답에 주 서버 읽기 쿠키 설정 (다른 워커 프로세스도 주 서버에서 읽도록)"""
+    if not app.config.get('MYSQL_REPLICAS'):
+        return
+
+    @app.after_request
+    def pin_primary_reads(response):
+        window = app.config.get('MYSQL_READ_AFTER_WRITE', 5)
+        if g.get('db_wrote') and window:
+            response.set_cookie(PRIMARY_COOKIE, str(int(time.time() + window) + 1),
+                                max_age=int(window) + 1, httponly=True, samesite='Lax')
+        return response
+
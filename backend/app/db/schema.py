@@ -0,0 +1,393 @@
+"""
+스키마/인덱스 관리 - 테이블 DDL과 버전별 마이그레이션
+
+DB 구조는 이 모듈의 MIGRATIONS가 기준입니다. `flask db migrate`가 아직 적용하지 않은 버전을
+순서대로 실행하고 schema_migrations 테이블에 기록합니다.
+
+모든 단계는 다시 실행해도 안전하게 작성합니다 (CREATE ... IF NOT EXISTS, 인덱스는 존재 여부 확인 후 생성).
+setup.sql로 만든 데이터베이스나 누군가 직접 만든 데이터베이스도 migrate 한 번으로 같은 상태가 됩니다.
+MySQL의 DDL은 트랜잭션으로 묶이지 않으므로 버전 하나가 중간에 실패하면 기록하지 않고 멈추며,
+원인을 고친 뒤 다시 실행하면 그 버전부터 이어서 적용합니다.
+
+새 인덱스/테이블 변경은 기존 버전을 고치지 말고 MIGRATIONS 끝에 새 버전으로 추가하세요.
+(setup.sql도 최신 상태와 같게 유지합니다.)
+"""
+import re
+import textwrap
+from collections import namedtuple
+
+from app.db.database import Database
+from app.db.models import QUERIES
+
+# 여러 워커가 동시에 migrate 하지 않도록 잡는 MySQL 사용자 잠금 이름
+MIGRATION_LOCK = 'bone_report.schema_migrations'
+
+Migration = namedtuple('Migration', ['version', 'description', 'steps'])
+
+
+class Index:
+    """
+    인덱스 보장 - 없으면 만들고, 같은 이름인데 컬럼이 다르면 다시 만듦
+
+    Args:
+        table: 테이블 이름
+        name: 인덱스 이름
+        columns: 컬럼 이름 튜플 (순서대로)
+        unique: UNIQUE 인덱스 여부
+    """
+
+    def __init__(self, table, name, columns, unique=False):
+        self.table = table
+        self.name = name
+        self.columns = tuple(columns)
+        self.unique = unique
+
+    def _definition(self):
+        kind = 'UNIQUE INDEX' if self.unique else 'INDEX'
+        return f"{kind} {self.name} ({', '.join(self.columns)})"
+
+    def sql(self):
+        return f'ALTER TABLE {self.table} ADD {self._definition()}'
+
+    def apply(self, cursor):
+        existing = _index_columns(cursor, self.table, self.name)
+        if existing == self.columns:
+            return False
+        if existing:
+            cursor.execute(f'ALTER TABLE {self.table} DROP INDEX {self.name}, ADD {self._definition()}')
+        else:
+            cursor.execute(self.sql())
+        return True
+
+
+class DropIndex:
+    """인덱스가 있으면 삭제 (더 넓은 인덱스로 대체된 경우)"""
+
+    def __init__(self, table, name):
+        self.table = table
+        self.name = name
+
+    def sql(self):
+        return f'ALTER TABLE {self.table} DROP INDEX {self.name}'
+
+    def apply(self, cursor):
+        if not _index_columns(cursor, self.table, self.name):
+            return False
+        cursor.execute(self.sql())
+        return True
+
+
+def _index_columns(cursor, table, name):
+    cursor.execute("""
+        SELECT COLUMN_NAME
+        FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s
+        ORDER BY SEQ_IN_INDEX
+    """, (table, name))
+    return tuple(row['COLUMN_NAME'] for row in cursor.fetchall())
+
+
+# --- 기본 테이블 (setup.sql 최초 버전) ---
+
+TABLES = {
+    'patients': """
+        CREATE TABLE IF NOT EXISTS patients (
+            id INT PRIMARY KEY AUTO_INCREMENT,
+            patient_code VARCHAR(50) UNIQUE NOT NULL COMMENT '환자 코드',
+            name VARCHAR(100) NOT NULL COMMENT '환자 이름',
+            gender ENUM('M', 'F') NOT NULL COMMENT '성별',
+            birth_date DATE NOT NULL COMMENT '생년월일',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            INDEX idx_patient_code (patient_code),
+            INDEX idx_name (name)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """,
+    'reports': """
+        CREATE TABLE IF NOT EXISTS reports (
+            id INT PRIMARY KEY AUTO_INCREMENT,
+            patient_id INT NOT NULL,
+            exam_date DATE NOT NULL COMMENT '검사 일자',
+            requested_doctor VARCHAR(100) COMMENT '의뢰 의사',
+            status ENUM('pending', 'in_progress', 'completed', 'failed') DEFAULT 'pending' COMMENT '검사 상태',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            FOREIGN KEY (patient_id) REFERENCES patients(id) ON DELETE CASCADE,
+            INDEX idx_patient_id (patient_id),
+            INDEX idx_exam_date (exam_date)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """,
+    'bone_ages': """
+        CREATE TABLE IF NOT EXISTS bone_ages (
+            id INT PRIMARY KEY AUTO_INCREMENT,
+            report_id INT NOT NULL,
+            chronological_age VARCHAR(50) COMMENT '실제 나이 (예: 11세 9개월)',
+            bone_age VARCHAR(50) COMMENT '골연령 (예: 13세 5개월)',
+            age_difference VARCHAR(50) COMMENT '나이 차이 (예: 1세 8개월)',
+            current_height DECIMAL(5, 2) COMMENT '현재 키 (cm)',
+            predicted_height_ai DECIMAL(5, 2) COMMENT 'AI 기반 예측 키 (cm)',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            FOREIGN KEY (report_id) REFERENCES reports(id) ON DELETE CASCADE,
+            INDEX idx_report_id (report_id)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """,
+    'genetic_info': """
+        CREATE TABLE IF NOT EXISTS genetic_info (
+            id INT PRIMARY KEY AUTO_INCREMENT,
+            report_id INT NOT NULL,
+            father_height DECIMAL(5, 2) COMMENT '아버지 키 (cm)',
+            mother_height DECIMAL(5, 2) COMMENT '어머니 키 (cm)',
+            predicted_height_genetic DECIMAL(5, 2) COMMENT '유전적 예측 키 (cm)',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            FOREIGN KEY (report_id) REFERENCES reports(id) ON DELETE CASCADE,
+            INDEX idx_report_id (report_id)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """,
+    'height_percentiles': """
+        CREATE TABLE IF NOT EXISTS height_percentiles (
+            id INT PRIMARY KEY AUTO_INCREMENT,
+            report_id INT NOT NULL,
+            gender ENUM('M', 'F') NOT NULL COMMENT '성별',
+            percentile INT COMMENT '백분위 순위 (1-100)',
+            percentile_rank VARCHAR(50) COMMENT '상위/하위 퍼센트',
+            assessment VARCHAR(50) COMMENT '저신장/정상/고신장',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            FOREIGN KEY (report_id) REFERENCES reports(id) ON DELETE CASCADE,
+            INDEX idx_report_id (report_id)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """,
+    'weight_info': """
+        CREATE TABLE IF NOT EXISTS weight_info (
+            id INT PRIMARY KEY AUTO_INCREMENT,
+            report_id INT NOT NULL,
+            weight DECIMAL(5, 2) COMMENT '체중 (kg)',
+            percentile INT COMMENT '백분위 순위',
+            bmi DECIMAL(5, 2) COMMENT '체질량 지수',
+            bmi_category VARCHAR(50) COMMENT '저체중/정상/과체중/비만',
+            obesity_rate DECIMAL(5, 2) COMMENT '비만도 (%)',
+            obesity_grade VARCHAR(50) COMMENT '비만 등급 (예: 경도, 중등도)',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            FOREIGN KEY (report_id) REFERENCES reports(id) ON DELETE CASCADE,
+            INDEX idx_report_id (report_id)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """,
+    'xray_analysis': """
+        CREATE TABLE IF NOT EXISTS xray_analysis (
+            id INT PRIMARY KEY AUTO_INCREMENT,
+            report_id INT NOT NULL,
+            image_path VARCHAR(255) COMMENT 'X-Ray 이미지 경로',
+            analysis_result TEXT COMMENT '분석 결과',
+            confidence_score DECIMAL(3, 2) COMMENT '신뢰도 점수 (0-1)',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            FOREIGN KEY (report_id) REFERENCES reports(id) ON DELETE CASCADE,
+            INDEX idx_report_id (report_id)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """,
+    'patient_summaries': """
+        CREATE TABLE IF NOT EXISTS patient_summaries (
+            patient_id INT PRIMARY KEY,
+            latest_exam_date DATE NULL COMMENT '최근 검사 일자',
+            total_reports INT NOT NULL DEFAULT 0 COMMENT '검사 보고서 수',
+            latest_report_id INT NULL COMMENT '최신 보고서 ID',
+            sort_exam_date DATE AS (COALESCE(latest_exam_date, '1000-01-01')) STORED COMMENT '목록 정렬용 (검사 없음은 가장 뒤)',
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            FOREIGN KEY (patient_id) REFERENCES patients(id) ON DELETE CASCADE,
+            INDEX idx_sort (sort_exam_date, patient_id)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """,
+}
+
+# 환자 요약 자동 갱신 (보고서가 바뀐 환자 한 명의 요약만 다시 계산)
+SUMMARY_ROUTINES = [
+    'DROP TRIGGER IF EXISTS trg_patients_after_insert',
+    """
+    CREATE TRIGGER trg_patients_after_insert AFTER INSERT ON patients
+    FOR EACH ROW
+    BEGIN
+        INSERT IGNORE INTO patient_summaries (patient_id, total_reports) VALUES (NEW.id, 0);
+    END
+    """,
+    'DROP PROCEDURE IF EXISTS refresh_patient_summary',
+    """
+    CREATE PROCEDURE refresh_patient_summary(IN in_patient_id INT)
+    BEGIN
+        INSERT INTO patient_summaries (patient_id, latest_exam_date, total_reports, latest_report_id)
+        SELECT
+            in_patient_id,
+            MAX(r.exam_date),
+            COUNT(r.id),
+            (SELECT r2.id FROM reports r2
+             WHERE r2.patient_id = in_patient_id
+             ORDER BY r2.exam_date DESC, r2.id DESC
+             LIMIT 1)
+        FROM reports r
+        WHERE r.patient_id = in_patient_id
+        ON DUPLICATE KEY UPDATE
+            latest_exam_date = VALUES(latest_exam_date),
+            total_reports = VALUES(total_reports),
+            latest_report_id = VALUES(latest_report_id);
+    END
+    """,
+    'DROP TRIGGER IF EXISTS trg_reports_after_insert',
+    """
+    CREATE TRIGGER trg_reports_after_insert AFTER INSERT ON reports
+    FOR EACH ROW
+    BEGIN
+        CALL refresh_patient_summary(NEW.patient_id);
+    END
+    """,
+    'DROP TRIGGER IF EXISTS trg_reports_after_update',
+    """
+    CREATE TRIGGER trg_reports_after_update AFTER UPDATE ON reports
+    FOR EACH ROW
+    BEGIN
+        IF NEW.patient_id <> OLD.patient_id THEN
+            CALL refresh_patient_summary(OLD.patient_id);
+        END IF;
+        IF NEW.patient_id <> OLD.patient_id OR NOT (NEW.exam_date <=> OLD.exam_date) THEN
+            CALL refresh_patient_summary(NEW.patient_id);
+        END IF;
+    END
+    """,
+    'DROP TRIGGER IF EXISTS trg_reports_after_delete',
+    """
+    CREATE TRIGGER trg_reports_after_delete AFTER DELETE ON reports
+    FOR EACH ROW
+    BEGIN
+        CALL refresh_patient_summary(OLD.patient_id);
+    END
+    """,
+]
+
+# 보고서 한 건의 상세 테이블 (모두 report_id로 조인)
+DETAIL_TABLES = ('bone_ages', 'genetic_info', 'height_percentiles', 'weight_info', 'xray_analysis')
+
+MIGRATIONS = [
+    Migration(1, 'base tables', list(TABLES.values())),
+    Migration(2, 'patient summary procedure and triggers', [
+        *SUMMARY_ROUTINES,
+        # 트리거가 생기기 전의 환자/보고서로 요약 채우기 (다시 실행해도 같은 결과)
+        QUERIES['rebuild_patient_summaries'],
+    ]),
+    Migration(3, 'lookup indexes on patient_code and report_id', [
+        Index('patients', 'idx_patient_code', ('patient_code',)),
+        *[Index(table, 'idx_report_id', ('report_id',)) for table in DETAIL_TABLES],
+    ]),
+    Migration(4, 'updated_at indexes for conditional GET and search index sync', [
+        Index('patients', 'idx_updated_at', ('updated_at',)),
+        Index('patient_summaries', 'idx_updated_at', ('updated_at',)),
+    ]),
+    Migration(5, 'covering indexes for report, history and patient list queries', [
+        # get_patient_report / get_patient_history / 요약 프로시저: 환자의 보고서를 검사일 순으로 (InnoDB 보조 인덱스에는 id 포함)
+        Index('reports', 'idx_patient_exam', ('patient_id', 'exam_date')),
+        # get_patient_history / get_patient_trend_rows: bone_ages를 테이블 행 없이 인덱스만으로 읽음
+        Index('bone_ages', 'idx_report_history',
+              ('report_id', 'chronological_age', 'bone_age', 'current_height', 'predicted_height_ai', 'updated_at')),
+        # get_all_patients / get_patients_page / 커서: 정렬 순서대로 요약 컬럼까지 인덱스에서 읽음
+        Index('patient_summaries', 'idx_list',
+              ('sort_exam_date', 'patient_id', 'latest_exam_date', 'total_reports', 'latest_report_id')),
+        DropIndex('patient_summaries', 'idx_sort'),
+    ]),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+_MIGRATIONS_TABLE = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version INT PRIMARY KEY,
+        description VARCHAR(255) NOT NULL,
+        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+"""
+
+
+def applied_versions(cursor):
+    """적용된 마이그레이션 버전 집합"""
+    cursor.execute(_MIGRATIONS_TABLE)
+    cursor.execute('SELECT version FROM schema_migrations')
+    return {row['version'] for row in cursor.fetchall()}
+
+
+def migration_status():
+    """
+    Returns:
+        list: [{'version', 'description', 'applied'}]
+    """
+    with Database.connection() as connection:
+        with connection.cursor() as cursor:
+            applied = applied_versions(cursor)
+    return [{'version': m.version, 'description': m.description, 'applied': m.version in applied}
+            for m in MIGRATIONS]
+
+
+def migrate(target=None, lock_timeout=60):
+    """
+    아직 적용하지 않은 마이그레이션을 순서대로 적용
+
+    Args:
+        target: 이 버전까지만 적용 (기본: 최신)
+        lock_timeout: 다른 프로세스가 migrate 중일 때 기다리는 최대 시간 (초)
+
+    Returns:
+        list: 적용한 Migration 목록
+    """
+    target = LATEST_VERSION if target is None else target
+    applied_now = []
+    with Database.connection() as connection:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT GET_LOCK(%s, %s) AS locked', (MIGRATION_LOCK, lock_timeout))
+            if not cursor.fetchone()['locked']:
+                raise RuntimeError('Another process is applying schema migrations')
+            try:
+                applied = applied_versions(cursor)
+                for migration in MIGRATIONS:
+                    if migration.version in applied or migration.version > target:
+                        continue
+                    for step in migration.steps:
+                        if hasattr(step, 'apply'):
+                            step.apply(cursor)
+                        else:
+                            cursor.execute(step)
+                    cursor.execute(
+                        'INSERT INTO schema_migrations (version, description) VALUES (%s, %s)',
+                        (migration.version, migration.description)
+                    )
+                    connection.commit()
+                    applied_now.append(migration)
+            finally:
+                cursor.execute('SELECT RELEASE_LOCK(%s)', (MIGRATION_LOCK,))
+    return applied_now
+
+
+def schema_sql():
+    """
+    최신 스키마 전체 DDL (빈 데이터베이스에 mysql 클라이언트로 실행할 수 있는 스크립트)
+
+    CREATE TABLE에 이미 있는 인덱스를 보장하는 단계는 출력하지 않습니다.
+    """
+    parts = []
+    indexes = set()
+    for migration in MIGRATIONS:
+        parts.append(f'-- {migration.version}. {migration.description}')
+        for step in migration.steps:
+            if isinstance(step, Index):
+                if (step.table, step.name) in indexes:
+                    continue
+                indexes.add((step.table, step.name))
+            elif isinstance(step, DropIndex):
+                indexes.discard((step.table, step.name))
+            else:
+                match = re.search(r'CREATE TABLE IF NOT EXISTS (\w+)', step)
+                if match:
+                    indexes.update((match.group(1), name) for name in re.findall(r'INDEX (\w+) \(', step))
+            sql = step.sql() if hasattr(step, 'sql') else textwrap.dedent(step).strip()
+            if 'BEGIN' in sql:
+                parts.append(f'DELIMITER $$\n{sql} $$\nDELIMITER ;')
+            else:
+                parts.append(f'{sql};')
+    return '\n\n'.join(parts) + '\n'
@@ -0,0 +1,347 @@
+"""
+읽기 전용 SQLite 스냅샷 백엔드 - 원격 MySQL 없이 로컬 파일 하나로 보고서 조회
+
+    DB_BACKEND=sqlite
+    SQLITE_PATH=data/bone_report.sqlite3
+
+스냅샷 파일은 `flask db export-sqlite`로 MySQL에서 만듭니다 (app/db/sqlite_export.py).
+Database.get_pool()이 MySQL 커넥션 풀 대신 SQLitePool을 돌려주므로 Database의 조회 메서드와
+그 위의 서비스(ReportService 등)는 그대로 동작합니다.
+
+    - SQLiteConnection/SQLiteCursor: pymysql 연결·커서와 같은 방식으로 사용 (DictCursor/Cursor/SSDictCursor)
+    - adapt_query: MySQL 문법의 쿼리를 SQLite 문법으로 변환 (%s → ?, GREATEST → MAX 등)
+    - sqlite3 예외는 같은 이름의 pymysql 예외로 바꿔 올리므로 기존 오류 처리(except pymysql.Error)가 그대로 적용됨
+
+파일은 읽기 전용·immutable로 열고 mmap으로 읽습니다 (잠금/변경 확인 없음).
+내보내기는 새 파일을 만든 뒤 이름을 바꿔 교체하므로, 파일이 교체되면 다음 연결부터 새 스냅샷을 읽습니다.
+쓰기 쿼리(INSERT/UPDATE, 프로시저 호출)는 변환하지 않으며 실행하면 오류가 납니다.
+"""
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+from urllib.parse import quote
+
+import pymysql
+
+from app.db.models import QUERIES
+
+# 내보내기 파일에서 DECIMAL(p, s) 컬럼의 선언 타입 (소수 자릿수를 유지하기 위해 s를 이름에 포함)
+DECIMAL_TYPE = 'DECIMAL_{scale}'
+
+# 파일 교체 확인 주기 (초)
+_RELOAD_CHECK_INTERVAL = 1.0
+
+
+# --- 값 변환 (MySQL DictCursor와 같은 파이썬 타입) ---
+
+sqlite3.register_adapter(date, date.isoformat)
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(' '))
+sqlite3.register_adapter(Decimal, float)
+
+sqlite3.register_converter('DATE', lambda value: date.fromisoformat(value.decode()))
+sqlite3.register_converter('DATETIME', lambda value: datetime.fromisoformat(value.decode()))
+for _scale in range(7):
+    sqlite3.register_converter(
+        DECIMAL_TYPE.format(scale=_scale),
+        lambda value, _quantum=Decimal(1).scaleb(-_scale): Decimal(value.decode()).quantize(_quantum),
+    )
+
+
+def _parse_iso(value):
+    """
+    선언 타입이 없는 계산 컬럼(GREATEST, MAX 등)의 날짜/시각 문자열을 date/datetime으로
+    """
+    if len(value) == 10 and value[4] == '-' and value[7] == '-':
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            return value
+    if len(value) >= 19 and value[4] == '-' and value[10] == ' ':
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return value
+    return value
+
+
+def _convert_row(row):
+    return tuple(_parse_iso(value) if value.__class__ is str else value for value in row)
+
+
+def _mysql_error(error):
+    """sqlite3 예외 → 같은 이름의 pymysql 예외 (OperationalError, ProgrammingError 등)"""
+    error_class = getattr(pymysql.err, type(error).__name__, pymysql.err.DatabaseError)
+    return error_class(str(error))
+
+
+# --- 쿼리 변환 ---
+
+_PARAMETER = re.compile(r'%\((\w+)\)s|%s|%%')
+_FUNCTIONS = (
+    (re.compile(r'\bGREATEST\s*\(', re.IGNORECASE), 'MAX('),   # 인자가 여럿인 MAX/MIN은 스칼라 함수
+    (re.compile(r'\bLEAST\s*\(', re.IGNORECASE), 'MIN('),
+    (re.compile(r'<=>'), ' IS '),                              # NULL 안전 비교
+)
+
+# 자동 변환으로 안 되는 쿼리 (MySQL 원문 → SQLite 쿼리)
+_OVERRIDES = {
+    # SQLite는 GROUP BY 없는 HAVING을 허용하지 않지만 WHERE에서 결과 컬럼 별칭을 쓸 수 있음
+    'verify_patient_summaries': QUERIES['verify_patient_summaries'].replace('HAVING', 'WHERE'),
+}
+
+# 읽기 전용 스냅샷에서 실행하지 않는 쿼리 (쓰기, 저장 프로시저)
+_WRITE_QUERIES = ('rebuild_patient_summaries', 'refresh_patient_summary')
+
+
+def _convert(query, with_args):
+    for pattern, replacement in _FUNCTIONS:
+        query = pattern.sub(replacement, query)
+    if not with_args:
+        # pymysql은 인자가 없으면 쿼리를 % 포맷하지 않음
+        return query
+
+    def replace(match):
+        if match.group(1):
+            return ':' + match.group(1)
+        return '?' if match.group(0) == '%s' else '%'
+
+    return _PARAMETER.sub(replace, query)
+
+
+# QUERIES의 SQLite 버전 ({placeholders}는 그대로 두므로 format 후 adapt_query로 변환)
+SQLITE_QUERIES = {
+    name: _convert(_OVERRIDES.get(name, sql), True)
+    for name, sql in QUERIES.items()
+    if name not in _WRITE_QUERIES and not name.startswith('insert_')
+}
+
+_QUERY_NAMES = {sql: name for name, sql in QUERIES.items()}
+
+
+@lru_cache(maxsize=512)
+def adapt_query(query, with_args=True):
+    """MySQL 문법 쿼리 → SQLite 쿼리 (QUERIES의 쿼리면 SQLITE_QUERIES의 버전)"""
+    name = _QUERY_NAMES.get(query)
+    if name in SQLITE_QUERIES:
+        return SQLITE_QUERIES[name]
+    return _convert(query, with_args)
+
+
+# --- pymysql 호환 연결 ---
+
+class SQLiteCursor:
+    """pymysql 커서처럼 쓰는 SQLite 커서 (as_dict면 DictCursor처럼 dict 행)"""
+
+    def __init__(self, cursor, as_dict):
+        self._cursor = cursor
+        self._as_dict = as_dict
+        self._columns = None
+        self.description = None
+        self.rowcount = -1
+        self.lastrowid = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _after_execute(self):
+        self.description = self._cursor.description
+        self._columns = tuple(column[0] for column in self.description) if self.description else None
+        self.rowcount = self._cursor.rowcount
+        self.lastrowid = self._cursor.lastrowid
+        return self.rowcount
+
+    def execute(self, query, args=None):
+        try:
+            self._cursor.execute(adapt_query(query, args is not None), () if args is None else args)
+        except sqlite3.Error as e:
+            raise _mysql_error(e) from e
+        return self._after_execute()
+
+    def executemany(self, query, args_list):
+        try:
+            self._cursor.executemany(adapt_query(query), args_list)
+        except sqlite3.Error as e:
+            raise _mysql_error(e) from e
+        return self._after_execute()
+
+    def _row(self, row):
+        row = _convert_row(row)
+        return dict(zip(self._columns, row)) if self._as_dict else row
+
+    def fetchone(self):
+        try:
+            row = self._cursor.fetchone()
+        except sqlite3.Error as e:
+            raise _mysql_error(e) from e
+        return None if row is None else self._row(row)
+
+    def fetchmany(self, size=None):
+        try:
+            rows = self._cursor.fetchmany(size or self._cursor.arraysize)
+        except sqlite3.Error as e:
+            raise _mysql_error(e) from e
+        return [self._row(row) for row in rows]
+
+    def fetchall(self):
+        try:
+            rows = self._cursor.fetchall()
+        except sqlite3.Error as e:
+            raise _mysql_error(e) from e
+        return [self._row(row) for row in rows]
+
+    def __iter__(self):
+        while True:
+            row = self.fetchone()
+            if row is None:
+                return
+            yield row
+
+    def close(self):
+        self._cursor.close()
+
+
+class SQLiteConnection:
+    """pymysql 연결처럼 쓰는 읽기 전용 SQLite 연결"""
+
+    def __init__(self, connection, file_id):
+        self._connection = connection
+        self.file_id = file_id
+
+    def cursor(self, cursor_class=None):
+        as_dict = cursor_class is None or issubclass(cursor_class, pymysql.cursors.DictCursorMixin)
+        return SQLiteCursor(self._connection.cursor(), as_dict)
+
+    # 읽기 전용이므로 트랜잭션 경계는 의미가 없음 (쓰기는 execute에서 실패)
+    def begin(self):
+        pass
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def ping(self, reconnect=False):
+        pass
+
+    def close(self):
+        self._connection.close()
+
+
+class SQLitePool:
+    """
+    SQLite 스냅샷 연결 재사용 (ConnectionPool과 같은 acquire/release/stats/close)
+
+    - path: 스냅샷 파일 경로
+    - mmap_size: 메모리 매핑할 최대 바이트 수 (0이면 일반 read)
+    - cache_size: 연결별 페이지 캐시 크기 (KiB)
+    - max_idle: 보관하는 유휴 연결 수 (연결 수 제한은 없음)
+    """
+
+    def __init__(self, path, mmap_size=256 * 1024 * 1024, cache_size=8192, max_idle=32):
+        self.path = os.path.abspath(path)
+        self.mmap_size = int(mmap_size)
+        self.cache_size = int(cache_size)
+        self.max_idle = max_idle
+        self.pid = os.getpid()
+
+        self._idle = []
+        self._in_use = 0
+        self._lock = threading.Lock()
+        self._file_id = self._stat()
+        self._checked_at = time.monotonic()
+        self._stats = {'checkouts': 0, 'created': 0, 'reloads': 0}
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns
+
+    def _check_reload(self):
+        """스냅샷 파일이 교체되었으면 유휴 연결을 버려 새 파일을 열도록 함 (_lock 안에서 호출)"""
+        now = time.monotonic()
+        if now - self._checked_at < _RELOAD_CHECK_INTERVAL:
+            return []
+        self._checked_at = now
+        file_id = self._stat()
+        if file_id == self._file_id:
+            return []
+        self._file_id = file_id
+        self._stats['reloads'] += 1
+        stale, self._idle = self._idle, []
+        return stale
+
+    def _create(self, file_id):
+        uri = f"file:{quote(self.path)}?mode=ro&immutable=1"
+        try:
+            connection = sqlite3.connect(uri, uri=True, detect_types=sqlite3.PARSE_DECLTYPES,
+                                         check_same_thread=False, isolation_level=None)
+            connection.execute(f'PRAGMA mmap_size = {self.mmap_size}')
+            connection.execute(f'PRAGMA cache_size = -{self.cache_size}')
+            connection.execute('PRAGMA query_only = ON')
+        except sqlite3.Error as e:
+            raise _mysql_error(sqlite3.OperationalError(f'{e}: {self.path}')) from e
+        return SQLiteConnection(connection, file_id)
+
+    def acquire(self):
+        with self._lock:
+            stale = self._check_reload()
+            connection = self._idle.pop() if self._idle else None
+            file_id = self._file_id
+            self._in_use += 1
+            self._stats['checkouts'] += 1
+        for item in stale:
+            item.close()
+        if connection is not None:
+            return connection
+        try:
+            connection = self._create(file_id)
+        except Exception:
+            with self._lock:
+                self._in_use -= 1
+            raise
+        with self._lock:
+            self._stats['created'] += 1
+        return connection
+
+    def release(self, connection, discard=False):
+        with self._lock:
+            self._in_use -= 1
+            keep = not discard and connection.file_id == self._file_id and len(self._idle) < self.max_idle
+            if keep:
+                self._idle.append(connection)
+        if not keep:
+            connection.close()
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['in_use'] = self._in_use
+            stats['idle'] = len(self._idle)
+        # ConnectionPool.stats()와 같은 키 (연결 수 제한과 대기가 없으므로 max_size는 None, timeouts는 0)
+        stats.update({
+            'size': stats['in_use'] + stats['idle'],
+            'min_size': 0,
+            'max_size': None,
+            'timeouts': 0,
+        })
+        stats['backend'] = 'sqlite'
+        stats['path'] = self.path
+        stats['mmap_size'] = self.mmap_size
+        return stats
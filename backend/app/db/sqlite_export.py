@@ -0,0 +1,194 @@
+"""
+SQLite 스냅샷 내보내기 - MySQL의 보고서 테이블을 읽기 전용 SQLite 파일 하나로 복사
+
+    flask db export-sqlite data/bone_report.sqlite3
+
+컬럼과 인덱스는 MySQL의 information_schema에서 읽어 그대로 만들므로(마이그레이션으로 추가한 커버링 인덱스 포함)
+SQLite에서도 QUERIES가 같은 인덱스를 사용합니다.
+모든 테이블은 하나의 일관된 읽기 스냅샷(START TRANSACTION WITH CONSISTENT SNAPSHOT)에서 읽으므로
+내보내는 동안 보고서가 추가되어도 테이블 사이에 어긋난 행이 생기지 않습니다.
+
+임시 파일에 모두 쓴 뒤 이름을 바꿔 교체하므로, 실행 중인 서버는 교체 전까지 이전 스냅샷을 계속 읽고
+교체 후에는 새 연결부터 새 스냅샷을 읽습니다 (SQLitePool).
+"""
+import os
+import sqlite3
+from collections import OrderedDict
+from datetime import datetime
+
+import pymysql
+
+from app.db.database import Database
+from app.db.schema import TABLES
+from app.db.sqlite_backend import DECIMAL_TYPE
+
+_INTEGER_TYPES = ('tinyint', 'smallint', 'mediumint', 'int', 'bigint', 'year')
+_SQLITE_TYPES = {
+    'float': 'REAL',
+    'double': 'REAL',
+    'date': 'DATE',
+    'datetime': 'DATETIME',
+    'timestamp': 'DATETIME',
+    'blob': 'BLOB',
+    'mediumblob': 'BLOB',
+    'longblob': 'BLOB',
+}
+
+
+def _sqlite_type(column):
+    """MySQL 컬럼 타입 → SQLite 선언 타입 (sqlite_backend의 변환기 이름과 맞춤)"""
+    data_type = column['DATA_TYPE'].lower()
+    if data_type in _INTEGER_TYPES:
+        return 'INTEGER'
+    if data_type == 'decimal':
+        return DECIMAL_TYPE.format(scale=column['NUMERIC_SCALE'] or 0)
+    return _SQLITE_TYPES.get(data_type, 'TEXT')
+
+
+def _read_columns(cursor, table):
+    cursor.execute("""
+        SELECT COLUMN_NAME, DATA_TYPE, NUMERIC_SCALE, IS_NULLABLE
+        FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+        ORDER BY ORDINAL_POSITION
+    """, (table,))
+    return cursor.fetchall()
+
+
+def _read_indexes(cursor, table):
+    """{인덱스 이름: (unique, 컬럼 튜플)} (PRIMARY 포함)"""
+    cursor.execute("""
+        SELECT INDEX_NAME, NON_UNIQUE, COLUMN_NAME
+        FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+        ORDER BY INDEX_NAME, SEQ_IN_INDEX
+    """, (table,))
+    indexes = OrderedDict()
+    for row in cursor.fetchall():
+        unique, columns = indexes.get(row['INDEX_NAME'], (not row['NON_UNIQUE'], ()))
+        indexes[row['INDEX_NAME']] = (unique, columns + (row['COLUMN_NAME'],))
+    return indexes
+
+
+def table_ddl(table, columns, indexes):
+    """
+    SQLite CREATE TABLE / CREATE INDEX 문
+
+    정수 단일 컬럼 기본 키는 INTEGER PRIMARY KEY(rowid)로 만들어 기본 키 조회가 별도 인덱스를 거치지 않게 합니다.
+    SQLite의 인덱스 이름은 데이터베이스 전체에서 고유해야 하므로 '<테이블>__<인덱스>'로 바꿉니다.
+
+    Returns:
+        tuple: (CREATE TABLE 문, CREATE INDEX 문 목록)
+    """
+    primary = indexes.get('PRIMARY', (True, ()))[1]
+    definitions = []
+    rowid_primary = False
+    for column in columns:
+        name = column['COLUMN_NAME']
+        sqlite_type = _sqlite_type(column)
+        definition = f'"{name}" {sqlite_type}'
+        if primary == (name,) and sqlite_type == 'INTEGER':
+            definition += ' PRIMARY KEY'
+            rowid_primary = True
+        elif column['IS_NULLABLE'] == 'NO':
+            definition += ' NOT NULL'
+        definitions.append(definition)
+    if primary and not rowid_primary:
+        definitions.append(f"PRIMARY KEY ({', '.join(primary)})")
+    create_table = f'CREATE TABLE "{table}" (\n    ' + ',\n    '.join(definitions) + '\n)'
+
+    create_indexes = []
+    for name, (unique, index_columns) in indexes.items():
+        if name == 'PRIMARY':
+            continue
+        kind = 'UNIQUE INDEX' if unique else 'INDEX'
+        quoted = ', '.join(f'"{column}"' for column in index_columns)
+        create_indexes.append(f'CREATE {kind} "{table}__{name}" ON "{table}" ({quoted})')
+    return create_table, create_indexes
+
+
+def _copy_table(source, target, table, columns, batch_size):
+    names = [column['COLUMN_NAME'] for column in columns]
+    select = f"SELECT {', '.join(f'`{name}`' for name in names)} FROM `{table}`"
+    insert = f'INSERT INTO "{table}" VALUES ({", ".join("?" * len(names))})'
+    copied = 0
+    cursor = source.cursor(pymysql.cursors.SSCursor)
+    try:
+        cursor.execute(select)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            target.executemany(insert, rows)
+            copied += len(rows)
+    finally:
+        cursor.close()
+    return copied
+
+
+def export_snapshot(path, batch_size=5000):
+    """
+    MySQL 테이블(schema.TABLES)을 SQLite 스냅샷 파일로 내보내기
+
+    Args:
+        path: 만들 SQLite 파일 경로 (있으면 교체)
+        batch_size: 한 번에 읽어 쓰는 행 수
+
+    Returns:
+        dict: {테이블 이름: 행 수}
+    """
+    if Database.embedded():
+        raise RuntimeError('export_snapshot reads from MySQL; unset DB_BACKEND=sqlite to export')
+
+    path = os.path.abspath(path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f'{path}.{os.getpid()}.tmp'
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+
+    counts = {}
+    target = sqlite3.connect(temp_path, isolation_level=None)
+    try:
+        # 만드는 중인 임시 파일이므로 저널/동기화 없이 기록
+        target.execute('PRAGMA journal_mode = OFF')
+        target.execute('PRAGMA synchronous = OFF')
+        target.execute('BEGIN')
+        with Database.connection() as source:
+            with source.cursor() as cursor:
+                cursor.execute('START TRANSACTION WITH CONSISTENT SNAPSHOT, READ ONLY')
+                try:
+                    cursor.execute('SELECT MAX(version) as version FROM schema_migrations')
+                    schema_version = cursor.fetchone()['version'] or 0
+                except pymysql.err.ProgrammingError:
+                    schema_version = 0  # schema_migrations 테이블이 없는 데이터베이스
+                definitions = {}
+                for table in TABLES:
+                    columns = _read_columns(cursor, table)
+                    indexes = _read_indexes(cursor, table)
+                    definitions[table] = (columns, table_ddl(table, columns, indexes))
+            try:
+                for table, (columns, (create_table, _)) in definitions.items():
+                    target.execute(create_table)
+                    counts[table] = _copy_table(source, target, table, columns, batch_size)
+            finally:
+                source.commit()
+
+        # 인덱스는 데이터를 모두 넣은 뒤 한 번에 만드는 것이 빠름
+        for _, (_, create_indexes) in definitions.values():
+            for statement in create_indexes:
+                target.execute(statement)
+        target.execute('CREATE TABLE snapshot_meta (key TEXT PRIMARY KEY, value TEXT)')
+        target.executemany('INSERT INTO snapshot_meta VALUES (?, ?)', [
+            ('exported_at', datetime.now().isoformat(' ', 'seconds')),
+            ('schema_version', str(schema_version)),
+        ])
+        target.execute('COMMIT')
+        # 옵티마이저 통계 (sqlite_stat1) - 인덱스 선택에 사용
+        target.execute('ANALYZE')
+    except BaseException:
+        target.close()
+        os.remove(temp_path)
+        raise
+    target.close()
+    os.replace(temp_path, path)
+    return counts
@@ -0,0 +1,103 @@
+"""
+빠른 JSON 인코딩 - orjson으로 응답 직렬화 (설치되어 있지 않으면 표준 json)
+
+Flask의 기본 JSON provider는 표준 json 모듈과 파이썬 default 함수로 값을 하나씩 변환하므로
+수천 행의 환자 목록에서는 직렬화가 대부분의 CPU를 차지합니다. init_app이 app.json을 교체하므로
+jsonify()를 쓰는 모든 라우트가 그대로 이 인코더를 사용합니다.
+
+값 변환 규칙 (Flask 라우트, ASGI 앱, NDJSON 내보내기 공통):
+    - date/datetime: ISO 8601 ('2024-11-20', '2024-11-20T10:00:00')
+    - Decimal: 문자열 ('150.20', Flask 기본 provider와 같음)
+"""
+import dataclasses
+import decimal
+import json
+import uuid
+from datetime import date, datetime
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(o):
+    """orjson/json이 직접 처리하지 못하는 값 변환"""
+    if isinstance(o, decimal.Decimal):
+        return str(o)
+    if isinstance(o, (date, datetime)):
+        return o.isoformat()
+    if isinstance(o, uuid.UUID):
+        return str(o)
+    if dataclasses.is_dataclass(o):
+        return dataclasses.asdict(o)
+    if isinstance(o, (set, frozenset)):
+        return list(o)
+    raise TypeError(f'Object of type {type(o).__name__} is not JSON serializable')
+
+
+def dumps_bytes(obj, sort_keys=False, indent=False):
+    """obj → UTF-8 JSON bytes"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=_default, option=option)
+    return json.dumps(obj, ensure_ascii=False, default=_default, sort_keys=sort_keys,
+                      indent=2 if indent else None,
+                      separators=None if indent else (',', ':')).encode('utf-8')
+
+
+def dumps(obj, sort_keys=False, indent=False):
+    """obj → JSON 문자열"""
+    return dumps_bytes(obj, sort_keys=sort_keys, indent=indent).decode('utf-8')
+
+
+def loads(s):
+    if orjson is not None:
+        return orjson.loads(s)
+    return json.loads(s)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    orjson 기반 Flask JSON provider
+
+    JSON_SORT_KEYS 설정을 따르며(기본 False), 디버그 모드에서는 들여쓰기한 응답을 보냅니다.
+    표준 json 전용 인자(cls 등)가 주어지면 기본 provider로 처리합니다.
+    """
+
+    sort_keys = False
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.sort_keys = app.config.get('JSON_SORT_KEYS', False)
+
+    def _indent(self):
+        if self.compact is None:
+            return self._app.debug
+        return not self.compact
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return dumps(obj, sort_keys=self.sort_keys)
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = dumps_bytes(obj, sort_keys=self.sort_keys, indent=self._indent())
+        return self._app.response_class(body + b'\n', mimetype=self.mimetype)
+
+
+def init_app(app):
+    """jsonify()/request.get_json()/tojson이 FastJSONProvider를 사용하도록 설정"""
+    app.json = FastJSONProvider(app)
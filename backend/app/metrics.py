@@ -0,0 +1,316 @@
+"""
+성능 지표 수집 - 쿼리별 지연 시간, 느린 쿼리 로그, Prometheus /metrics 엔드포인트
+
+Database가 실행하는 쿼리는 QUERIES의 키 이름(예: 'get_patient_report')으로,
+요청은 라우트 규칙(예: '/api/reports/patient/<patient_code>')으로 묶어서 집계합니다.
+값은 프로세스 메모리에만 쌓이므로 여러 워커를 띄우면 워커별로 따로 수집됩니다.
+"""
+import logging
+import threading
+import time
+from bisect import bisect_left
+
+from flask import Response, current_app, g, request
+
+from app.db.models import QUERIES
+
+# 느린 쿼리 로그 (Flask 앱 로거 'app'의 하위 로거이므로 앱 로그와 함께 출력됨)
+slow_query_logger = logging.getLogger('app.slow_query')
+
+# 히스토그램 구간 (초)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# 반환 행 수 구간
+ROW_BUCKETS = (0, 1, 5, 10, 50, 100, 500, 1000, 5000, 10000, 100000)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# QUERIES에 없는 SQL의 이름
+ADHOC_QUERY = 'adhoc'
+# 이름을 기억해 둘 SQL 문자열 수 ({placeholders} 치환 결과가 길이별로 달라지므로 제한)
+_NAME_CACHE_LIMIT = 2048
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """단조 증가 카운터"""
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, label_values=(), amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def collect(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} counter']
+        with self._lock:
+            items = sorted(self._values.items())
+        for label_values, value in items:
+            lines.append(f'{self.name}{_format_labels(self.labels, label_values)} {_format_value(value)}')
+        return lines
+
+
+class Histogram:
+    """구간별 누적 분포 (Prometheus histogram)"""
+
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series = {}  # label_values -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value, label_values=()):
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[i] += 1
+            series[-1] += value
+
+    def collect(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._series.items())
+        for label_values, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), series[:-1]):
+                cumulative += count
+                le = f'le="{_format_value(float(bound))}"'
+                lines.append(f'{self.name}_bucket{_format_labels(self.labels, label_values, le)} {cumulative}')
+            labels = _format_labels(self.labels, label_values)
+            lines.append(f'{self.name}_sum{labels} {_format_value(series[-1])}')
+            lines.append(f'{self.name}_count{labels} {cumulative}')
+        return lines
+
+
+def params_shape(args):
+    """
+    쿼리 파라미터의 형태만 표시 (환자 정보가 로그에 남지 않도록 값은 제외)
+
+    예: ('2024-001', 3) → '(str, int)', 200개의 str 튜플 → '(str × 200)'
+    """
+    if args is None:
+        return 'None'
+    if isinstance(args, dict):
+        return '{' + ', '.join(f'{key}: {type(value).__name__}' for key, value in args.items()) + '}'
+    if isinstance(args, (list, tuple)):
+        types = [type(value).__name__ for value in args]
+        if len(types) > 3 and len(set(types)) == 1:
+            return f'({types[0]} × {len(types)})'
+        return '(' + ', '.join(types) + ')'
+    return type(args).__name__
+
+
+class Metrics:
+    """앱 하나의 지표 모음"""
+
+    def __init__(self, slow_query_threshold=0.2):
+        """
+        Args:
+            slow_query_threshold: 이 시간(초) 이상 걸린 쿼리를 로그에 남김 (0 이하면 끔)
+        """
+        self.slow_query_threshold = slow_query_threshold
+        self.query_duration = Histogram(
+            'db_query_duration_seconds', 'Query execution time including fetch', ('query',))
+        self.query_rows = Histogram(
+            'db_query_rows', 'Rows returned per query', ('query',), buckets=ROW_BUCKETS)
+        self.query_errors = Counter('db_query_errors_total', 'Queries that raised an error', ('query',))
+        self.slow_queries = Counter('db_slow_queries_total', 'Queries slower than the threshold', ('query',))
+        self.acquire_duration = Histogram(
+            'db_connection_acquire_seconds', 'Time spent waiting for a pooled connection')
+        self.request_duration = Histogram(
+            'http_request_duration_seconds', 'Request latency until the response is returned',
+            ('method', 'route'))
+        self.requests = Counter('http_requests_total', 'Requests by status code', ('method', 'route', 'status'))
+
+        self._names = {}
+        self._templates = []
+        for name, sql in QUERIES.items():
+            if '{' in sql:
+                # '{placeholders}' 등으로 치환되는 쿼리는 치환 전 앞부분으로 구분
+                self._templates.append((sql[:sql.index('{')], name))
+            else:
+                self._names[sql] = name
+
+    def query_name(self, sql):
+        """SQL 문자열 → QUERIES 키 이름 (없으면 'adhoc')"""
+        name = self._names.get(sql)
+        if name is not None:
+            return name
+        name = ADHOC_QUERY
+        for prefix, template_name in self._templates:
+            if sql.startswith(prefix):
+                name = template_name
+                break
+        if len(self._names) < _NAME_CACHE_LIMIT:
+            self._names[sql] = name
+        return name
+
+    def observe_query(self, sql, args, duration, rows, error=False):
+        name = self.query_name(sql)
+        labels = (name,)
+        self.query_duration.observe(duration, labels)
+        if error:
+            self.query_errors.inc(labels)
+        elif rows is not None:
+            self.query_rows.observe(rows, labels)
+        if 0 < self.slow_query_threshold <= duration:
+            self.slow_queries.inc(labels)
+            slow_query_logger.warning(
+                'Slow query %s took %.1fms (rows=%s, params=%s): %s',
+                name, duration * 1000, rows, params_shape(args), ' '.join(sql.split()),
+            )
+
+    def observe_acquire(self, duration):
+        self.acquire_duration.observe(duration)
+
+    def observe_request(self, method, route, status, duration):
+        self.request_duration.observe(duration, (method, route))
+        self.requests.inc((method, route, str(status)))
+
+    def render(self, extra_lines=()):
+        """Prometheus 텍스트 형식"""
+        lines = []
+        for metric in (self.query_duration, self.query_rows, self.query_errors, self.slow_queries,
+                       self.acquire_duration, self.request_duration, self.requests):
+            lines.extend(metric.collect())
+        lines.extend(extra_lines)
+        return '\n'.join(lines) + '\n'
+
+
+def get_metrics():
+    """현재 앱의 지표 모음 (수집을 끈 경우 None)"""
+    return current_app.extensions.get('metrics')
+
+
+class QueryTimer:
+    """
+    쿼리 한 번의 실행 시간 측정
+
+    with QueryTimer(metrics, sql, args) as timer:
+        cursor.execute(...)
+        timer.rows = cursor.rowcount
+    """
+    __slots__ = ('metrics', 'sql', 'args', 'rows', 'started')
+
+    def __init__(self, metrics, sql, args):
+        self.metrics = metrics
+        self.sql = sql
+        self.args = args
+        self.rows = None
+        self.started = 0.0
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.metrics is not None:
+            self.metrics.observe_query(
+                self.sql, self.args, time.perf_counter() - self.started, self.rows, exc_type is not None
+            )
+        return False
+
+
+def _gauge(name, help_text, value):
+    return [f'# HELP {name} {help_text}', f'# TYPE {name} gauge', f'{name} {_format_value(value)}']
+
+
+def _counter(name, help_text, value):
+    return [f'# HELP {name} {help_text}', f'# TYPE {name} counter', f'{name} {_format_value(value)}']
+
+
+# 커넥션 풀 통계 키 → 설명 (현재 상태)
+_POOL_GAUGES = (
+    ('size', 'Open pooled connections'),
+    ('in_use', 'Pooled connections checked out'),
+    ('idle', 'Idle pooled connections'),
+    ('max_size', 'Pool size limit'),
+)
+# 커넥션 풀 통계 키 → 설명 (시작 후 누적, 이름에 _total)
+_POOL_COUNTERS = (
+    ('checkouts', 'Connections checked out of the pool'),
+    ('timeouts', 'Pool acquire timeouts'),
+)
+# 보고서 캐시 통계 키 → 설명 (시작 후 누적, 이름에 _total)
+_CACHE_COUNTERS = (
+    ('hits', 'Report cache hits'),
+    ('misses', 'Report cache misses'),
+    ('errors', 'Report cache backend errors'),
+)
+
+
+def _pool_and_cache_lines():
+    """스크랩 시점의 커넥션 풀/캐시 상태"""
+    from app.db.database import Database
+    from app.services.cache import get_report_cache
+
+    lines = []
+    pool = Database.pool_stats()
+    if pool:
+        # 값이 없는 항목은 건너뜀 (SQLite 스냅샷 풀은 연결 수 제한이 없음)
+        for key, help_text in _POOL_GAUGES:
+            if pool.get(key) is not None:
+                lines += _gauge(f'db_pool_{key}', help_text, pool[key])
+        for key, help_text in _POOL_COUNTERS:
+            if pool.get(key) is not None:
+                lines += _counter(f'db_pool_{key}_total', help_text, pool[key])
+    cache = get_report_cache().stats()
+    for key, help_text in _CACHE_COUNTERS:
+        if key in cache:
+            lines += _counter(f'report_cache_{key}_total', help_text, cache[key])
+    if 'entries' in cache:
+        lines += _gauge('report_cache_entries', 'Report cache entries', cache['entries'])
+    return lines
+
+
+def init_app(app):
+    """지표 수집과 /metrics 엔드포인트 등록 (METRICS_ENABLED=false면 아무것도 하지 않음)"""
+    if not app.config.get('METRICS_ENABLED', True):
+        return
+
+    metrics = Metrics(slow_query_threshold=app.config.get('SLOW_QUERY_THRESHOLD_MS', 200) / 1000.0)
+    app.extensions['metrics'] = metrics
+
+    @app.before_request
+    def start_request_timer():
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def record_request(response):
+        started = g.get('request_started')
+        if started is not None:
+            # 경로 값 대신 라우트 규칙으로 묶어 라벨 수가 늘어나지 않게 함
+            route = request.url_rule.rule if request.url_rule else 'unmatched'
+            metrics.observe_request(request.method, route, response.status_code,
+                                    time.perf_counter() - started)
+        return response
+
+    @app.route('/metrics', methods=['GET'])
+    def prometheus_metrics():
+        return Response(metrics.render(_pool_and_cache_lines()), content_type=CONTENT_TYPE)
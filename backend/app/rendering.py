@@ -0,0 +1,196 @@
+"""
+보고서 서버 렌더링 - 페이지 조각(page_*.html)을 한 번에 조립
+
+report.js의 loadHTML()/populateReportFromData()가 브라우저에서 하던 일을 서버에서 수행합니다.
+각 조각의 data-field / data-field-prefix 요소를 Jinja 표현식으로 바꾼 템플릿을 만들어 두고
+(Jinja 환경이 컴파일 결과를 캐시), report.html이 이를 include 하여 한 번의 응답으로 보냅니다.
+"""
+import html
+import os
+import re
+
+from jinja2 import BaseLoader, ChoiceLoader, TemplateNotFound
+from markupsafe import Markup
+
+# report.html에 들어가는 페이지 조각 (표시 순서)
+REPORT_FRAGMENTS = [
+    'page_cover.html',
+    'page_summary.html',
+    'page_height.html',
+    'page_weight.html',
+    'page_bodymass.html',
+    'page_expected_height.html',
+    'page_xray.html',
+]
+
+# 서버 렌더링용 조각 템플릿 이름 접두사 (예: 'prerendered/page_cover.html')
+PRERENDERED_PREFIX = 'prerendered/'
+
+_IMG_FIELD_RE = re.compile(r'<img\b[^>]*\bdata-field="([^"]+)"[^>]*>', re.IGNORECASE)
+_SRC_RE = re.compile(r'\bsrc="([^"]*)"')
+_FIELD_RE = re.compile(r'<(\w+)(\s[^>]*?\bdata-field="([^"]+)"[^>]*)>(.*?)</\1>', re.DOTALL)
+_PREFIX_RE = re.compile(r'<(\w+)(\s[^>]*?\bdata-field-prefix="([^"]+)"[^>]*)>(.*?)</\1>', re.DOTALL)
+_TAG_RE = re.compile(r'<[^>]+>')
+_STATIC_URL_RE = re.compile(r'\b(src|href)="\.\./static/([^"]+)"')
+# 보고서 값으로 바뀌지 않는 정적 이미지 (data-field 없음)
+_STATIC_IMG_RE = re.compile(r'<img\b(?![^>]*\bdata-field=)(?=[^>]*\bsrc="\.\./static/([^"]+)")', re.IGNORECASE)
+
+# report.js와 동일한 규칙
+_RANK_SUFFIX_RE = re.compile(r'(번째|순위)')
+_UNIT_RE = re.compile(r'(cm|kg|%|kg/m²)')
+_LEADING_INT_RE = re.compile(r'^\s*([+-]?\d+)')
+
+
+def get_nested(obj, path):
+    """'patient.name' 형식의 경로로 중첩 dict 값 조회 (없으면 None)"""
+    if not obj or not path:
+        return None
+    for key in path.split('.'):
+        if not isinstance(obj, dict) or obj.get(key) is None:
+            return None
+        obj = obj[key]
+    return obj
+
+
+def _to_text(value):
+    """JS의 String(value)와 같은 결과가 나오도록 변환"""
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _text_content(fragment_html):
+    return html.unescape(_TAG_RE.sub('', fragment_html))
+
+
+def report_field(report, key, original_html):
+    """
+    data-field 요소의 내용 (populateReportFromData와 동일한 규칙)
+
+    - 값이 없으면 원래 내용을 유지
+    - 원래 문구에 '번째'/'순위'가 있으면 정수 + 접미사
+    - 원래 문구에 단위(cm, kg, %, kg/m²)가 있으면 값 + 단위
+    """
+    value = get_nested(report, key)
+    if value is None:
+        return Markup(original_html)
+    text = _to_text(value)
+    original = _text_content(original_html)
+
+    rank = _RANK_SUFFIX_RE.search(original)
+    if rank:
+        number = _LEADING_INT_RE.match(text)
+        if number:
+            return f'{int(number.group(1))}{rank.group(1)}'
+
+    unit = _UNIT_RE.search(original)
+    if unit:
+        return text + unit.group(0)
+    return text
+
+
+def report_field_prefix(report, key, original_html):
+    """data-field-prefix 요소의 내용 (첫 단어만 값으로 교체)"""
+    value = get_nested(report, key)
+    if value is None:
+        return Markup(original_html)
+    parts = re.split(r'\s+', _text_content(original_html))
+    parts[0] = _to_text(value)
+    return ' '.join(parts)
+
+
+def report_field_src(report, key, original_src):
+    """data-field가 있는 img의 src"""
+    value = get_nested(report, key)
+    if value is None:
+        return original_src
+    return _to_text(value)
+
+
+def compile_fragment(source):
+    """
+    페이지 조각 HTML을 서버 렌더링용 Jinja 템플릿 소스로 변환
+
+    Args:
+        source: page_*.html 원본
+
+    Returns:
+        str: report 변수를 받아 값을 채우는 Jinja 템플릿 소스
+    """
+    def img(match):
+        key = match.group(1)
+        return _SRC_RE.sub(
+            lambda m: f'src="{{{{ report_field_src(report, {key!r}, {m.group(1)!r}) }}}}"',
+            match.group(0),
+            count=1,
+        )
+
+    def field(match):
+        tag, attrs, key, inner = match.groups()
+        return f'<{tag}{attrs}>{{{{ report_field(report, {key!r}, {inner!r}) }}}}</{tag}>'
+
+    def prefix(match):
+        tag, attrs, key, inner = match.groups()
+        return f'<{tag}{attrs}>{{{{ report_field_prefix(report, {key!r}, {inner!r}) }}}}</{tag}>'
+
+    # 조각 파일은 순수 HTML이며 Jinja 문법('{{', '{%')을 사용하지 않는다고 가정
+    source = _IMG_FIELD_RE.sub(img, source)
+    source = _FIELD_RE.sub(field, source)
+    source = _PREFIX_RE.sub(prefix, source)
+    # 정적 이미지는 빌드된 너비별 WebP 변형을 srcset으로 (sizes는 조각 HTML에 지정)
+    source = _STATIC_IMG_RE.sub(
+        lambda m: (f'<img{{% with srcset = asset_srcset({m.group(1)!r}) %}}'
+                   '{% if srcset %} srcset="{{ srcset }}"{% endif %}{% endwith %}'),
+        source,
+    )
+    # 정적 파일 경로는 url_for로 바꿔 빌드된(해시된) 파일명을 사용
+    source = _STATIC_URL_RE.sub(
+        lambda m: f'{m.group(1)}="{{{{ url_for(\'static\', filename={m.group(2)!r}) }}}}"',
+        source,
+    )
+    return source
+
+
+class PrerenderedFragmentLoader(BaseLoader):
+    """'prerendered/<조각>.html' 이름으로 변환된 조각 템플릿을 제공"""
+
+    def __init__(self, template_dir):
+        self.template_dir = template_dir
+
+    def get_source(self, environment, template):
+        if not template.startswith(PRERENDERED_PREFIX):
+            raise TemplateNotFound(template)
+        filename = template[len(PRERENDERED_PREFIX):]
+        if filename not in REPORT_FRAGMENTS:
+            raise TemplateNotFound(template)
+
+        path = os.path.join(self.template_dir, filename)
+        if not os.path.exists(path):
+            raise TemplateNotFound(template)
+        mtime = os.path.getmtime(path)
+        with open(path, encoding='utf-8') as f:
+            source = compile_fragment(f.read())
+        return source, path, lambda: os.path.exists(path) and os.path.getmtime(path) == mtime
+
+    def list_templates(self):
+        return [PRERENDERED_PREFIX + name for name in REPORT_FRAGMENTS]
+
+
+def init_app(app, template_dir):
+    """서버 렌더링용 로더와 템플릿 함수 등록"""
+    app.jinja_loader = ChoiceLoader([app.jinja_loader, PrerenderedFragmentLoader(template_dir)])
+    app.jinja_env.globals.update(
+        report_field=report_field,
+        report_field_prefix=report_field_prefix,
+        report_field_src=report_field_src,
+    )
+
+    if app.config.get('REPORT_RENDER_MODE', 'server') == 'server':
+        # 첫 요청 전에 조각 템플릿을 미리 컴파일해 캐시에 올려둠
+        for name in REPORT_FRAGMENTS:
+            try:
+                app.jinja_env.get_template(PRERENDERED_PREFIX + name)
+            except Exception as e:
+                print(f"Template precompile error ({name}): {e}")
@@ -1,11 +1,32 @@
 """
 API 엔드포인트 - 보고서 관련 라우팅
 """
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, current_app, request, jsonify, send_file, stream_with_context
+from app.conditional import Validators
+from app.db.database import Database
+from app.services.cache import get_report_cache
+from app.services.export_service import EXPORT_FORMATS, ExportService
+from app.services.growth_service import GrowthService
+from app.services.ingest_service import IngestService
 from app.services.report_service import ReportService
+from app.services.single_flight import get_report_flights
+from app.services.trend_service import TrendService, get_trend_cache
+from app.services.xray_service import DERIVATIVE_FORMATS, XRAY_SIZES, get_xray_service
 
 report_bp = Blueprint('report', __name__, url_prefix='/api/reports')
 
+# 환자 목록 한 페이지의 최대 항목 수
+MAX_PER_PAGE = 100
+
+# 일괄 보고서 조회 한 번에 요청할 수 있는 최대 환자 수
+MAX_BATCH_SIZE = 500
+
+# 성장 백분위 일괄 계산 한 번에 보낼 수 있는 최대 측정값 수
+MAX_GROWTH_BATCH_SIZE = 1000000
+
+# 보고서 일괄 적재 한 번에 보낼 수 있는 최대 보고서 수
+MAX_INGEST_BATCH_SIZE = 10000
+
 @report_bp.route('/patient/<patient_code>', methods=['GET'])
 def get_patient_report(patient_code):
     """
@@ -26,9 +47,26 @@ def get_patient_report(patient_code):
                 "xray": {...}
             }
         }
+    
+    ETag/Last-Modified를 보내며, If-None-Match/If-Modified-Since가 일치하면
+    수정 시각만 조회하고 304를 돌려줍니다.
     """
     try:
-        report = ReportService.get_patient_report(patient_code)
+        version = ReportService.get_patient_report_version(patient_code)
+        
+        if not version:
+            return jsonify({
+                'success': False,
+                'message': f'Patient with code {patient_code} not found',
+                'data': None
+            }), 404
+        
+        validators = Validators.of('report', version['patient_id'], version['token'],
+                                   last_modified=version['updated_at'])
+        if validators.not_modified():
+            return validators.not_modified_response()
+        
+        report = ReportService.get_patient_report(patient_code, version=version)
         
         if not report:
             return jsonify({
@@ -37,11 +75,11 @@ def get_patient_report(patient_code):
                 'data': None
             }), 404
         
-        return jsonify({
+        return validators.apply(jsonify({
             'success': True,
             'message': 'Report retrieved successfully',
             'data': report
-        }), 200
+        })), 200
     
     except Exception as e:
         return jsonify({
@@ -50,6 +88,93 @@ def get_patient_report(patient_code):
             'data': None
         }), 500
 
+@report_bp.route('/patients/batch', methods=['POST'])
+def get_patient_reports_batch():
+    """
+    여러 환자의 최신 보고서 일괄 조회
+    
+    POST /api/reports/patients/batch
+    
+    Request Body:
+        {
+            "patient_codes": ["2024-001234", "2096361", ...]
+        }
+    
+    Response:
+        {
+            "success": true,
+            "data": [
+                {
+                    "patient_code": "2024-001234",
+                    "success": true,
+                    "message": "Report retrieved successfully",
+                    "data": {...}
+                },
+                {
+                    "patient_code": "UNKNOWN",
+                    "success": false,
+                    "message": "Patient with code UNKNOWN not found",
+                    "data": null
+                }
+            ],
+            "total": 2,
+            "found": 1
+        }
+    """
+    try:
+        body = request.get_json(silent=True) or {}
+        patient_codes = body.get('patient_codes')
+        
+        if not isinstance(patient_codes, list) or not patient_codes:
+            return jsonify({
+                'success': False,
+                'message': 'patient_codes must be a non-empty list',
+                'data': None
+            }), 400
+        
+        if len(patient_codes) > MAX_BATCH_SIZE:
+            return jsonify({
+                'success': False,
+                'message': f'Too many patient codes (max {MAX_BATCH_SIZE})',
+                'data': None
+            }), 400
+        
+        patient_codes = [str(code).strip() for code in patient_codes]
+        reports = ReportService.get_patient_reports(patient_codes)
+        
+        items = []
+        for code in patient_codes:
+            report = reports.get(code)
+            if report:
+                items.append({
+                    'patient_code': code,
+                    'success': True,
+                    'message': 'Report retrieved successfully',
+                    'data': report
+                })
+            else:
+                items.append({
+                    'patient_code': code,
+                    'success': False,
+                    'message': f'Patient with code {code} not found',
+                    'data': None
+                })
+        
+        return jsonify({
+            'success': True,
+            'message': 'Reports retrieved successfully',
+            'data': items,
+            'total': len(items),
+            'found': sum(1 for item in items if item['success'])
+        }), 200
+    
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Error retrieving reports: {str(e)}',
+            'data': None
+        }), 500
+
 @report_bp.route('/patient/<int:patient_id>/history', methods=['GET'])
 def get_patient_history(patient_id):
     """
@@ -86,16 +211,72 @@ def get_patient_history(patient_id):
             'data': None
         }), 500
 
+@report_bp.route('/patient/<int:patient_id>/trends', methods=['GET'])
+def get_patient_trends(patient_id):
+    """
+    환자의 성장 추이 (키 성장 속도, 골연령 진행 속도, 예측 키 변화)
+    
+    GET /api/reports/patient/{patient_id}/trends
+    
+    Response:
+        {
+            "success": true,
+            "data": {
+                "patient_id": 1,
+                "exams": 3,
+                "first_exam_date": "2023-01-15",
+                "last_exam_date": "2024-01-15",
+                "height_velocity": {
+                    "unit": "cm/yr",
+                    "measurements": 3,
+                    "overall": 6.12,
+                    "latest": 5.8,
+                    "total_change": 6.1,
+                    "intervals": [
+                        {"from_report_id": 1, "to_report_id": 2, "years": 0.501, "change": 3.2, "rate": 6.387},
+                        ...
+                    ]
+                },
+                "bone_age_rate": {...},
+                "predicted_height_drift": {...}
+            }
+        }
+    """
+    try:
+        trends = TrendService.get_patient_trends(patient_id)
+        
+        if not trends:
+            return jsonify({
+                'success': False,
+                'message': 'No exams found for this patient',
+                'data': None
+            }), 404
+        
+        return jsonify({
+            'success': True,
+            'message': 'Trends retrieved successfully',
+            'data': trends
+        }), 200
+    
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Error calculating trends: {str(e)}',
+            'data': None
+        }), 500
+
 @report_bp.route('/patients', methods=['GET'])
 def get_all_patients():
     """
     모든 환자 목록 조회 (페이징 지원)
     
     GET /api/reports/patients?page=1&per_page=20
+    GET /api/reports/patients?cursor=&per_page=20
     
     Query Parameters:
         - page: 페이지 번호 (기본값: 1)
-        - per_page: 페이지당 항목 수 (기본값: 20)
+        - per_page: 페이지당 항목 수 (기본값: 20, 최대: 100)
+        - cursor: 커서 방식 조회. 첫 페이지는 빈 값, 이후에는 응답의 next_cursor 사용
     
     Response:
         {
@@ -105,26 +286,54 @@ def get_all_patients():
             "page": 1,
             "per_page": 20
         }
+        
+        커서 방식일 때는 page 대신 "next_cursor" (마지막 페이지면 null)
+    
+    ETag/Last-Modified를 보내며, 환자/요약이 바뀌지 않았으면 304를 돌려줍니다.
     """
     try:
-        page = request.args.get('page', 1, type=int)
+        page = max(request.args.get('page', 1, type=int), 1)
         per_page = request.args.get('per_page', 20, type=int)
+        per_page = min(max(per_page, 1), MAX_PER_PAGE)
         
-        patients = ReportService.get_all_patients()
+        version = ReportService.get_patients_version()
+        total = version['total']
+        validators = Validators.of('patients', total, version['updated_at'],
+                                   last_modified=version['updated_at'])
+        if validators.not_modified():
+            return validators.not_modified_response()
         
-        # 페이징 처리
-        start = (page - 1) * per_page
-        end = start + per_page
-        paginated_patients = patients[start:end]
+        if 'cursor' in request.args:
+            try:
+                patients, next_cursor = ReportService.get_patients_after(
+                    request.args.get('cursor', '', type=str), per_page
+                )
+            except ValueError as e:
+                return jsonify({
+                    'success': False,
+                    'message': str(e),
+                    'data': None
+                }), 400
+            
+            return validators.apply(jsonify({
+                'success': True,
+                'message': 'Patients retrieved successfully',
+                'data': patients,
+                'total': total,
+                'per_page': per_page,
+                'next_cursor': next_cursor
+            })), 200
         
-        return jsonify({
+        patients = ReportService.get_patients_page(page, per_page)
+        
+        return validators.apply(jsonify({
             'success': True,
             'message': 'Patients retrieved successfully',
-            'data': paginated_patients,
-            'total': len(patients),
+            'data': patients,
+            'total': total,
             'page': page,
             'per_page': per_page
-        }), 200
+        })), 200
     
     except Exception as e:
         return jsonify({
@@ -141,7 +350,8 @@ def search_patients():
     GET /api/reports/patients/search?keyword=홍길동
     
     Query Parameters:
-        - keyword: 검색 키워드 (필수)
+        - keyword: 검색 키워드 (필수, 환자코드/이름 일부 또는 이름 초성 예: ㅎㄱㄷ)
+        - limit: 최대 결과 수 (기본값: 50, 최대: 100)
     
     Response:
         {
@@ -159,7 +369,9 @@ def search_patients():
                 'data': None
             }), 400
         
-        results = ReportService.search_patients(keyword)
+        limit = min(max(request.args.get('limit', 50, type=int), 1), MAX_PER_PAGE)
+        
+        results = ReportService.search_patients(keyword, limit=limit)
         
         return jsonify({
             'success': True,
@@ -174,6 +386,249 @@ def search_patients():
             'data': None
         }), 500
 
+@report_bp.route('/ingest', methods=['POST'])
+def ingest_reports():
+    """
+    검사 보고서 일괄 적재
+    
+    POST /api/reports/ingest
+    
+    Request Body:
+        {
+            "reports": [
+                {
+                    "patient_code": "2024-001234",
+                    "patient": {"name": "홍길동", "gender": "M", "birth_date": "2012-05-15"},
+                    "exam_date": "2024-11-20",
+                    "requested_doctor": "김영희",
+                    "status": "completed",
+                    "bone_age": {"chronological_age": "11세 9개월", "bone_age": "13세 5개월", ...},
+                    "genetic_info": {...},
+                    "height_percentile": {...},
+                    "weight_info": {...},
+                    "xray": {...}
+                }
+            ]
+        }
+        
+        - patient: 없는 환자 코드일 때만 사용 (환자를 새로 생성)
+        - 섹션(bone_age 등)은 응답 스키마와 같은 필드명을 사용하며 생략할 수 있습니다.
+    
+    Response:
+        {
+            "success": true,
+            "data": [
+                {"index": 0, "success": true, "report_id": 101, "patient_code": "...", "message": "Report created"},
+                {"index": 1, "success": false, "report_id": null, "patient_code": "...", "message": "exam_date is required"}
+            ],
+            "total": 2,
+            "inserted": 1,
+            "failed": 1
+        }
+    """
+    try:
+        body = request.get_json(silent=True) or {}
+        reports = body.get('reports')
+        
+        if not isinstance(reports, list) or not reports:
+            return jsonify({
+                'success': False,
+                'message': 'reports must be a non-empty list',
+                'data': None
+            }), 400
+        
+        if len(reports) > MAX_INGEST_BATCH_SIZE:
+            return jsonify({
+                'success': False,
+                'message': f'Too many reports (max {MAX_INGEST_BATCH_SIZE})',
+                'data': None
+            }), 400
+        
+        results = IngestService.ingest_reports(
+            reports, chunk_size=current_app.config.get('INGEST_CHUNK_SIZE', 500)
+        )
+        inserted = sum(1 for result in results if result['success'])
+        
+        return jsonify({
+            'success': True,
+            'message': 'Reports ingested',
+            'data': results,
+            'total': len(results),
+            'inserted': inserted,
+            'failed': len(results) - inserted
+        }), 200
+    
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Error ingesting reports: {str(e)}',
+            'data': None
+        }), 500
+
+@report_bp.route('/report/<int:report_id>/xray', methods=['GET'])
+def get_xray_image(report_id):
+    """
+    보고서의 X-ray 이미지
+    
+    GET /api/reports/report/{report_id}/xray?size=display
+    
+    Query Parameters:
+        - size: thumb(긴 변 256px) / display(1024px, 기본값) / original
+    
+    축소본은 처음 요청할 때 백그라운드에서 만들어 디스크에 캐시하며, 브라우저가 지원하면 WebP로 제공합니다.
+    만들어지는 동안에는 원본을 짧은 캐시 시간(XRAY_PENDING_MAX_AGE)으로 제공합니다.
+    Range 요청과 ETag(If-None-Match)를 지원합니다.
+    """
+    size = request.args.get('size', 'display')
+    if size not in XRAY_SIZES:
+        return jsonify({
+            'success': False,
+            'message': f"size must be one of {', '.join(XRAY_SIZES)}",
+            'data': None
+        }), 400
+    
+    try:
+        service = get_xray_service()
+        source = service.get_source(report_id)
+        
+        if not source:
+            return jsonify({
+                'success': False,
+                'message': f'X-ray image for report {report_id} not found',
+                'data': None
+            }), 404
+        
+        path, mimetype = source, None
+        max_age = current_app.config.get('XRAY_MAX_AGE', 86400)
+        if XRAY_SIZES[size] is not None:
+            fmt = 'webp' if 'image/webp' in request.headers.get('Accept', '') else 'jpeg'
+            derivative = service.get_derivative(source, size, fmt)
+            if derivative:
+                path, mimetype = derivative, DERIVATIVE_FORMATS[fmt][1]
+            elif service.resize_available:
+                # 축소본을 만드는 중 - 원본을 오래 캐시하지 않도록 해서 곧 축소본을 다시 받게 함
+                max_age = current_app.config.get('XRAY_PENDING_MAX_AGE', 0)
+        
+        # conditional=True: Range/If-None-Match 처리, 파일 본문은 WSGI 서버의 file_wrapper(sendfile)로 전송
+        response = send_file(path, mimetype=mimetype, conditional=True, etag=True, max_age=max_age)
+        response.headers['Vary'] = 'Accept'
+        return response
+    
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Error retrieving X-ray image: {str(e)}',
+            'data': None
+        }), 500
+
+@report_bp.route('/export', methods=['GET'])
+def export_reports():
+    """
+    모든 보고서 내보내기 (스트리밍)
+    
+    GET /api/reports/export?format=csv&date_from=2024-01-01&date_to=2024-12-31&status=completed
+    
+    Query Parameters:
+        - format: csv / ndjson (기본값: csv)
+        - date_from, date_to: 검사일 범위 (YYYY-MM-DD, 선택)
+        - status: pending / in_progress / completed / failed (선택)
+    
+    Response:
+        보고서 하나당 한 행(CSV) 또는 한 줄(NDJSON). 행 수와 관계없이 일정한 메모리로 전송됩니다.
+    """
+    try:
+        export_format = request.args.get('format', 'csv', type=str)
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f'format must be one of {", ".join(EXPORT_FORMATS)}')
+        filters = ExportService.build_filters(
+            request.args.get('date_from'),
+            request.args.get('date_to'),
+            request.args.get('status')
+        )
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e),
+            'data': None
+        }), 400
+    
+    generator = ExportService.iter_export(export_format, filters)
+    filename = f'reports.{export_format}'
+    return Response(
+        stream_with_context(generator),
+        content_type=EXPORT_FORMATS[export_format],
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
+    )
+
+@report_bp.route('/growth/percentiles', methods=['POST'])
+def calculate_growth_percentiles():
+    """
+    성장도표 기준 백분위 일괄 계산
+    
+    POST /api/reports/growth/percentiles
+    
+    Request Body:
+        {
+            "metric": "height",              // height / weight / bmi
+            "gender": ["M", "F", ...],       // 또는 "M" 하나
+            "age": [11.75, "12세 2개월", ...], // 또는 하나의 값
+            "value": [150.2, 148.0, ...]
+        }
+    
+    Response:
+        {
+            "success": true,
+            "data": {
+                "percentile": [45.12, ...],
+                "z_score": [-0.123, ...],
+                "category": ["정상", ...]    // weight는 null
+            },
+            "total": 2
+        }
+    """
+    try:
+        body = request.get_json(silent=True) or {}
+        values = body.get('value')
+        
+        if not isinstance(values, list) or not values:
+            return jsonify({
+                'success': False,
+                'message': 'value must be a non-empty list',
+                'data': None
+            }), 400
+        
+        if len(values) > MAX_GROWTH_BATCH_SIZE:
+            return jsonify({
+                'success': False,
+                'message': f'Too many values (max {MAX_GROWTH_BATCH_SIZE})',
+                'data': None
+            }), 400
+        
+        try:
+            result = GrowthService.calculate_percentiles(
+                body.get('metric'), body.get('gender'), body.get('age'), values
+            )
+        except (TypeError, ValueError) as e:
+            return jsonify({
+                'success': False,
+                'message': str(e),
+                'data': None
+            }), 400
+        
+        return jsonify({
+            'success': True,
+            'message': 'Percentiles calculated successfully',
+            'data': result,
+            'total': len(values)
+        }), 200
+    
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Error calculating percentiles: {str(e)}',
+            'data': None
+        }), 500
+
 @report_bp.route('/health', methods=['GET'])
 def health_check():
     """
@@ -181,8 +636,19 @@ def health_check():
     
     GET /api/reports/health
     """
+    xray_images = current_app.extensions.get('xray_images')
+    snapshots = current_app.extensions.get('report_snapshots')
+    verifier = current_app.extensions.get('patient_verifier')
     return jsonify({
         'success': True,
         'message': 'Report service is running',
-        'timestamp': __import__('datetime').datetime.now().isoformat()
+        'timestamp': __import__('datetime').datetime.now().isoformat(),
+        'pool': Database.pool_stats(),
+        'replicas': Database.replica_stats(),
+        'report_cache': get_report_cache().stats(),
+        'report_single_flight': get_report_flights().stats(),
+        'patient_trends': get_trend_cache().stats(),
+        'xray_images': xray_images.stats() if xray_images else None,
+        'report_snapshots': snapshots.stats() if snapshots else None,
+        'patient_verifier': verifier.stats() if verifier else None
     }), 200
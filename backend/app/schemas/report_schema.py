@@ -1,93 +1,142 @@
 """
 응답 데이터 구조 정의 (Serialization용)
+
+각 스키마는 필드 목록으로 선언하며, 처음 사용할 때 serializer.Schema가 하나의 함수로 컴파일합니다.
 """
+from functools import lru_cache
+
+from app.schemas.serializer import Schema, field
 from app.utils import convert_decimal_age_to_korean, convert_gender_to_korean
 
+# 같은 값이 많이 반복되므로(생년월일, 검사일, 나이) 변환 결과를 캐시
+@lru_cache(maxsize=65536)
+def date_text(value):
+    """날짜 → 'YYYY-MM-DD' (값이 없으면 None)"""
+    return str(value) if value else None
+
+korean_age = lru_cache(maxsize=65536)(convert_decimal_age_to_korean)
+gender_text = lru_cache(maxsize=64)(convert_gender_to_korean)
+
+def xray_image_url(report_id, size='display'):
+    """X-ray 이미지 엔드포인트 주소 (썸네일/표시용 축소본)"""
+    return f'/api/reports/report/{report_id}/xray?size={size}'
+
+def _xray_image_url_of(image_path, report_id):
+    return xray_image_url(report_id) if image_path and report_id else None
+
+# 환자 정보
+PATIENT = Schema('patient', [
+    field('id'),
+    field('patient_code'),
+    field('name'),
+    field('gender', convert=gender_text),
+    field('birth_date', convert=date_text),
+])
+
+# 보고서 기본 정보
+REPORT = Schema('report', [
+    field('report_id'),
+    field('exam_date', convert=date_text),
+    field('requested_doctor'),
+    field('status'),
+])
+
+# 골연령 정보
+BONE_AGE = Schema('bone_age', [
+    field('chronological_age', convert=korean_age),
+    field('bone_age', convert=korean_age),
+    field('age_difference', convert=korean_age),
+    field('current_height'),
+    field('predicted_height_ai'),
+])
+
+# 유전 정보
+GENETIC_INFO = Schema('genetic_info', [
+    field('father_height'),
+    field('mother_height'),
+    field('predicted_height_genetic'),
+])
+
+# 키 백분위
+HEIGHT_PERCENTILE = Schema('height_percentile', [
+    field('percentile'),
+    field('percentile_rank'),
+    field('assessment'),
+    field('gender', convert=gender_text),
+])
+
+# 체중 정보 (percentile은 쿼리에서 weight_percentile로 구분)
+WEIGHT_INFO = Schema('weight_info', [
+    field('weight'),
+    field('percentile', 'weight_percentile'),
+    field('bmi'),
+    field('bmi_category'),
+    field('obesity_rate'),
+    field('obesity_grade'),
+])
+
+# 엑스레이 분석
+XRAY = Schema('xray', [
+    field('image_path'),
+    field('image_url', ('image_path', 'report_id'), convert=_xray_image_url_of),
+    field('analysis_result'),
+    field('confidence_score'),
+])
+
+# 전체 보고서 (모든 정보 포함)
+FULL_REPORT = Schema('full_report', [
+    ('patient', PATIENT),
+    ('report', REPORT),
+    ('bone_age', BONE_AGE),
+    ('genetic_info', GENETIC_INFO),
+    ('height_percentile', HEIGHT_PERCENTILE),
+    ('weight_info', WEIGHT_INFO),
+    ('xray', XRAY),
+])
+
+# 환자 목록
+PATIENT_LIST = Schema('patient_list', [
+    field('id'),
+    field('patient_code'),
+    field('name'),
+    field('gender', convert=gender_text),
+    field('birth_date', convert=date_text),
+    field('latest_exam_date', convert=date_text),
+    field('total_reports', default=0),
+])
+
 def patient_schema(patient):
     """환자 정보 스키마"""
-    return {
-        'id': patient.get('id'),
-        'patient_code': patient.get('patient_code'),
-        'name': patient.get('name'),
-        'gender': convert_gender_to_korean(patient.get('gender')),
-        'birth_date': str(patient.get('birth_date')) if patient.get('birth_date') else None,
-    }
+    return PATIENT.dump(patient)
 
 def report_schema(report):
     """보고서 기본 정보 스키마"""
-    return {
-        'report_id': report.get('report_id'),
-        'exam_date': str(report.get('exam_date')) if report.get('exam_date') else None,
-        'requested_doctor': report.get('requested_doctor'),
-        'status': report.get('status'),
-    }
+    return REPORT.dump(report)
 
 def bone_age_schema(report):
     """골연령 정보 스키마"""
-    return {
-        'chronological_age': convert_decimal_age_to_korean(report.get('chronological_age')),
-        'bone_age': convert_decimal_age_to_korean(report.get('bone_age')),
-        'age_difference': convert_decimal_age_to_korean(report.get('age_difference')),
-        'current_height': report.get('current_height'),
-        'predicted_height_ai': report.get('predicted_height_ai'),
-    }
+    return BONE_AGE.dump(report)
 
 def genetic_info_schema(report):
     """유전 정보 스키마"""
-    return {
-        'father_height': report.get('father_height'),
-        'mother_height': report.get('mother_height'),
-        'predicted_height_genetic': report.get('predicted_height_genetic'),
-    }
+    return GENETIC_INFO.dump(report)
 
 def height_percentile_schema(report):
     """키 백분위 스키마"""
-    return {
-        'percentile': report.get('percentile'),
-        'percentile_rank': report.get('percentile_rank'),
-        'assessment': report.get('assessment'),
-        'gender': convert_gender_to_korean(report.get('gender')),
-    }
+    return HEIGHT_PERCENTILE.dump(report)
 
 def weight_info_schema(report):
     """체중 정보 스키마"""
-    return {
-        'weight': report.get('weight'),
-        'percentile': report.get('weight_percentile'),
-        'bmi': report.get('bmi'),
-        'bmi_category': report.get('bmi_category'),
-        'obesity_rate': report.get('obesity_rate'),
-        'obesity_grade': report.get('obesity_grade'),
-    }
+    return WEIGHT_INFO.dump(report)
 
 def xray_schema(report):
     """엑스레이 분석 스키마"""
-    return {
-        'image_path': report.get('image_path'),
-        'analysis_result': report.get('analysis_result'),
-        'confidence_score': report.get('confidence_score'),
-    }
+    return XRAY.dump(report)
 
 def full_report_schema(report):
     """전체 보고서 스키마 (모든 정보 포함)"""
-    return {
-        'patient': patient_schema(report),
-        'report': report_schema(report),
-        'bone_age': bone_age_schema(report),
-        'genetic_info': genetic_info_schema(report),
-        'height_percentile': height_percentile_schema(report),
-        'weight_info': weight_info_schema(report),
-        'xray': xray_schema(report),
-    }
+    return FULL_REPORT.dump(report)
 
 def patient_list_schema(patient):
     """환자 목록 스키마"""
-    return {
-        'id': patient.get('id'),
-        'patient_code': patient.get('patient_code'),
-        'name': patient.get('name'),
-        'gender': convert_gender_to_korean(patient.get('gender')),
-        'birth_date': str(patient.get('birth_date')) if patient.get('birth_date') else None,
-        'latest_exam_date': str(patient.get('latest_exam_date')) if patient.get('latest_exam_date') else None,
-        'total_reports': patient.get('total_reports', 0),
-    }
+    return PATIENT_LIST.dump(patient)
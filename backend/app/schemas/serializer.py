@@ -0,0 +1,118 @@
+"""
+스키마 직렬화기 - 필드 목록(field plan)을 한 번 컴파일해 행을 빠르게 응답 dict로 변환
+
+스키마는 (출력 키, 컬럼, 변환 함수, 기본값) 목록으로 선언하고, 처음 사용할 때 필드마다
+row.get()/함수 호출을 반복하는 대신 dict 리터럴 하나를 만드는 파이썬 함수로 컴파일합니다.
+(rendering.compile_fragment가 페이지 조각을 Jinja 소스로 바꾸는 것과 같은 방식)
+
+행 형식에 따라 두 가지로 컴파일됩니다.
+    - dict 행 (DictCursor): row.get('컬럼')
+    - 튜플 행 (Database.fetch_rows): row[인덱스] - 컬럼 순서(cursor.description)마다 한 번 컴파일
+"""
+import threading
+from collections import namedtuple
+
+Field = namedtuple('Field', ['key', 'column', 'convert', 'default'])
+
+
+def field(key, column=None, convert=None, default=None):
+    """
+    스키마 필드
+
+    Args:
+        key: 응답 키
+        column: 행의 컬럼 이름 (기본: key), 여러 컬럼을 받는 변환이면 컬럼 이름 튜플
+        convert: 값 변환 함수 (None이면 그대로)
+        default: 행에 컬럼이 없을 때의 값
+    """
+    return Field(key, column or key, convert, default)
+
+
+class Schema:
+    """컴파일되는 응답 스키마"""
+
+    def __init__(self, name, fields):
+        """
+        Args:
+            name: 스키마 이름 (컴파일된 함수 이름, 오류 메시지용)
+            fields: field() 또는 (키, 하위 Schema) 목록
+        """
+        self.name = name
+        self.fields = list(fields)
+        self._dict_dump = None
+        self._tuple_dumps = {}
+        self._lock = threading.Lock()
+
+    def dump(self, row):
+        """dict 행 하나 변환"""
+        dump = self._dict_dump
+        if dump is None:
+            with self._lock:
+                if self._dict_dump is None:
+                    self._dict_dump = self._compile(None)
+                dump = self._dict_dump
+        return dump(row)
+
+    def dump_rows(self, columns, rows):
+        """
+        튜플 행 목록 변환
+
+        Args:
+            columns: 컬럼 이름 튜플 (cursor.description 순서)
+            rows: 튜플 행 목록
+
+        Returns:
+            list: 응답 dict 목록
+        """
+        return list(map(self.compiled_for(columns), rows))
+
+    def compiled_for(self, columns):
+        """이 컬럼 순서의 튜플 행을 변환하는 함수"""
+        columns = tuple(columns)
+        dump = self._tuple_dumps.get(columns)
+        if dump is None:
+            with self._lock:
+                dump = self._tuple_dumps.get(columns)
+                if dump is None:
+                    dump = self._tuple_dumps[columns] = self._compile(columns)
+        return dump
+
+    def _compile(self, columns):
+        namespace = {}
+        index = {name: i for i, name in enumerate(columns)} if columns is not None else None
+
+        def column_expr(name, default):
+            if index is None:
+                if default is None:
+                    return f'r.get({name!r})'
+                namespace_name = f'_d{len(namespace)}'
+                namespace[namespace_name] = default
+                return f'r.get({name!r}, {namespace_name})'
+            if name in index:
+                return f'r[{index[name]}]'
+            namespace_name = f'_d{len(namespace)}'
+            namespace[namespace_name] = default
+            return namespace_name
+
+        def dict_expr(schema):
+            items = []
+            for item in schema.fields:
+                if isinstance(item, tuple) and len(item) == 2 and isinstance(item[1], Schema):
+                    key, nested = item
+                    items.append(f'{key!r}: {dict_expr(nested)}')
+                    continue
+                if isinstance(item.column, tuple):
+                    args = ', '.join(column_expr(name, item.default) for name in item.column)
+                else:
+                    args = column_expr(item.column, item.default)
+                if item.convert is not None:
+                    convert_name = f'_c{len(namespace)}'
+                    namespace[convert_name] = item.convert
+                    args = f'{convert_name}({args})'
+                items.append(f'{item.key!r}: {args}')
+            return '{' + ', '.join(items) + '}'
+
+        function_name = f'dump_{self.name}'
+        source = f'def {function_name}(r):\n    return {dict_expr(self)}\n'
+        exec(compile(source, f'<schema {self.name}>', 'exec'), namespace)
+        return namespace[function_name]
@@ -0,0 +1,86 @@
+"""
+운영 서버 실행 - 미리 fork한 여러 워커 프로세스(gunicorn)로 Flask 앱 실행
+
+    FLASK_ENV=production python run.py
+    FLASK_ENV=production python -m app.server
+
+- 앱(create_app)은 마스터 프로세스에서 한 번 만든 뒤 fork하므로 워커 시작이 빠르고 import한 코드의 메모리를 공유합니다.
+  커넥션 풀·복제본 라우터는 프로세스 ID를 확인해 워커마다 새로 만들어집니다.
+- 워커는 프로세스당 SERVER_THREADS개의 스레드로 요청을 처리합니다 (gthread).
+- 워커는 SERVER_MAX_REQUESTS(+ 무작위 지터)개의 요청을 처리하면 새 워커로 교체되어 메모리 증가를 제한합니다.
+
+신호:
+    HUP   새 워커를 띄운 뒤 기존 워커를 요청을 마치게 하고 종료 (중단 없는 워커 교체)
+    USR2  새 코드로 마스터를 다시 실행 (배포 시, 새 마스터가 준비되면 기존 마스터에 TERM)
+    TERM  처리 중인 요청을 SERVER_GRACEFUL_TIMEOUT초까지 마치고 종료
+
+앱을 마스터에서 미리 만들기 때문에 HUP은 코드 변경을 반영하지 않습니다. 코드를 배포할 때는 USR2를 사용하세요.
+"""
+import os
+
+from gunicorn.app.base import BaseApplication
+
+from app import create_app
+from app.config.settings import get_config
+
+
+def server_options(config):
+    """설정 클래스(SERVER_*)로 gunicorn 설정 생성"""
+    workers = getattr(config, 'SERVER_WORKERS', 0) or os.cpu_count() or 1
+    return {
+        'bind': getattr(config, 'SERVER_BIND', '0.0.0.0:5000'),
+        'workers': workers,
+        # 받아들인 연결은 읽을 수 있을 때까지 poller에서 기다리므로 아무것도 보내지 않는 연결이 스레드를 잡지 않음
+        'worker_class': 'gthread',
+        'threads': getattr(config, 'SERVER_THREADS', 4),
+        'max_requests': getattr(config, 'SERVER_MAX_REQUESTS', 10000),
+        # 워커들이 같은 시점에 한꺼번에 교체되지 않도록 교체 기준을 워커마다 다르게
+        'max_requests_jitter': getattr(config, 'SERVER_MAX_REQUESTS_JITTER', 1000),
+        'timeout': getattr(config, 'SERVER_TIMEOUT', 30),
+        'graceful_timeout': getattr(config, 'SERVER_GRACEFUL_TIMEOUT', 30),
+        'keepalive': getattr(config, 'SERVER_KEEPALIVE', 5),
+        'preload_app': True,
+        'accesslog': getattr(config, 'SERVER_ACCESS_LOG', None) or None,
+    }
+
+
+class ReportServer(BaseApplication):
+    """이미 만든 Flask 앱을 gunicorn 워커로 실행"""
+
+    def __init__(self, application, options):
+        self.application = application
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        return self.application
+
+
+def run(config=None):
+    """
+    운영 서버 실행 (종료될 때까지 반환하지 않음)
+
+    Args:
+        config: 설정 클래스 (없으면 get_config())
+    """
+    if config is None:
+        config = get_config()
+    options = server_options(config)
+    application = create_app(config)
+
+    print("=" * 50)
+    print("🚀 Bone Age Report Backend Server (production)")
+    print("=" * 50)
+    print(f"Listening on {options['bind']} "
+          f"({options['workers']} workers x {options['threads']} threads)")
+    print("=" * 50)
+
+    ReportServer(application, options).run()
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,259 @@
+"""
+비동기 비즈니스 로직 레이어 - ASGI 앱에서 사용하는 ReportService
+
+쿼리(QUERIES), 응답 스키마, 보고서 캐시, 검색 인덱스는 동기 ReportService와 같은 것을 사용하고
+DB 접근만 AsyncDatabase로 await 합니다. 요청 대기 중에 이벤트 루프를 막지 않도록
+블로킹 작업(Redis 캐시, 검색 인덱스 전체 적재)은 스레드에서 실행합니다.
+"""
+import asyncio
+import time
+
+from app.db.models import QUERIES
+from app.schemas.report_schema import full_report_schema, patient_list_schema
+from app.services.cache import MemoryCache, NullCache
+from app.services.search import apply_index_changes, index_from_rows
+from app.utils import decode_patient_cursor, encode_patient_cursor
+
+
+class AsyncReportService:
+    """보고서 데이터 비동기 조회 및 처리"""
+
+    def __init__(self, db, cache, config):
+        """
+        Args:
+            db: AsyncDatabase
+            cache: create_cache()로 만든 보고서 캐시
+            config: SEARCH_INDEX_* 설정이 들어 있는 dict
+        """
+        self.db = db
+        self.cache = cache
+        self.config = config
+        self._search_index = None
+        self._index_lock = asyncio.Lock()
+
+    async def _cache_call(self, method, *args):
+        """메모리 캐시는 바로 호출하고, 네트워크를 쓰는 캐시(Redis)는 스레드에서 호출"""
+        func = getattr(self.cache, method)
+        if isinstance(self.cache, (MemoryCache, NullCache)):
+            return func(*args)
+        return await asyncio.to_thread(func, *args)
+
+    async def get_patient_report(self, patient_code):
+        """
+        환자 코드로 최신 보고서 조회
+
+        Args:
+            patient_code: 환자 코드
+
+        Returns:
+            dict: 전체 보고서 데이터
+        """
+        try:
+            cached = await self._cache_call('get', patient_code)
+            if cached is not None:
+                return cached
+
+            result = await self.db.fetch_one(QUERIES['get_patient_report'], (patient_code,))
+
+            if not result:
+                return None
+
+            report = full_report_schema(result)
+            await self._cache_call('set', patient_code, report)
+            return report
+
+        except Exception as e:
+            print(f"Error in get_patient_report: {e}")
+            raise
+
+    async def get_patient_history(self, patient_id):
+        """
+        환자 ID로 검사 이력 조회
+
+        Args:
+            patient_id: 환자 ID
+
+        Returns:
+            list: 검사 이력 리스트
+        """
+        try:
+            results = await self.db.fetch_all(QUERIES['get_patient_history'], (patient_id,))
+
+            if not results:
+                return []
+
+            return results
+
+        except Exception as e:
+            print(f"Error in get_patient_history: {e}")
+            raise
+
+    async def get_all_patients(self):
+        """
+        모든 환자 목록 조회
+
+        Returns:
+            list: 환자 목록
+        """
+        try:
+            results = await self.db.fetch_all(QUERIES['get_all_patients'])
+
+            if not results:
+                return []
+
+            return [patient_list_schema(patient) for patient in results]
+
+        except Exception as e:
+            print(f"Error in get_all_patients: {e}")
+            raise
+
+    async def get_patients_page(self, page, per_page):
+        """
+        환자 목록 한 페이지 조회 (LIMIT/OFFSET을 SQL에서 처리)
+
+        Args:
+            page: 페이지 번호 (1부터 시작)
+            per_page: 페이지당 항목 수
+
+        Returns:
+            list: 환자 목록
+        """
+        try:
+            offset = (page - 1) * per_page
+            results = await self.db.fetch_all(QUERIES['get_patients_page'], (per_page, offset))
+
+            if not results:
+                return []
+
+            return [patient_list_schema(patient) for patient in results]
+
+        except Exception as e:
+            print(f"Error in get_patients_page: {e}")
+            raise
+
+    async def get_patients_after(self, cursor, per_page):
+        """
+        커서(keyset) 방식 환자 목록 조회
+
+        Args:
+            cursor: 이전 페이지의 next_cursor (없으면 첫 페이지)
+            per_page: 페이지당 항목 수
+
+        Returns:
+            tuple: (환자 목록, 다음 페이지 커서 또는 None)
+
+        Raises:
+            ValueError: 잘못된 커서
+        """
+        try:
+            if cursor:
+                sort_date, last_id = decode_patient_cursor(cursor)
+                results = await self.db.fetch_all(
+                    QUERIES['get_patients_after_cursor'],
+                    (sort_date, sort_date, last_id, per_page)
+                )
+            else:
+                results = await self.db.fetch_all(QUERIES['get_patients_page'], (per_page, 0))
+
+            if not results:
+                return [], None
+
+            next_cursor = None
+            if len(results) == per_page:
+                last = results[-1]
+                next_cursor = encode_patient_cursor(last.get('latest_exam_date'), last.get('id'))
+
+            return [patient_list_schema(patient) for patient in results], next_cursor
+
+        except ValueError:
+            raise
+        except Exception as e:
+            print(f"Error in get_patients_after: {e}")
+            raise
+
+    async def count_patients(self):
+        """
+        전체 환자 수 조회
+
+        Returns:
+            int: 환자 수
+        """
+        try:
+            result = await self.db.fetch_one(QUERIES['count_patients'])
+            return result['total'] if result else 0
+
+        except Exception as e:
+            print(f"Error in count_patients: {e}")
+            raise
+
+    async def get_search_index(self):
+        """
+        검색 인덱스 반환 (search.get_search_index와 같은 갱신 규칙)
+
+        처음 호출 시 전체를 적재하고, 이후에는 SEARCH_INDEX_SYNC_INTERVAL마다 변경분만 반영합니다.
+        다른 요청이 갱신 중이면 기다리지 않고 현재 인덱스를 사용합니다.
+        """
+        index = self._search_index
+        if index is None:
+            async with self._index_lock:
+                if self._search_index is None:
+                    self._search_index = await self._build_search_index()
+                return self._search_index
+
+        now = time.time()
+        rebuild_interval = self.config.get('SEARCH_INDEX_REBUILD_INTERVAL', 3600)
+        sync_interval = self.config.get('SEARCH_INDEX_SYNC_INTERVAL', 30)
+        needs_rebuild = rebuild_interval and now - index.built_at >= rebuild_interval
+        needs_sync = sync_interval and now - index.synced_at >= sync_interval
+        if (needs_rebuild or needs_sync) and not self._index_lock.locked():
+            async with self._index_lock:
+                if needs_rebuild:
+                    self._search_index = await self._build_search_index()
+                elif index.watermark is not None:
+                    rows = await self.db.fetch_all(
+                        QUERIES['get_search_index_changes'], (index.watermark,)
+                    ) or []
+                    apply_index_changes(index, rows)
+                    index.synced_at = time.time()
+                else:
+                    index.synced_at = time.time()
+        return self._search_index
+
+    async def _build_search_index(self):
+        rows = await self.db.fetch_all(QUERIES['get_search_index_rows']) or []
+        # 전체 적재는 CPU 작업이므로 이벤트 루프 밖에서 실행
+        return await asyncio.to_thread(index_from_rows, rows)
+
+    async def search_patients(self, keyword, limit=50):
+        """
+        환자명 또는 코드로 검색 (검색 인덱스 사용)
+
+        Args:
+            keyword: 검색 키워드
+            limit: 최대 결과 수
+
+        Returns:
+            list: 검색 결과 (일치도 순)
+        """
+        try:
+            index = await self.get_search_index()
+            patient_ids = index.search(keyword, limit=limit)
+
+            if not patient_ids:
+                return []
+
+            query = QUERIES['get_patients_by_ids'].format(
+                placeholders=', '.join(['%s'] * len(patient_ids))
+            )
+            results = await self.db.fetch_all(query, tuple(patient_ids))
+
+            if not results:
+                return []
+
+            # 인덱스의 순위대로 정렬 (검색 후 삭제된 환자는 제외)
+            by_id = {patient['id']: patient for patient in results}
+            return [patient_list_schema(by_id[pid]) for pid in patient_ids if pid in by_id]
+
+        except Exception as e:
+            print(f"Error in search_patients: {e}")
+            raise
@@ -0,0 +1,195 @@
+"""
+보고서 캐시 - 직렬화된 보고서를 보고서 버전(`patient_code@token`) 기준으로 보관
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app
+
+
+class MemoryCache:
+    """
+    프로세스 내부 LRU + TTL 캐시
+
+    - max_entries를 넘으면 가장 오래 사용되지 않은 항목부터 제거
+    - ttl(초)이 지난 항목은 조회 시 만료 처리
+    """
+
+    def __init__(self, max_entries=1024, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'sets': 0, 'evictions': 0,
+                       'expirations': 0, 'invalidations': 0}
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= now:
+                del self._data[key]
+                self._stats['expirations'] += 1
+                self._stats['misses'] += 1
+                return None
+            self._data.move_to_end(key)
+            self._stats['hits'] += 1
+            return value
+
+    def set(self, key, value):
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            self._stats['sets'] += 1
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def delete(self, key):
+        with self._lock:
+            if self._data.pop(key, None) is not None:
+                self._stats['invalidations'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._stats['invalidations'] += len(self._data)
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._data)
+        stats['backend'] = 'memory'
+        stats['max_entries'] = self.max_entries
+        stats['ttl'] = self.ttl
+        return stats
+
+
+class RedisCache:
+    """
+    여러 프로세스/서버가 공유하는 Redis 캐시
+
+    값은 JSON으로 저장하며 TTL은 Redis 만료 시간을 사용합니다.
+    LRU 제거는 Redis 서버의 maxmemory-policy(allkeys-lru)로 설정하세요.
+    Redis에 연결할 수 없으면 조회는 miss, 저장/삭제는 건너뛰고 errors로 집계합니다 (보고서는 DB에서 제공).
+    """
+
+    def __init__(self, url, ttl=300, prefix='bone_report:report:'):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError('redis 패키지가 필요합니다: pip install redis') from e
+        self._client = redis.Redis.from_url(url)
+        self._redis_error = redis.RedisError
+        self.ttl = ttl
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'sets': 0, 'invalidations': 0, 'errors': 0}
+
+    def _count(self, name, n=1):
+        with self._lock:
+            self._stats[name] += n
+
+    def _error(self, operation, e):
+        self._count('errors')
+        print(f"Report cache {operation} error: {e}")
+
+    def get(self, key):
+        try:
+            raw = self._client.get(self.prefix + key)
+        except self._redis_error as e:
+            self._error('get', e)
+            raw = None
+        if raw is None:
+            self._count('misses')
+            return None
+        self._count('hits')
+        return json.loads(raw)
+
+    def set(self, key, value):
+        raw = json.dumps(value, ensure_ascii=False, default=str)
+        try:
+            if self.ttl:
+                self._client.set(self.prefix + key, raw, ex=int(self.ttl))
+            else:
+                self._client.set(self.prefix + key, raw)
+        except self._redis_error as e:
+            self._error('set', e)
+            return
+        self._count('sets')
+
+    def delete(self, key):
+        try:
+            self._count('invalidations', self._client.delete(self.prefix + key))
+        except self._redis_error as e:
+            self._error('delete', e)
+
+    def clear(self):
+        try:
+            keys = list(self._client.scan_iter(match=self.prefix + '*'))
+            if keys:
+                self._count('invalidations', self._client.delete(*keys))
+        except self._redis_error as e:
+            self._error('clear', e)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats['backend'] = 'redis'
+        stats['ttl'] = self.ttl
+        return stats
+
+
+class NullCache:
+    """캐시 비활성화용 (항상 miss)"""
+
+    def get(self, key):
+        return None
+
+    def set(self, key, value):
+        pass
+
+    def delete(self, key):
+        pass
+
+    def clear(self):
+        pass
+
+    def stats(self):
+        return {'backend': 'none'}
+
+
+_cache_lock = threading.Lock()
+
+
+def create_cache(config):
+    """설정값에 따라 캐시 백엔드 생성"""
+    backend = config.get('REPORT_CACHE_BACKEND', 'memory')
+    ttl = config.get('REPORT_CACHE_TTL', 300)
+    if backend == 'memory':
+        return MemoryCache(max_entries=config.get('REPORT_CACHE_MAX_ENTRIES', 1024), ttl=ttl)
+    if backend == 'redis':
+        return RedisCache(config.get('REPORT_CACHE_REDIS_URL'), ttl=ttl)
+    if backend in (None, '', 'none'):
+        return NullCache()
+    raise ValueError(f'Unknown REPORT_CACHE_BACKEND: {backend}')
+
+
+def get_report_cache():
+    """현재 앱의 보고서 캐시 반환 (없으면 생성)"""
+    cache = current_app.extensions.get('report_cache')
+    if cache is not None:
+        return cache
+    with _cache_lock:
+        cache = current_app.extensions.get('report_cache')
+        if cache is None:
+            cache = create_cache(current_app.config)
+            current_app.extensions['report_cache'] = cache
+        return cache
@@ -0,0 +1,107 @@
+"""
+보고서 내보내기 - CSV / NDJSON 스트리밍
+"""
+import csv
+import io
+from datetime import datetime
+
+from app.db.database import Database
+from app.db.models import QUERIES
+from app.json_provider import dumps
+from app.schemas.report_schema import full_report_schema
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+}
+
+EXPORT_STATUSES = ('pending', 'in_progress', 'completed', 'failed')
+
+# CSV는 이 행 수마다 한 번씩 내보냄
+CSV_CHUNK_ROWS = 500
+
+def _flatten(report):
+    """{'patient': {'name': ...}} → {'patient.name': ...}"""
+    flat = {}
+    for section, fields in report.items():
+        for key, value in fields.items():
+            flat[f'{section}.{key}'] = value
+    return flat
+
+def _csv_value(value):
+    return '' if value is None else value
+
+class ExportService:
+    """보고서 내보내기"""
+    
+    @staticmethod
+    def build_filters(date_from=None, date_to=None, status=None):
+        """
+        내보내기 필터 검증
+        
+        Args:
+            date_from: 시작 검사일 (YYYY-MM-DD)
+            date_to: 종료 검사일 (YYYY-MM-DD)
+            status: 보고서 상태
+            
+        Returns:
+            dict: export_reports 쿼리 파라미터
+            
+        Raises:
+            ValueError: 잘못된 날짜 또는 상태
+        """
+        for name, value in (('date_from', date_from), ('date_to', date_to)):
+            if value:
+                try:
+                    datetime.strptime(value, '%Y-%m-%d')
+                except ValueError as e:
+                    raise ValueError(f'{name} must be YYYY-MM-DD') from e
+        if status and status not in EXPORT_STATUSES:
+            raise ValueError(f'status must be one of {", ".join(EXPORT_STATUSES)}')
+        return {
+            'date_from': date_from or None,
+            'date_to': date_to or None,
+            'status': status or None,
+        }
+    
+    @staticmethod
+    def iter_reports(filters):
+        """필터에 맞는 모든 보고서를 full_report_schema 형태로 하나씩 반환"""
+        for row in Database.stream(QUERIES['export_reports'], filters):
+            yield full_report_schema(row)
+    
+    @staticmethod
+    def iter_ndjson(filters):
+        """한 줄에 보고서 하나씩 JSON으로 반환"""
+        for report in ExportService.iter_reports(filters):
+            yield dumps(report) + '\n'
+    
+    @staticmethod
+    def iter_csv(filters):
+        """헤더 + 보고서 행을 CSV 조각으로 반환 (CSV_CHUNK_ROWS 행씩)"""
+        buffer = io.StringIO()
+        writer = None
+        rows = 0
+        for report in ExportService.iter_reports(filters):
+            flat = _flatten(report)
+            if writer is None:
+                writer = csv.writer(buffer)
+                columns = list(flat.keys())
+                writer.writerow(columns)
+            writer.writerow([_csv_value(flat.get(column)) for column in columns])
+            rows += 1
+            if rows % CSV_CHUNK_ROWS == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
+    
+    @staticmethod
+    def iter_export(export_format, filters):
+        """형식에 맞는 내보내기 제너레이터"""
+        if export_format == 'csv':
+            return ExportService.iter_csv(filters)
+        if export_format == 'ndjson':
+            return ExportService.iter_ndjson(filters)
+        raise ValueError(f'format must be one of {", ".join(EXPORT_FORMATS)}')
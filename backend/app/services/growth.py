@@ -0,0 +1,168 @@
+"""
+성장 백분위 계산 엔진 - static/js/data 의 성장도표를 NumPy 배열로 사용
+
+차트에서 쓰는 신장/체중/BMI 백분위 곡선(p3~p97, 3~18세)을 한 번만 읽어 두고,
+측정값 배열 전체에 대해 나이 보간, z-점수, 백분위, 분류를 한 번의 벡터 연산으로 계산합니다.
+"""
+import os
+import re
+import threading
+
+import numpy as np
+
+# 성장도표 파일의 백분위 열과 해당 표준정규분포 z 값
+PERCENTILE_KEYS = ['p3', 'p10', 'p25', 'p50', 'p75', 'p90', 'p97']
+PERCENTILE_Z = np.array([-1.880794, -1.281552, -0.674490, 0.0, 0.674490, 1.281552, 1.880794])
+
+# 곡선 바깥으로 외삽할 때 z 값의 한계
+Z_LIMIT = 4.0
+
+METRICS = ('height', 'weight', 'bmi')
+GENDER_PREFIX = {'M': 'male', 'F': 'female'}
+
+_ARRAY_RE = r'\[([^\]]*)\]'
+
+
+def _parse_numbers(text):
+    return [float(x) for x in text.split(',') if x.strip()]
+
+
+def load_table(path):
+    """
+    성장도표 JS 파일에서 나이 배열과 백분위 행렬 읽기
+
+    Returns:
+        tuple: (ages (A,), values (7, A))
+    """
+    with open(path, encoding='utf-8') as f:
+        source = f.read()
+    ages = re.search(r'export const ages\s*=\s*' + _ARRAY_RE, source)
+    if not ages:
+        raise ValueError(f'ages not found in {path}')
+    rows = []
+    for key in PERCENTILE_KEYS:
+        row = re.search(r'\b' + key + r'\s*:\s*' + _ARRAY_RE, source)
+        if not row:
+            raise ValueError(f'{key} not found in {path}')
+        rows.append(_parse_numbers(row.group(1)))
+    ages = np.array(_parse_numbers(ages.group(1)))
+    values = np.array(rows)
+    if values.shape != (len(PERCENTILE_KEYS), len(ages)):
+        raise ValueError(f'Inconsistent table shape in {path}: {values.shape}')
+    return ages, values
+
+
+def _normal_cdf(z):
+    """표준정규분포 누적확률 (Abramowitz-Stegun 7.1.26, 오차 < 1.5e-7)"""
+    x = np.abs(z) / np.sqrt(2.0)
+    t = 1.0 / (1.0 + 0.3275911 * x)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741
+                + t * (-1.453152027 + t * 1.061405429))))
+    erf = 1.0 - poly * np.exp(-x * x)
+    return 0.5 * (1.0 + np.sign(z) * erf)
+
+
+def classify_height_array(percentile):
+    """utils.classify_height의 벡터 버전 (저신장/정상/고신장)"""
+    percentile = np.asarray(percentile)
+    return np.select([percentile <= 5, percentile <= 95], ['저신장', '정상'], '고신장')
+
+
+def classify_bmi_array(bmi):
+    """utils.classify_bmi의 벡터 버전 (저체중/정상/과체중/비만)"""
+    bmi = np.asarray(bmi)
+    return np.select([bmi < 18.5, bmi < 25, bmi < 30], ['저체중', '정상', '과체중'], '비만')
+
+
+class GrowthPercentileEngine:
+    """성별·지표별 성장도표를 메모리에 올려두고 배열 단위로 계산"""
+
+    def __init__(self, data_dir):
+        self.data_dir = data_dir
+        self.tables = {}
+        for metric in METRICS:
+            for gender, prefix in GENDER_PREFIX.items():
+                filename = f'{prefix}{metric.capitalize()}Percentile.js'
+                self.tables[(metric, gender)] = load_table(os.path.join(data_dir, filename))
+
+    def curves_at(self, metric, gender, ages):
+        """
+        나이(소수)별 백분위 곡선 값 (구간 선형 보간, 3~18세 밖은 양 끝 값 사용)
+
+        Returns:
+            ndarray: (7, N)
+        """
+        table_ages, values = self.tables[(metric, gender)]
+        ages = np.clip(np.asarray(ages, dtype=float), table_ages[0], table_ages[-1])
+        i = np.clip(np.searchsorted(table_ages, ages, side='right') - 1, 0, len(table_ages) - 2)
+        frac = (ages - table_ages[i]) / (table_ages[i + 1] - table_ages[i])
+        return values[:, i] * (1.0 - frac) + values[:, i + 1] * frac
+
+    def _z_scores(self, curves, values):
+        """곡선 사이를 구간 선형으로 보간해 z 점수 계산 (p3 미만/p97 초과는 바깥 구간으로 외삽)"""
+        below = (curves <= values).sum(axis=0)
+        lo = np.clip(below - 1, 0, len(PERCENTILE_Z) - 2)
+        cols = np.arange(values.shape[0])
+        c_lo = curves[lo, cols]
+        c_hi = curves[lo + 1, cols]
+        z_lo = PERCENTILE_Z[lo]
+        z_hi = PERCENTILE_Z[lo + 1]
+        span = np.where(c_hi > c_lo, c_hi - c_lo, np.nan)
+        z = z_lo + (values - c_lo) / span * (z_hi - z_lo)
+        return np.clip(z, -Z_LIMIT, Z_LIMIT)
+
+    def compute(self, metric, genders, ages, values):
+        """
+        측정값 배열의 z 점수, 백분위, 분류 계산
+
+        Args:
+            metric: 'height' / 'weight' / 'bmi'
+            genders: 'M'/'F' 배열 (또는 하나의 값)
+            ages: 나이(소수, 예: 11.75) 배열
+            values: 측정값 배열 (키 cm, 체중 kg, BMI)
+
+        Returns:
+            dict: {
+                'z_score': ndarray, 'percentile': ndarray (0~100),
+                'category': ndarray (height: 저신장/정상/고신장, bmi: 저체중/정상/과체중/비만, weight: None)
+            }
+        """
+        if metric not in METRICS:
+            raise ValueError(f'Unknown metric: {metric}')
+        values = np.asarray(values, dtype=float)
+        ages = np.broadcast_to(np.asarray(ages, dtype=float), values.shape)
+        genders = np.broadcast_to(np.asarray(genders), values.shape)
+
+        z = np.full(values.shape, np.nan)
+        for gender in GENDER_PREFIX:
+            mask = genders == gender
+            if mask.any():
+                curves = self.curves_at(metric, gender, ages[mask])
+                z[mask] = self._z_scores(curves, values[mask])
+
+        percentile = _normal_cdf(z) * 100.0
+        if metric == 'height':
+            category = classify_height_array(percentile)
+        elif metric == 'bmi':
+            category = classify_bmi_array(values)
+        else:
+            category = None
+        if category is not None:
+            category = np.where(np.isnan(z), None, category)
+        return {'z_score': z, 'percentile': percentile, 'category': category}
+
+
+_engines = {}
+_engine_lock = threading.Lock()
+
+
+def get_growth_engine(data_dir):
+    """data_dir 별로 한 번만 로드한 엔진 반환"""
+    engine = _engines.get(data_dir)
+    if engine is None:
+        with _engine_lock:
+            engine = _engines.get(data_dir)
+            if engine is None:
+                engine = GrowthPercentileEngine(data_dir)
+                _engines[data_dir] = engine
+    return engine
@@ -0,0 +1,80 @@
+"""
+성장 백분위 일괄 계산 서비스
+"""
+import os
+
+import numpy as np
+from flask import current_app
+
+from app.services.growth import METRICS, get_growth_engine
+from app.utils import convert_korean_age_to_decimal
+
+# 입력 성별 값 → 성장도표 성별 코드
+GENDER_CODES = {'M': 'M', 'F': 'F', 'm': 'M', 'f': 'F', '남자': 'M', '여자': 'F'}
+
+class GrowthService:
+    """성장도표 기준 백분위/z 점수 계산"""
+    
+    @staticmethod
+    def get_engine():
+        """현재 앱의 static/js/data 성장도표로 만든 엔진"""
+        return get_growth_engine(os.path.join(current_app.static_folder, 'js', 'data'))
+    
+    @staticmethod
+    def calculate_percentiles(metric, genders, ages, values):
+        """
+        측정값 여러 개의 백분위 일괄 계산
+        
+        Args:
+            metric: 'height' / 'weight' / 'bmi'
+            genders: 성별 리스트 ('M'/'F'/'남자'/'여자') 또는 하나의 값
+            ages: 나이 리스트 (소수 또는 "n세 n개월") 또는 하나의 값
+            values: 측정값 리스트
+            
+        Returns:
+            dict: {'percentile': [...], 'z_score': [...], 'category': [...]} (계산할 수 없는 항목은 None)
+            
+        Raises:
+            ValueError: 잘못된 지표, 길이가 다른 배열, 알 수 없는 성별
+        """
+        if metric not in METRICS:
+            raise ValueError(f'metric must be one of {", ".join(METRICS)}')
+        
+        values = np.asarray(values, dtype=float)
+        if values.ndim != 1:
+            raise ValueError('values must be a list of numbers')
+        
+        if isinstance(genders, (list, tuple)):
+            if len(genders) != len(values):
+                raise ValueError('genders and values must have the same length')
+            try:
+                genders = np.array([GENDER_CODES[g] for g in genders])
+            except KeyError as e:
+                raise ValueError(f'Unknown gender: {e.args[0]}') from e
+        else:
+            if genders not in GENDER_CODES:
+                raise ValueError(f'Unknown gender: {genders}')
+            genders = GENDER_CODES[genders]
+        
+        if isinstance(ages, (list, tuple)):
+            if len(ages) != len(values):
+                raise ValueError('ages and values must have the same length')
+            if any(isinstance(age, str) for age in ages):
+                ages = [convert_korean_age_to_decimal(age) for age in ages]
+            ages = np.array([np.nan if age is None else age for age in ages], dtype=float)
+        else:
+            ages = convert_korean_age_to_decimal(ages)
+            if ages is None:
+                raise ValueError('Invalid age')
+        
+        result = GrowthService.get_engine().compute(metric, genders, ages, values)
+        
+        invalid = np.isnan(result['z_score'])
+        percentile = np.round(result['percentile'], 2)
+        z_score = np.round(result['z_score'], 3)
+        category = result['category']
+        return {
+            'percentile': [None if bad else float(p) for p, bad in zip(percentile, invalid)],
+            'z_score': [None if bad else float(z) for z, bad in zip(z_score, invalid)],
+            'category': category.tolist() if category is not None else None,
+        }
@@ -0,0 +1,334 @@
+"""
+보고서 일괄 적재 - PACS/AI 파이프라인이 만든 검사 결과를 여러 건씩 저장
+
+보고서 하나는 reports 한 행과 bone_ages / genetic_info / height_percentiles / weight_info /
+xray_analysis 각 한 행(섹션이 있을 때)으로 저장됩니다. 입력은 chunk_size건씩 묶어
+테이블별 다중 행 INSERT를 하나의 트랜잭션으로 실행하고, 실패한 청크는 한 건씩 다시 시도해
+어떤 행이 실패했는지 알려줍니다.
+"""
+from datetime import date
+
+import pymysql
+from flask import current_app
+
+from app.db.database import Database
+from app.db.models import QUERIES
+from app.services.report_service import ReportService
+from app.services.search import index_patient
+from app.services.snapshot_service import get_snapshot_service
+
+REPORT_STATUSES = ('pending', 'in_progress', 'completed', 'failed')
+GENDERS = ('M', 'F')
+
+# 입력 섹션 이름(응답 스키마와 같음) → (QUERIES 키, 컬럼 순서)
+SECTIONS = {
+    'bone_age': ('insert_bone_ages', (
+        'chronological_age', 'bone_age', 'age_difference', 'current_height', 'predicted_height_ai')),
+    'genetic_info': ('insert_genetic_info', (
+        'father_height', 'mother_height', 'predicted_height_genetic')),
+    'height_percentile': ('insert_height_percentiles', (
+        'gender', 'percentile', 'percentile_rank', 'assessment')),
+    'weight_info': ('insert_weight_info', (
+        'weight', 'percentile', 'bmi', 'bmi_category', 'obesity_rate', 'obesity_grade')),
+    'xray': ('insert_xray_analysis', (
+        'image_path', 'analysis_result', 'confidence_score')),
+}
+
+# 숫자 컬럼과 허용 범위 (DECIMAL(5, 2)는 1000 미만)
+NUMERIC_FIELDS = {
+    'current_height': (0, 999.99),
+    'predicted_height_ai': (0, 999.99),
+    'father_height': (0, 999.99),
+    'mother_height': (0, 999.99),
+    'predicted_height_genetic': (0, 999.99),
+    'weight': (0, 999.99),
+    'bmi': (0, 999.99),
+    'obesity_rate': (-999.99, 999.99),
+    'confidence_score': (0, 1),
+}
+INTEGER_FIELDS = {'percentile': (0, 100)}
+
+DEFAULT_CHUNK_SIZE = 500
+
+
+class ReportConsistencyError(Exception):
+    """다중 행 INSERT의 보고서 ID가 연속으로 할당되지 않은 경우 (한 건씩 다시 적재)"""
+
+
+def _parse_date(value, field):
+    try:
+        return date.fromisoformat(str(value))
+    except ValueError:
+        raise ValueError(f'{field} must be YYYY-MM-DD')
+
+
+def _text(value, field, max_length):
+    if value is None:
+        return None
+    value = str(value).strip()
+    if len(value) > max_length:
+        raise ValueError(f'{field} is too long (max {max_length})')
+    return value or None
+
+
+def _section_values(name, section):
+    if not isinstance(section, dict):
+        raise ValueError(f'{name} must be an object')
+    columns = SECTIONS[name][1]
+    unknown = set(section) - set(columns)
+    if unknown:
+        raise ValueError(f"Unknown field in {name}: {', '.join(sorted(unknown))}")
+
+    values = []
+    for column in columns:
+        value = section.get(column)
+        if value is not None and column in NUMERIC_FIELDS:
+            low, high = NUMERIC_FIELDS[column]
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                raise ValueError(f'{name}.{column} must be a number')
+            if not low <= value <= high:
+                raise ValueError(f'{name}.{column} must be between {low} and {high}')
+        elif value is not None and column in INTEGER_FIELDS:
+            low, high = INTEGER_FIELDS[column]
+            try:
+                if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+                    raise ValueError
+                value = int(value)
+            except (TypeError, ValueError):
+                raise ValueError(f'{name}.{column} must be an integer')
+            if not low <= value <= high:
+                raise ValueError(f'{name}.{column} must be between {low} and {high}')
+        elif value is not None and column == 'gender':
+            if value not in GENDERS:
+                raise ValueError(f'{name}.gender must be M or F')
+        elif value is not None:
+            value = _text(value, f'{name}.{column}', 65535 if column == 'analysis_result' else 255)
+        values.append(value)
+    return values
+
+
+def normalize_report(item):
+    """
+    입력 한 건 검증 및 정규화
+
+    Args:
+        item: {
+            "patient_code": "2024-001234",
+            "patient": {"name": "홍길동", "gender": "M", "birth_date": "2012-05-15"},  # 없는 환자면 생성
+            "exam_date": "2024-11-20",
+            "requested_doctor": "김영희",
+            "status": "completed",
+            "bone_age": {...}, "genetic_info": {...}, "height_percentile": {...},
+            "weight_info": {...}, "xray": {...}
+        }
+
+    Returns:
+        dict: 적재용으로 정규화된 값
+
+    Raises:
+        ValueError: 잘못된 입력
+    """
+    if not isinstance(item, dict):
+        raise ValueError('Report must be an object')
+
+    patient_code = _text(item.get('patient_code'), 'patient_code', 50)
+    if not patient_code:
+        raise ValueError('patient_code is required')
+    if not item.get('exam_date'):
+        raise ValueError('exam_date is required')
+
+    status = item.get('status') or 'pending'
+    if status not in REPORT_STATUSES:
+        raise ValueError(f"status must be one of {', '.join(REPORT_STATUSES)}")
+
+    patient = None
+    if item.get('patient') is not None:
+        info = item['patient']
+        if not isinstance(info, dict):
+            raise ValueError('patient must be an object')
+        name = _text(info.get('name'), 'patient.name', 100)
+        if not name or info.get('gender') not in GENDERS or not info.get('birth_date'):
+            raise ValueError('patient requires name, gender (M/F) and birth_date')
+        patient = (patient_code, name, info['gender'], _parse_date(info['birth_date'], 'patient.birth_date'))
+
+    normalized = {
+        'patient_code': patient_code,
+        'patient': patient,
+        'exam_date': _parse_date(item['exam_date'], 'exam_date'),
+        'requested_doctor': _text(item.get('requested_doctor'), 'requested_doctor', 100),
+        'status': status,
+        'sections': {},
+    }
+    for name in SECTIONS:
+        if item.get(name) is not None:
+            normalized['sections'][name] = _section_values(name, item[name])
+    return normalized
+
+
+def _success(report_id, patient_code):
+    return {'success': True, 'message': 'Report created', 'report_id': report_id,
+            'patient_code': patient_code}
+
+
+def _failure(message, patient_code=None):
+    return {'success': False, 'message': message, 'report_id': None, 'patient_code': patient_code}
+
+
+class IngestService:
+    """보고서 일괄 적재"""
+
+    @staticmethod
+    def ingest_reports(items, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        여러 보고서를 적재하고 건별 결과 반환
+
+        Args:
+            items: 입력 dict 리스트 (normalize_report 참고)
+            chunk_size: 한 트랜잭션에 넣을 보고서 수
+
+        Returns:
+            list: 입력 순서대로 {'index', 'success', 'message', 'report_id', 'patient_code'}
+        """
+        results = [None] * len(items)
+        valid = []
+        for index, item in enumerate(items):
+            try:
+                valid.append((index, normalize_report(item)))
+            except ValueError as e:
+                code = item.get('patient_code') if isinstance(item, dict) else None
+                results[index] = _failure(str(e), code)
+
+        for start in range(0, len(valid), chunk_size):
+            chunk = valid[start:start + chunk_size]
+            try:
+                outcomes = IngestService._write_chunk(chunk)
+            except (pymysql.Error, ReportConsistencyError) as e:
+                if len(chunk) == 1:
+                    outcomes = {chunk[0][0]: _failure(f'Database error: {e}', chunk[0][1]['patient_code'])}
+                else:
+                    # 어느 행이 문제인지 알 수 있도록 한 건씩 다시 적재
+                    outcomes = {}
+                    for row in chunk:
+                        try:
+                            outcomes.update(IngestService._write_chunk([row]))
+                        except pymysql.Error as row_error:
+                            outcomes[row[0]] = _failure(f'Database error: {row_error}',
+                                                        row[1]['patient_code'])
+            for index, outcome in outcomes.items():
+                results[index] = outcome
+
+        for index, result in enumerate(results):
+            result['index'] = index
+        return results
+
+    @staticmethod
+    def _write_chunk(chunk):
+        """
+        청크 하나를 하나의 트랜잭션으로 적재
+
+        Returns:
+            dict: {입력 index: 결과}
+        """
+        outcomes = {}
+        created = []
+        with Database.transaction() as connection:
+            patients = IngestService._resolve_patients(connection, chunk, created)
+
+            rows = []
+            for index, report in chunk:
+                patient = patients.get(report['patient_code'])
+                if patient is None:
+                    outcomes[index] = _failure(
+                        f"Patient with code {report['patient_code']} not found "
+                        f"(include 'patient' to create it)", report['patient_code'])
+                else:
+                    rows.append((index, report, patient))
+            if not rows:
+                return outcomes
+
+            report_ids = IngestService._insert_reports(connection, rows)
+
+            for name, (query_name, columns) in SECTIONS.items():
+                args = []
+                for report_id, (_, report, patient) in zip(report_ids, rows):
+                    values = report['sections'].get(name)
+                    if values is None:
+                        continue
+                    if name == 'height_percentile' and values[0] is None:
+                        # height_percentiles.gender는 NOT NULL이므로 환자 성별로 채움
+                        values = [patient['gender']] + values[1:]
+                    args.append((report_id, *values))
+                Database.execute_many(QUERIES[query_name], args, connection=connection)
+
+        for report_id, (index, report, _) in zip(report_ids, rows):
+            outcomes[index] = _success(report_id, report['patient_code'])
+
+        IngestService._after_commit(rows, report_ids, created)
+        return outcomes
+
+    @staticmethod
+    def _after_commit(rows, report_ids, created):
+        """
+        커밋된 청크를 캐시/검색 인덱스/스냅샷에 반영
+
+        이미 커밋되었으므로 여기서 난 오류(Redis, 스냅샷 폴더 등)는 기록만 하고 적재 결과는 성공으로 둡니다.
+        (실패로 돌려주면 클라이언트가 다시 보내 같은 보고서가 중복으로 적재됨)
+        """
+        try:
+            for code in {report['patient_code'] for _, report, _ in rows}:
+                ReportService.invalidate_patient_report(code)
+            for patient in created:
+                index_patient(patient['id'], patient['patient_code'], patient['name'])
+            completed = [report_id for report_id, (_, report, _) in zip(report_ids, rows)
+                         if report['status'] == 'completed']
+            if completed and current_app.config.get('SNAPSHOT_ENABLED', True):
+                # 예약하지 못한 스냅샷은 첫 조회 시 다시 예약됨
+                get_snapshot_service().schedule(completed)
+        except Exception as e:
+            print(f"Post-ingest update error: {e}")
+
+    @staticmethod
+    def _resolve_patients(connection, chunk, created):
+        """환자 코드 → 환자 행 (없는 환자는 patient 정보가 있으면 생성하고 created에 추가)"""
+        def fetch(codes):
+            query = QUERIES['get_patients_by_codes'].format(placeholders=', '.join(['%s'] * len(codes)))
+            rows = Database.fetch_all(query, tuple(codes), connection=connection) or []
+            return {row['patient_code']: row for row in rows}
+
+        codes = list(dict.fromkeys(report['patient_code'] for _, report in chunk))
+        patients = fetch(codes)
+
+        new_patients = {}
+        for _, report in chunk:
+            code = report['patient_code']
+            if code not in patients and report['patient'] and code not in new_patients:
+                new_patients[code] = report['patient']
+        if new_patients:
+            Database.execute_many(QUERIES['insert_patients'], list(new_patients.values()),
+                                  connection=connection)
+            inserted = fetch(list(new_patients))
+            patients.update(inserted)
+            created.extend(inserted.values())
+        return patients
+
+    @staticmethod
+    def _insert_reports(connection, rows):
+        """reports 다중 행 INSERT 후 행 순서대로 보고서 ID 반환"""
+        args = []
+        expected = []
+        for _, report, patient in rows:
+            args.extend((patient['id'], report['exam_date'], report['requested_doctor'], report['status']))
+            expected.append((patient['id'], report['exam_date']))
+
+        query = QUERIES['insert_reports'].format(values=', '.join(['(%s, %s, %s, %s)'] * len(rows)))
+        first_id = Database.execute_query(query, tuple(args), connection=connection)
+        report_ids = list(range(first_id, first_id + len(rows)))
+        if len(rows) > 1:
+            # innodb_autoinc_lock_mode=2 에서는 한 문장의 ID가 연속이라는 보장이 없으므로 확인
+            inserted = Database.fetch_all(QUERIES['get_inserted_reports'],
+                                          (report_ids[0], report_ids[-1]), connection=connection)
+            if [(row['patient_id'], row['exam_date']) for row in inserted] != expected:
+                raise ReportConsistencyError('Report IDs were not allocated consecutively')
+        return report_ids
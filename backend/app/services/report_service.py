@@ -3,34 +3,175 @@
 """
 from app.db.database import Database
 from app.db.models import QUERIES
-from app.schemas.report_schema import full_report_schema, patient_list_schema
+from app.schemas.report_schema import FULL_REPORT, PATIENT_LIST, full_report_schema
+from app.services.cache import get_report_cache
+from app.services.search import get_search_index
+from app.services.single_flight import get_report_flights
+from app.services.verification_service import get_patient_verifier
+from app.utils import decode_patient_cursor, encode_patient_cursor
 
 class ReportService:
     """보고서 데이터 조회 및 처리"""
     
     @staticmethod
-    def get_patient_report(patient_code):
+    def get_patient_report(patient_code, version=None):
         """
         환자 코드로 최신 보고서 조회
         
+        캐시 키는 보고서 버전(`code@token`)이라 보고서가 바뀌면 모든 워커가 바로 새 보고서를 읽습니다.
+        캐시에 없을 때 같은 보고서를 동시에 요청한 호출들은 DB 조회 한 번의 결과를 함께 사용합니다.
+        캐시를 채우는 조회는 복제본이 있어도 주 서버에서 실행합니다.
+        
         Args:
             patient_code: 환자 코드
+            version: get_patient_report_version()의 결과 (없으면 여기서 조회)
             
         Returns:
-            dict: 전체 보고서 데이터
+            dict: 전체 보고서 데이터 (없는 환자면 None)
         """
         try:
+            if version is None:
+                version = ReportService.get_patient_report_version(patient_code)
+                if not version:
+                    return None
+            
+            cache = get_report_cache()
+            # 버전별 키에는 DB가 바뀐 뒤의 오래된 보고서가 남지 않으므로 ETag와 본문이 항상 일치
+            key = f"{patient_code}@{version['token']}"
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+
+            return get_report_flights().do(
+                ('report', key), lambda: ReportService._load_patient_report(patient_code, key, cache)
+            )
+        
+        except Exception as e:
+            print(f"Error in get_patient_report: {e}")
+            raise
+    
+    @staticmethod
+    def _load_patient_report(patient_code, key, cache):
+        # 캐시에 넣을 보고서는 주 서버에서 읽음 (지연된 복제본의 이전 보고서가 TTL 동안 남지 않도록)
+        with Database.primary_reads():
             result = Database.fetch_one(QUERIES['get_patient_report'], (patient_code,))
+        
+        if not result:
+            return None
+        
+        report = full_report_schema(result)
+        cache.set(key, report)
+        return report
+    
+    @staticmethod
+    def get_patient_reports(patient_codes):
+        """
+        여러 환자 코드의 최신 보고서를 한 번에 조회
+        
+        버전을 한 번의 쿼리로 읽어 get_patient_report와 같은 `code@token` 키로 캐시를 확인하고,
+        캐시에 없는 코드만 모아 한 번의 쿼리로 조회합니다.
+        
+        Args:
+            patient_codes: 환자 코드 리스트
+            
+        Returns:
+            dict: {환자 코드: 전체 보고서 데이터 또는 None(없는 환자)}
+        """
+        try:
+            codes = list(dict.fromkeys(patient_codes))
+            if not codes:
+                return {}
+            
+            query = QUERIES['get_patient_report_versions_batch'].format(
+                placeholders=', '.join(['%s'] * len(codes))
+            )
+            keys = {
+                row['patient_code']: f"{row['patient_code']}@{ReportService._version(row)['token']}"
+                for row in Database.fetch_all(query, tuple(codes))
+            }
+            
+            cache = get_report_cache()
+            reports = {}
+            missing = []
+            for code, key in keys.items():
+                cached = cache.get(key)
+                if cached is not None:
+                    reports[code] = cached
+                else:
+                    missing.append(code)
+            
+            if missing:
+                query = QUERIES['get_patient_reports_batch'].format(
+                    placeholders=', '.join(['%s'] * len(missing))
+                )
+                with Database.primary_reads():
+                    columns, rows = Database.fetch_rows(query, tuple(missing))
+                for report in FULL_REPORT.dump_rows(columns, rows):
+                    code = report['patient']['patient_code']
+                    reports[code] = report
+                    cache.set(keys[code], report)
+            
+            return {code: reports.get(code) for code in patient_codes}
+        
+        except Exception as e:
+            print(f"Error in get_patient_reports: {e}")
+            raise
+    
+    @staticmethod
+    def get_patient_report_version(patient_code):
+        """
+        환자의 최신 보고서가 마지막으로 바뀐 시각 (조건부 GET용, 보고서 컬럼은 읽지 않음)
+        
+        Args:
+            patient_code: 환자 코드
+            
+        Returns:
+            dict: {'patient_id', 'report_id', 'updated_at', 'token'} (없는 환자면 None)
+        """
+        try:
+            # 같은 환자의 동시 요청은 버전 조회도 한 번만 실행
+            result = get_report_flights().do(
+                ('version', patient_code),
+                lambda: Database.fetch_one(QUERIES['get_patient_report_version'], (patient_code,)),
+            )
             
             if not result:
                 return None
             
-            return full_report_schema(result)
+            return ReportService._version(result)
         
         except Exception as e:
-            print(f"Error in get_patient_report: {e}")
+            print(f"Error in get_patient_report_version: {e}")
             raise
     
+    @staticmethod
+    def _version(row):
+        stamps = [value for key, value in row.items() if key.endswith('_updated_at') and value is not None]
+        updated_at = max(stamps) if stamps else None
+        return {
+            'patient_id': row['id'],
+            'report_id': row['report_id'],
+            'updated_at': updated_at,
+            'token': f"{row['report_id']}:{updated_at.isoformat() if updated_at else ''}",
+        }
+    
+    @staticmethod
+    def invalidate_patient_report(patient_code):
+        """
+        보고서가 추가/수정/삭제되었을 때 해당 환자의 생년월일 캐시 제거
+        
+        보고서 캐시는 버전별 키라 바뀐 보고서는 다음 조회에서 새 키로 읽으므로 지우지 않습니다.
+        
+        Args:
+            patient_code: 환자 코드
+        """
+        get_patient_verifier().forget(patient_code)
+    
+    @staticmethod
+    def clear_report_cache():
+        """보고서 캐시 전체 비우기"""
+        get_report_cache().clear()
+    
     @staticmethod
     def get_patient_history(patient_id):
         """
@@ -63,47 +204,141 @@ class ReportService:
             list: 환자 목록
         """
         try:
-            results = Database.fetch_all(QUERIES['get_all_patients'])
+            columns, rows = Database.fetch_rows(QUERIES['get_all_patients'])
+            return PATIENT_LIST.dump_rows(columns, rows)
+        
+        except Exception as e:
+            print(f"Error in get_all_patients: {e}")
+            raise
+    
+    @staticmethod
+    def get_patients_page(page, per_page):
+        """
+        환자 목록 한 페이지 조회 (LIMIT/OFFSET을 SQL에서 처리)
+        
+        Args:
+            page: 페이지 번호 (1부터 시작)
+            per_page: 페이지당 항목 수
+            
+        Returns:
+            list: 환자 목록
+        """
+        try:
+            offset = (page - 1) * per_page
+            columns, rows = Database.fetch_rows(QUERIES['get_patients_page'], (per_page, offset))
+            return PATIENT_LIST.dump_rows(columns, rows)
+        
+        except Exception as e:
+            print(f"Error in get_patients_page: {e}")
+            raise
+    
+    @staticmethod
+    def get_patients_after(cursor, per_page):
+        """
+        커서(keyset) 방식 환자 목록 조회
+        
+        Args:
+            cursor: 이전 페이지의 next_cursor (없으면 첫 페이지)
+            per_page: 페이지당 항목 수
             
-            if not results:
-                return []
+        Returns:
+            tuple: (환자 목록, 다음 페이지 커서 또는 None)
+            
+        Raises:
+            ValueError: 잘못된 커서
+        """
+        try:
+            if cursor:
+                sort_date, last_id = decode_patient_cursor(cursor)
+                columns, rows = Database.fetch_rows(
+                    QUERIES['get_patients_after_cursor'],
+                    (sort_date, sort_date, last_id, per_page)
+                )
+            else:
+                columns, rows = Database.fetch_rows(QUERIES['get_patients_page'], (per_page, 0))
+            
+            if not rows:
+                return [], None
             
-            return [patient_list_schema(patient) for patient in results]
+            patients = PATIENT_LIST.dump_rows(columns, rows)
+            next_cursor = None
+            if len(patients) == per_page:
+                last = patients[-1]
+                next_cursor = encode_patient_cursor(last['latest_exam_date'], last['id'])
+            
+            return patients, next_cursor
         
+        except ValueError:
+            raise
         except Exception as e:
-            print(f"Error in get_all_patients: {e}")
+            print(f"Error in get_patients_after: {e}")
+            raise
+    
+    @staticmethod
+    def count_patients():
+        """
+        전체 환자 수 조회 (집계 JOIN 없이 patients 테이블만 사용)
+        
+        Returns:
+            int: 환자 수
+        """
+        try:
+            result = Database.fetch_one(QUERIES['count_patients'])
+            return result['total'] if result else 0
+        
+        except Exception as e:
+            print(f"Error in count_patients: {e}")
             raise
     
     @staticmethod
-    def search_patients(keyword):
+    def get_patients_version():
         """
-        환자명 또는 코드로 검색
+        환자 목록의 환자 수와 마지막 수정 시각 (조건부 GET용)
+        
+        Returns:
+            dict: {'total', 'updated_at'}
+        """
+        try:
+            result = Database.fetch_one(QUERIES['get_patients_version']) or {}
+            stamps = [result.get('patients_updated_at'), result.get('summaries_updated_at')]
+            stamps = [value for value in stamps if value is not None]
+            return {
+                'total': result.get('total') or 0,
+                'updated_at': max(stamps) if stamps else None,
+            }
+        
+        except Exception as e:
+            print(f"Error in get_patients_version: {e}")
+            raise
+    
+    @staticmethod
+    def search_patients(keyword, limit=50):
+        """
+        환자명 또는 코드로 검색 (검색 인덱스 사용)
+        
+        환자코드/이름의 앞부분·부분 일치와 이름 초성(예: 'ㅎㄱㄷ') 검색을 지원합니다.
         
         Args:
             keyword: 검색 키워드
+            limit: 최대 결과 수
             
         Returns:
-            list: 검색 결과
+            list: 검색 결과 (일치도 순)
         """
         try:
-            query = """
-                SELECT 
-                    p.id, p.patient_code, p.name, p.gender, p.birth_date,
-                    MAX(r.exam_date) as latest_exam_date,
-                    COUNT(r.id) as total_reports
-                FROM patients p
-                LEFT JOIN reports r ON p.id = r.patient_id
-                WHERE p.patient_code LIKE %s OR p.name LIKE %s
-                GROUP BY p.id
-                ORDER BY p.name ASC
-            """
-            search_keyword = f"%{keyword}%"
-            results = Database.fetch_all(query, (search_keyword, search_keyword))
+            patient_ids = get_search_index().search(keyword, limit=limit)
             
-            if not results:
+            if not patient_ids:
                 return []
             
-            return [patient_list_schema(patient) for patient in results]
+            query = QUERIES['get_patients_by_ids'].format(
+                placeholders=', '.join(['%s'] * len(patient_ids))
+            )
+            columns, rows = Database.fetch_rows(query, tuple(patient_ids))
+            
+            # 인덱스의 순위대로 정렬 (검색 후 삭제된 환자는 제외)
+            by_id = {patient['id']: patient for patient in PATIENT_LIST.dump_rows(columns, rows)}
+            return [by_id[pid] for pid in patient_ids if pid in by_id]
         
         except Exception as e:
             print(f"Error in search_patients: {e}")
@@ -0,0 +1,340 @@
+"""
+환자 검색 인덱스 - 이름/환자코드 n-gram 인덱스와 한글 초성 검색
+"""
+import threading
+import time
+from bisect import bisect_left, insort
+from heapq import nsmallest
+
+from flask import current_app
+
+from app.db.database import Database
+from app.db.models import QUERIES
+
+# 한글 음절의 초성 (유니코드 순서)
+CHOSEONG = [
+    'ㄱ', 'ㄲ', 'ㄴ', 'ㄷ', 'ㄸ', 'ㄹ', 'ㅁ', 'ㅂ', 'ㅃ', 'ㅅ',
+    'ㅆ', 'ㅇ', 'ㅈ', 'ㅉ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ'
+]
+_CHOSEONG_SET = frozenset(CHOSEONG)
+_HANGUL_BASE = 0xAC00
+_HANGUL_LAST = 0xD7A3
+
+def normalize(text):
+    """검색용 정규화 (소문자, 공백 제거)"""
+    if not text:
+        return ''
+    return ''.join(str(text).lower().split())
+
+
+def to_choseong(text):
+    """
+    한글 음절을 초성으로 변환 (한글이 아닌 문자는 그대로 유지)
+
+    예: '홍길동' → 'ㅎㄱㄷ'
+    """
+    chars = []
+    for ch in text:
+        code = ord(ch)
+        if _HANGUL_BASE <= code <= _HANGUL_LAST:
+            chars.append(CHOSEONG[(code - _HANGUL_BASE) // 588])
+        else:
+            chars.append(ch)
+    return ''.join(chars)
+
+
+def is_choseong_query(text):
+    """초성(ㄱ~ㅎ)만으로 이루어진 검색어인지 확인"""
+    return bool(text) and all(ch in _CHOSEONG_SET for ch in text)
+
+
+def _grams(text):
+    """1-gram과 2-gram 집합"""
+    grams = set(text)
+    grams.update(text[i:i + 2] for i in range(len(text) - 1))
+    return grams
+
+
+class PatientSearchIndex:
+    """
+    메모리 n-gram 역색인
+
+    환자코드, 이름, 이름 초성 세 필드에 대해
+    - 정렬된 목록(앞부분 일치를 이진 탐색으로 limit개만 조회)과
+    - 1/2-gram 역색인(부분 일치 후보를 교집합으로 좁힌 뒤 실제 일치 여부 확인)
+    을 함께 유지합니다.
+    """
+
+    def __init__(self):
+        self._docs = {}          # id -> (code, name, choseong, display_name)
+        self._postings = {}      # gram -> set(id)  (code/name 필드)
+        self._cho_postings = {}  # gram -> set(id)  (초성 필드)
+        self._sorted = {'code': [], 'name': [], 'cho': []}  # 필드별 (text, id) 정렬 목록
+        self._lock = threading.RLock()
+        self.watermark = None    # 마지막으로 반영한 patients.updated_at
+        self.synced_at = 0.0
+        self.built_at = 0.0
+
+    def __len__(self):
+        return len(self._docs)
+
+    def _post(self, postings, text, patient_id):
+        for gram in _grams(text):
+            postings.setdefault(gram, set()).add(patient_id)
+
+    def _unpost(self, postings, text, patient_id):
+        for gram in _grams(text):
+            ids = postings.get(gram)
+            if ids is not None:
+                ids.discard(patient_id)
+                if not ids:
+                    del postings[gram]
+
+    def _unsort(self, field, text, patient_id):
+        entries = self._sorted[field]
+        i = bisect_left(entries, (text, patient_id))
+        if i < len(entries) and entries[i] == (text, patient_id):
+            del entries[i]
+
+    def _index_doc(self, patient_id, patient_code, name, place):
+        code = normalize(patient_code)
+        norm_name = normalize(name)
+        cho = to_choseong(norm_name)
+        if patient_id in self._docs:
+            self.remove(patient_id)
+        self._docs[patient_id] = (code, norm_name, cho, name)
+        self._post(self._postings, code, patient_id)
+        self._post(self._postings, norm_name, patient_id)
+        self._post(self._cho_postings, cho, patient_id)
+        place(self._sorted['code'], (code, patient_id))
+        place(self._sorted['name'], (norm_name, patient_id))
+        place(self._sorted['cho'], (cho, patient_id))
+
+    def add(self, patient_id, patient_code, name):
+        """환자 추가 또는 갱신"""
+        with self._lock:
+            self._index_doc(patient_id, patient_code, name, insort)
+
+    def bulk_load(self, patients):
+        """
+        여러 환자를 한 번에 적재 (정렬 목록은 마지막에 한 번만 정렬)
+
+        Args:
+            patients: (patient_id, patient_code, name) 튜플의 iterable
+        """
+        with self._lock:
+            for patient_id, patient_code, name in patients:
+                self._index_doc(patient_id, patient_code, name, list.append)
+            for entries in self._sorted.values():
+                entries.sort()
+
+    def remove(self, patient_id):
+        """환자 제거"""
+        with self._lock:
+            doc = self._docs.pop(patient_id, None)
+            if doc is None:
+                return
+            code, norm_name, cho, _ = doc
+            self._unpost(self._postings, code, patient_id)
+            self._unpost(self._postings, norm_name, patient_id)
+            self._unpost(self._cho_postings, cho, patient_id)
+            self._unsort('code', code, patient_id)
+            self._unsort('name', norm_name, patient_id)
+            self._unsort('cho', cho, patient_id)
+
+    def clear(self):
+        with self._lock:
+            self._docs.clear()
+            self._postings.clear()
+            self._cho_postings.clear()
+            for entries in self._sorted.values():
+                entries.clear()
+            self.watermark = None
+
+    def _prefix(self, field, query, exact):
+        """정렬 목록에서 query로 시작하는(exact면 같은) 항목의 ID를 순서대로 반환"""
+        entries = self._sorted[field]
+        i = bisect_left(entries, (query,))
+        while i < len(entries):
+            text, pid = entries[i]
+            if not text.startswith(query):
+                break
+            if exact and text != query:
+                break
+            yield pid
+            i += 1
+
+    def _candidates(self, postings, query):
+        grams = [query] if len(query) <= 2 else [query[i:i + 2] for i in range(len(query) - 1)]
+        sets = []
+        for gram in grams:
+            ids = postings.get(gram)
+            if not ids:
+                return set()
+            sets.append(ids)
+        sets.sort(key=len)
+        result = set(sets[0])
+        for ids in sets[1:]:
+            result &= ids
+            if not result:
+                break
+        return result
+
+    def search(self, keyword, limit=50):
+        """
+        검색어로 환자 ID를 순위순으로 반환
+
+        순위: 코드 일치 → 이름 일치 → 코드 앞부분 → 이름 앞부분 → 부분 일치(앞쪽 위치 우선)
+        초성 검색어는 초성 앞부분 → 초성 부분 일치 순입니다.
+
+        Args:
+            keyword: 환자코드/이름 일부 또는 이름 초성 (예: 'ㅎㄱㄷ')
+            limit: 최대 결과 수 (None이면 전체)
+
+        Returns:
+            list: 환자 ID 리스트 (순위순)
+        """
+        query = normalize(keyword)
+        if not query:
+            return []
+
+        results = []
+        seen = set()
+
+        def full():
+            return limit and len(results) >= limit
+
+        def collect(pids):
+            for pid in pids:
+                if full():
+                    return
+                if pid not in seen:
+                    seen.add(pid)
+                    results.append(pid)
+
+        with self._lock:
+            if is_choseong_query(query):
+                tiers = [('cho', False)]
+                postings, fields = self._cho_postings, (2,)
+            else:
+                tiers = [('code', True), ('name', True), ('code', False), ('name', False)]
+                postings, fields = self._postings, (0, 1)
+
+            for field, exact in tiers:
+                collect(self._prefix(field, query, exact))
+                if full():
+                    return results
+
+            # 부분 일치: 앞부분 일치로 채우지 못한 만큼만 위치/이름 순으로 선택
+            scored = []
+            for pid in self._candidates(postings, query):
+                if pid in seen:
+                    continue
+                doc = self._docs[pid]
+                positions = [p for p in (doc[f].find(query) for f in fields) if p > 0]
+                if positions:
+                    scored.append((min(positions), doc[3], pid))
+            remaining = limit - len(results) if limit else len(scored)
+            collect(pid for _, _, pid in nsmallest(remaining, scored))
+
+        return results
+
+    def stats(self):
+        with self._lock:
+            return {
+                'patients': len(self._docs),
+                'grams': len(self._postings) + len(self._cho_postings),
+                'watermark': str(self.watermark) if self.watermark else None,
+                'built_at': self.built_at,
+                'synced_at': self.synced_at,
+            }
+
+
+_index_lock = threading.Lock()
+
+
+def _advance_watermark(rows, index):
+    for row in rows:
+        updated_at = row.get('updated_at')
+        if updated_at is not None and (index.watermark is None or updated_at > index.watermark):
+            index.watermark = updated_at
+
+
+def index_from_rows(rows):
+    """get_search_index_rows 결과로 새 인덱스 생성"""
+    index = PatientSearchIndex()
+    index.bulk_load((row['id'], row['patient_code'], row['name']) for row in rows)
+    _advance_watermark(rows, index)
+    index.built_at = index.synced_at = time.time()
+    return index
+
+
+def apply_index_changes(index, rows):
+    """get_search_index_changes 결과를 인덱스에 반영"""
+    for row in rows:
+        index.add(row['id'], row['patient_code'], row['name'])
+    _advance_watermark(rows, index)
+
+
+def build_index():
+    """DB의 전체 환자로 새 인덱스 생성 (삭제된 환자까지 반영)"""
+    rows = Database.fetch_all(QUERIES['get_search_index_rows']) or []
+    return index_from_rows(rows)
+
+
+def sync_index(index):
+    """마지막 반영 이후 추가/수정된 환자만 인덱스에 반영"""
+    if index.watermark is not None:
+        # 같은 초에 갱신된 행을 놓치지 않도록 >= 로 조회 (중복 반영은 무해함)
+        rows = Database.fetch_all(QUERIES['get_search_index_changes'], (index.watermark,)) or []
+        apply_index_changes(index, rows)
+    index.synced_at = time.time()
+
+
+def get_search_index():
+    """
+    현재 앱의 검색 인덱스 반환
+
+    처음 호출 시 전체를 적재하고, 이후에는 SEARCH_INDEX_SYNC_INTERVAL마다 변경분만 반영합니다.
+    SEARCH_INDEX_REBUILD_INTERVAL마다 새 인덱스를 만들어 교체하므로 검색이 멈추지 않습니다.
+    """
+    config = current_app.config
+    index = current_app.extensions.get('patient_search_index')
+    if index is None:
+        with _index_lock:
+            index = current_app.extensions.get('patient_search_index')
+            if index is None:
+                index = build_index()
+                current_app.extensions['patient_search_index'] = index
+            return index
+
+    now = time.time()
+    rebuild_interval = config.get('SEARCH_INDEX_REBUILD_INTERVAL', 3600)
+    sync_interval = config.get('SEARCH_INDEX_SYNC_INTERVAL', 30)
+    needs_rebuild = rebuild_interval and now - index.built_at >= rebuild_interval
+    needs_sync = sync_interval and now - index.synced_at >= sync_interval
+    # 다른 스레드가 갱신 중이면 기다리지 않고 현재 인덱스로 응답
+    if (needs_rebuild or needs_sync) and _index_lock.acquire(blocking=False):
+        try:
+            if needs_rebuild:
+                index = build_index()
+                current_app.extensions['patient_search_index'] = index
+            else:
+                sync_index(index)
+        finally:
+            _index_lock.release()
+    return index
+
+
+def index_patient(patient_id, patient_code, name):
+    """환자 추가/수정 시 인덱스에 즉시 반영"""
+    index = current_app.extensions.get('patient_search_index')
+    if index is not None:
+        index.add(patient_id, patient_code, name)
+
+
+def unindex_patient(patient_id):
+    """환자 삭제 시 인덱스에서 즉시 제거"""
+    index = current_app.extensions.get('patient_search_index')
+    if index is not None:
+        index.remove(patient_id)
@@ -0,0 +1,117 @@
+"""
+동시 요청 합치기(single-flight) - 같은 키로 동시에 들어온 호출은 조회 한 번의 결과를 함께 사용
+
+보고서 링크가 단체 대화방에 공유되면 같은 환자의 보고서 요청이 같은 순간에 수십 개 들어옵니다.
+캐시가 비어 있으면 모두 캐시 미스가 되어 같은 조인 쿼리를 각자 실행하므로, 먼저 온 호출(리더)만 실행하고
+나머지(팔로워)는 그 결과를 기다려 받습니다. 프로세스 안의 스레드끼리만 합쳐집니다.
+
+    - 리더가 실패하면 기다리던 호출은 실패를 그대로 받지 않고 한 번 다시 합쳐서 실행 (새 리더 한 명만 DB 조회)
+    - 팔로워는 timeout초까지만 기다리고, 넘으면 직접 실행 (멈춘 리더 하나에 모든 요청이 묶이지 않도록)
+"""
+import threading
+
+from flask import current_app
+
+
+class _Call:
+    """진행 중인 호출 하나"""
+
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    키별 동시 호출 합치기
+
+    Args:
+        timeout: 팔로워가 리더의 결과를 기다리는 최대 시간 (초, None이면 무제한)
+    """
+
+    def __init__(self, timeout=None):
+        self.timeout = timeout
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._stats = {'calls': 0, 'executions': 0, 'collapsed': 0, 'errors': 0, 'retries': 0, 'timeouts': 0}
+
+    def _count(self, key):
+        with self._lock:
+            self._stats[key] += 1
+
+    def do(self, key, fn):
+        """
+        fn()을 실행하거나, 같은 key로 실행 중인 호출이 있으면 그 결과를 기다려 반환
+
+        Args:
+            key: 합칠 호출을 구분하는 키 (해시 가능)
+            fn: 인자 없는 함수 (결과는 기다린 호출 모두가 같은 객체를 받으므로 수정하지 말 것)
+        """
+        self._count('calls')
+        return self._join(key, fn, retry=True)
+
+    def _join(self, key, fn, retry):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._stats['executions'] += 1
+            else:
+                self._stats['collapsed'] += 1
+
+        if leader:
+            return self._run(key, call, fn)
+
+        if not call.done.wait(self.timeout):
+            self._count('timeouts')
+            self._count('executions')
+            return fn()
+        if call.error is None:
+            return call.result
+        if retry:
+            # 리더 한 번의 실패(일시적인 연결 오류 등)가 기다린 호출 모두의 실패가 되지 않도록 다시 합쳐서 실행
+            self._count('retries')
+            return self._join(key, fn, retry=False)
+        raise call.error
+
+    def _run(self, key, call, fn):
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            self._count('errors')
+            raise
+        finally:
+            with self._lock:
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+            call.done.set()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['in_flight'] = len(self._calls)
+        stats['timeout'] = self.timeout
+        return stats
+
+
+_flight_lock = threading.Lock()
+
+
+def get_report_flights():
+    """현재 앱의 보고서 조회 합치기 (없으면 생성)"""
+    flights = current_app.extensions.get('report_single_flight')
+    if flights is not None:
+        return flights
+    with _flight_lock:
+        flights = current_app.extensions.get('report_single_flight')
+        if flights is None:
+            timeout = current_app.config.get('REPORT_SINGLE_FLIGHT_TIMEOUT', 10)
+            flights = SingleFlight(timeout=timeout or None)
+            current_app.extensions['report_single_flight'] = flights
+        return flights
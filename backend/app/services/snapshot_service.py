@@ -0,0 +1,374 @@
+"""
+보고서 스냅샷 - 완료된 보고서를 미리 렌더링해 디스크에 저장하고 그대로 제공
+
+완료(status = completed)된 보고서는 내용이 바뀌지 않으므로, 조인 → full_report_schema →
+템플릿 렌더링을 매번 다시 할 필요가 없습니다. 백그라운드 프로세스 풀이 report.html 전체(선택 시 PDF)를
+렌더링해 내용 해시 이름으로 저장하고, '/' 라우트는 스냅샷이 최신이면 파일을 그대로 보냅니다.
+
+저장 구조 (SNAPSHOT_DIR, 기본 instance/snapshots):
+    objects/ab/abcdef....html   내용의 sha256 이름 (같은 내용은 한 번만 저장)
+    refs/<report_id>.json       {"fingerprint", "html", "pdf", "created_at"}
+
+fingerprint는 보고서 내용이 마지막으로 바뀐 시각(각 테이블 updated_at 중 최댓값)과 템플릿/정적 파일
+manifest의 해시로 만들며, 둘 중 하나라도 바뀌면 스냅샷은 무시되고 다시 만들어집니다.
+"""
+import hashlib
+import importlib.util
+import json
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+
+from flask import current_app, render_template, send_file
+
+from app.db.database import Database
+from app.db.models import QUERIES
+from app.rendering import REPORT_FRAGMENTS
+from app.schemas.report_schema import full_report_schema
+
+SNAPSHOT_FORMATS = {
+    'html': 'text/html',
+    'pdf': 'application/pdf',
+}
+
+_TMP_SUFFIX = '.tmp'
+
+
+def _write_atomic(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f'{path}.{os.getpid()}.{threading.get_ident()}{_TMP_SUFFIX}'
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+class SnapshotStore:
+    """내용 주소 방식(content-addressed) 스냅샷 저장소"""
+
+    def __init__(self, root):
+        self.root = root
+        self.objects_dir = os.path.join(root, 'objects')
+        self.refs_dir = os.path.join(root, 'refs')
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.refs_dir, exist_ok=True)
+
+    def object_path(self, digest, fmt):
+        return os.path.join(self.objects_dir, digest[:2], f'{digest}.{fmt}')
+
+    def put(self, data, fmt):
+        """내용을 저장하고 해시 반환 (이미 있으면 쓰지 않음)"""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.object_path(digest, fmt)
+        if not os.path.exists(path):
+            _write_atomic(path, data)
+        return digest
+
+    def _ref_path(self, report_id):
+        return os.path.join(self.refs_dir, f'{int(report_id)}.json')
+
+    def read_ref(self, report_id):
+        try:
+            with open(self._ref_path(report_id), encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def write_ref(self, report_id, ref):
+        _write_atomic(self._ref_path(report_id), json.dumps(ref).encode('utf-8'))
+
+    def delete_ref(self, report_id):
+        try:
+            os.remove(self._ref_path(report_id))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def iter_refs(self):
+        for name in os.listdir(self.refs_dir):
+            if name.endswith('.json'):
+                ref = self.read_ref(name[:-len('.json')])
+                if ref:
+                    yield ref
+
+    def gc(self):
+        """어떤 ref도 가리키지 않는 객체와 중단된 임시 파일 삭제 (삭제한 파일 수 반환)"""
+        live = set()
+        for ref in self.iter_refs():
+            for fmt in SNAPSHOT_FORMATS:
+                if ref.get(fmt):
+                    live.add(f'{ref[fmt]}.{fmt}')
+        removed = 0
+        now = time.time()
+        for directory, _, files in os.walk(self.objects_dir):
+            for name in files:
+                path = os.path.join(directory, name)
+                if name.endswith(_TMP_SUFFIX) and now - os.path.getmtime(path) < 600:
+                    # 아직 쓰는 중일 수 있는 임시 파일
+                    continue
+                if name not in live:
+                    os.remove(path)
+                    removed += 1
+        return removed
+
+
+def template_version(template_dir, static_dir):
+    """report.html, 페이지 조각, 정적 파일 manifest의 해시 (바뀌면 모든 스냅샷이 다시 만들어짐)"""
+    digest = hashlib.sha256()
+    paths = [os.path.join(template_dir, name) for name in ['report.html'] + REPORT_FRAGMENTS]
+    paths.append(os.path.join(static_dir, 'dist', 'manifest.json'))
+    for path in paths:
+        digest.update(path.encode('utf-8'))
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def pdf_available():
+    return importlib.util.find_spec('weasyprint') is not None
+
+
+def render_pdf(html, static_dir):
+    """스냅샷 HTML → PDF (weasyprint 필요, 차트는 브라우저에서 그려지므로 포함되지 않음)"""
+    from weasyprint import HTML, default_url_fetcher
+
+    def url_fetcher(url):
+        # '/static/...' 경로는 정적 파일 폴더에서 읽음
+        if url.startswith('file:///static/'):
+            url = 'file://' + os.path.join(static_dir, url[len('file:///static/'):])
+        return default_url_fetcher(url)
+
+    return HTML(string=html, base_url='file:///', url_fetcher=url_fetcher).write_pdf()
+
+
+class SnapshotService:
+    """보고서 스냅샷 생성/조회와 백그라운드 생성 풀"""
+
+    def __init__(self, store, version, workers=2, pdf=False):
+        """
+        Args:
+            store: SnapshotStore
+            version: template_version() 결과
+            workers: 백그라운드 렌더링 프로세스 수 (0이면 백그라운드 생성 안 함)
+            pdf: PDF도 함께 만들지 여부
+        """
+        self.store = store
+        self.version = version
+        self.workers = workers
+        self.pdf = pdf
+        self._executor = None
+        self._executor_pid = None
+        self._pending = set()
+        self._lock = threading.Lock()
+        self.served = 0
+        self.fallbacks = 0
+        self.scheduled = 0
+        self.failed = 0
+
+    def fingerprint(self, content_updated_at):
+        return f'{content_updated_at}|{self.version}'
+
+    def find(self, patient_code):
+        """
+        환자의 최신 보고서와 바로 제공할 수 있는 스냅샷 조회
+
+        Returns:
+            tuple: (ref, snapshot)
+                ref: {'birth_date', 'report_id', 'status', 'content_updated_at'} (환자/보고서가 없으면 None)
+                snapshot: 최신 스냅샷 ref (없거나 오래되었으면 None)
+        """
+        ref = Database.fetch_one(QUERIES['get_report_snapshot_ref'], (patient_code,))
+        if not ref or ref.get('status') != 'completed':
+            return ref, None
+        snapshot = self.store.read_ref(ref['report_id'])
+        if (not snapshot or snapshot.get('fingerprint') != self.fingerprint(ref['content_updated_at'])
+                or not os.path.exists(self.store.object_path(snapshot['html'], 'html'))):
+            return ref, None
+        return ref, snapshot
+
+    def send(self, snapshot, fmt='html'):
+        """스냅샷 파일 응답 (내용 해시를 ETag로 사용)"""
+        digest = snapshot[fmt]
+        response = send_file(self.store.object_path(digest, fmt), mimetype=SNAPSHOT_FORMATS[fmt],
+                             conditional=True, etag=digest)
+        # 주소에 생년월일이 들어가므로 공유 캐시에는 저장하지 않고, 매번 ETag로 확인
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        with self._lock:
+            self.served += 1
+        return response
+
+    def record_fallback(self, report_id):
+        """스냅샷 없이 직접 렌더링한 완료 보고서 - 다음 요청부터 스냅샷으로 제공되도록 생성 예약"""
+        with self._lock:
+            self.fallbacks += 1
+        self.schedule([report_id])
+
+    def build(self, report_id, force=False):
+        """
+        보고서 한 건의 스냅샷 생성 (앱 컨텍스트에서 실행)
+
+        Returns:
+            str: 'built' / 'fresh'(이미 최신) / 'skipped'(없거나 완료되지 않은 보고서)
+        """
+        row = Database.fetch_one(QUERIES['get_report_for_snapshot'], (report_id,))
+        if not row or row.get('status') != 'completed':
+            # 완료가 취소된 보고서의 스냅샷은 더 이상 제공하지 않음
+            self.store.delete_ref(report_id)
+            return 'skipped'
+
+        fingerprint = self.fingerprint(row['content_updated_at'])
+        existing = self.store.read_ref(report_id)
+        if (not force and existing and existing.get('fingerprint') == fingerprint
+                and (existing.get('pdf') or not self.pdf or not pdf_available())):
+            return 'fresh'
+
+        report = full_report_schema(row)
+        with current_app.test_request_context('/'):
+            html = render_template('report.html', report=report, prerendered=True)
+        ref = {
+            'report_id': report_id,
+            'fingerprint': fingerprint,
+            'html': self.store.put(html.encode('utf-8'), 'html'),
+            'pdf': None,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+        }
+        if self.pdf:
+            try:
+                ref['pdf'] = self.store.put(render_pdf(html, current_app.static_folder), 'pdf')
+            except ImportError:
+                print('Snapshot PDF skipped: weasyprint is not installed')
+        self.store.write_ref(report_id, ref)
+        return 'built'
+
+    def schedule(self, report_ids):
+        """보고서 스냅샷을 백그라운드 프로세스 풀에서 생성 (이미 대기 중인 보고서는 건너뜀)"""
+        if not self.workers:
+            return
+        submitted = []
+        with self._lock:
+            for report_id in report_ids:
+                if report_id in self._pending:
+                    continue
+                try:
+                    future = self._get_executor().submit(_build_in_worker, report_id, False)
+                except BrokenProcessPool:
+                    # 워커가 비정상 종료되면 풀을 새로 만듦
+                    self._executor = None
+                    future = self._get_executor().submit(_build_in_worker, report_id, False)
+                self._pending.add(report_id)
+                self.scheduled += 1
+                submitted.append((report_id, future))
+        # 이미 끝난 future는 콜백이 바로 실행되므로 잠금 밖에서 등록
+        for report_id, future in submitted:
+            future.add_done_callback(lambda f, report_id=report_id: self._done(report_id, f))
+
+    def _done(self, report_id, future):
+        with self._lock:
+            self._pending.discard(report_id)
+        try:
+            _, _, error = future.result()
+        except Exception as e:
+            error = str(e)
+        if error:
+            with self._lock:
+                self.failed += 1
+            print(f"Snapshot build error (report_id={report_id}): {error}")
+
+    def _get_executor(self):
+        # 포크된 프로세스에서는 부모의 풀을 쓸 수 없으므로 새로 만듦
+        if self._executor is None or self._executor_pid != os.getpid():
+            self._executor = create_worker_pool(self.workers)
+            self._executor_pid = os.getpid()
+            self._pending.clear()
+        return self._executor
+
+    def stats(self):
+        return {
+            'workers': self.workers,
+            'pending': len(self._pending),
+            'scheduled': self.scheduled,
+            'failed': self.failed,
+            'served': self.served,
+            'fallbacks': self.fallbacks,
+            'pdf': self.pdf,
+        }
+
+
+# 워커 프로세스 전역 (create_worker_pool의 initializer가 채움)
+_worker_app = None
+
+
+def _init_worker():
+    """워커 프로세스마다 앱을 한 번 만들어 컨텍스트를 유지"""
+    global _worker_app
+    from app import create_app
+
+    _worker_app = create_app()
+    _worker_app.app_context().push()
+
+
+def _build_in_worker(report_id, force):
+    try:
+        return report_id, get_snapshot_service().build(report_id, force=force), None
+    except Exception as e:
+        return report_id, 'failed', str(e)
+
+
+def create_worker_pool(workers):
+    """
+    스냅샷 렌더링 프로세스 풀
+
+    스레드가 있는 웹 서버 프로세스를 fork하지 않도록 spawn으로 시작하며,
+    각 워커는 create_app()으로 (FLASK_ENV에 따른) 자체 앱과 DB 커넥션 풀을 만듭니다.
+    """
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                               initializer=_init_worker)
+
+
+def build_snapshots(report_ids, workers=0, force=False):
+    """
+    여러 보고서의 스냅샷을 병렬로 생성 (flask snapshot build)
+
+    Args:
+        report_ids: 보고서 ID 리스트
+        workers: 프로세스 수 (0/1이면 현재 프로세스에서 차례로 생성)
+        force: 최신이어도 다시 생성
+
+    Yields:
+        tuple: (report_id, 'built' / 'fresh' / 'skipped' / 'failed', 오류 메시지)
+    """
+    if workers <= 1:
+        for report_id in report_ids:
+            yield _build_in_worker(report_id, force)
+        return
+    with create_worker_pool(workers) as executor:
+        yield from executor.map(_build_in_worker, report_ids, [force] * len(report_ids),
+                                chunksize=max(1, min(64, len(report_ids) // (workers * 4))))
+
+
+_service_lock = threading.Lock()
+
+
+def get_snapshot_service():
+    """현재 앱의 스냅샷 서비스 (없으면 생성)"""
+    service = current_app.extensions.get('report_snapshots')
+    if service is not None:
+        return service
+    with _service_lock:
+        service = current_app.extensions.get('report_snapshots')
+        if service is None:
+            config = current_app.config
+            root = config.get('SNAPSHOT_DIR') or os.path.join(current_app.instance_path, 'snapshots')
+            service = SnapshotService(
+                SnapshotStore(root),
+                template_version(current_app.template_folder, current_app.static_folder),
+                workers=config.get('SNAPSHOT_WORKERS', 2),
+                pdf=config.get('SNAPSHOT_PDF', False),
+            )
+            current_app.extensions['report_snapshots'] = service
+        return service
@@ -0,0 +1,57 @@
+"""
+환자 요약(patient_summaries) 관리 - 재계산 및 정합성 검사
+"""
+from app.db.database import Database
+from app.db.models import QUERIES
+
+class SummaryService:
+    """환자 요약 테이블 재계산 및 검증"""
+    
+    @staticmethod
+    def rebuild():
+        """
+        모든 환자의 요약을 reports에서 다시 계산
+        
+        트리거가 없던 기존 데이터베이스에 요약 테이블을 처음 채우거나,
+        verify()에서 불일치가 발견되었을 때 사용합니다.
+        
+        Returns:
+            int: 반영된 행 수
+        """
+        try:
+            with Database.connection() as connection:
+                with connection.cursor() as cursor:
+                    affected = cursor.execute(QUERIES['rebuild_patient_summaries'])
+                    connection.commit()
+                    return affected
+        except Exception as e:
+            print(f"Error in rebuild: {e}")
+            raise
+    
+    @staticmethod
+    def refresh_patient(patient_id):
+        """
+        환자 한 명의 요약 재계산
+        
+        Args:
+            patient_id: 환자 ID
+        """
+        try:
+            Database.execute_query(QUERIES['refresh_patient_summary'], (patient_id,))
+        except Exception as e:
+            print(f"Error in refresh_patient: {e}")
+            raise
+    
+    @staticmethod
+    def verify():
+        """
+        요약 테이블과 실제 reports 집계 비교
+        
+        Returns:
+            list: 불일치 행 리스트 (정상이면 빈 리스트)
+        """
+        try:
+            return Database.fetch_all(QUERIES['verify_patient_summaries']) or []
+        except Exception as e:
+            print(f"Error in verify: {e}")
+            raise
@@ -0,0 +1,89 @@
+"""
+환자 성장 추이 서비스 - 환자별로 계산 결과를 캐시하고 새 검사만 반영
+"""
+import threading
+
+from flask import current_app
+
+from app.db.database import Database
+from app.db.models import QUERIES
+from app.services.cache import MemoryCache
+from app.services.trends import PatientTrend
+
+_cache_lock = threading.Lock()
+
+
+def get_trend_cache():
+    """현재 앱의 성장 추이 캐시 (patient_id → PatientTrend, 없으면 생성)"""
+    cache = current_app.extensions.get('patient_trends')
+    if cache is not None:
+        return cache
+    with _cache_lock:
+        cache = current_app.extensions.get('patient_trends')
+        if cache is None:
+            config = current_app.config
+            cache = MemoryCache(max_entries=config.get('TREND_CACHE_MAX_ENTRIES', 4096),
+                                ttl=config.get('TREND_CACHE_TTL', 3600))
+            current_app.extensions['patient_trends'] = cache
+        return cache
+
+
+class TrendService:
+    """키 성장 속도, 골연령 진행 속도, 예측 키 변화"""
+
+    @staticmethod
+    def get_patient_trends(patient_id):
+        """
+        환자의 전체 검사 이력으로 성장 추이 계산
+
+        캐시된 결과가 있으면 가벼운 확인 쿼리(get_patient_trend_version)로 바뀐 점을 찾아
+        새로 추가된 검사만 반영합니다. 기존 검사가 수정/삭제되었거나 이전 날짜의 검사가
+        추가된 경우에만 전체를 다시 계산합니다.
+
+        Args:
+            patient_id: 환자 ID
+
+        Returns:
+            dict: 성장 추이 (검사가 없으면 None)
+        """
+        try:
+            cache = get_trend_cache()
+            trend = cache.get(patient_id)
+            if trend is None:
+                return TrendService._rebuild(cache, patient_id)
+
+            with trend.lock:
+                version = Database.fetch_one(QUERIES['get_patient_trend_version'],
+                                             (trend.last_report_id, patient_id))
+                if not version or not version['exams']:
+                    cache.delete(patient_id)
+                    return None
+
+                unchanged = version['cached_updated_at'] == trend.updated_at
+                if unchanged and version['exams'] == trend.exams \
+                        and version['last_report_id'] == trend.last_report_id:
+                    return trend.to_dict()
+
+                if unchanged:
+                    rows = Database.fetch_all(QUERIES['get_patient_trend_rows'],
+                                              (patient_id, trend.last_report_id)) or []
+                    if trend.exams + len(rows) == version['exams'] and trend.can_append(rows):
+                        trend.append_rows(rows)
+                        cache.set(patient_id, trend)
+                        return trend.to_dict()
+
+            return TrendService._rebuild(cache, patient_id)
+
+        except Exception as e:
+            print(f"Error in get_patient_trends: {e}")
+            raise
+
+    @staticmethod
+    def _rebuild(cache, patient_id):
+        rows = Database.fetch_all(QUERIES['get_patient_trend_rows'], (patient_id, 0)) or []
+        if not rows:
+            cache.delete(patient_id)
+            return None
+        trend = PatientTrend.from_rows(patient_id, rows)
+        cache.set(patient_id, trend)
+        return trend.to_dict()
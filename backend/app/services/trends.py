@@ -0,0 +1,213 @@
+"""
+성장 추이 계산 - 환자의 검사 이력에서 키 성장 속도, 골연령 진행 속도, 예측 키 변화
+
+각 지표(키, 골연령, AI 예측 키)를 검사일(첫 검사로부터 경과 연수)에 대한 시계열로 보고
+
+    - 구간별 변화율: 값이 있는 연속된 두 검사 사이의 (값 차이 / 경과 연수)
+    - 전체 추세: 최소제곱 기울기 (단위/년)
+
+를 계산합니다. 처음에는 전체 이력을 NumPy로 한 번에 계산하고, 최소제곱에 필요한 합계와
+마지막 측정값을 보관해 두므로 새 검사가 추가되면 그 검사만으로 결과를 갱신합니다.
+"""
+import threading
+from datetime import date
+
+import numpy as np
+
+from app.utils import convert_korean_age_to_decimal
+
+DAYS_PER_YEAR = 365.25
+
+# 지표 이름 → (이력 행의 컬럼, 단위)
+TREND_SERIES = {
+    'height_velocity': ('current_height', 'cm/yr'),
+    'bone_age_rate': ('bone_age', 'yr/yr'),
+    'predicted_height_drift': ('predicted_height_ai', 'cm/yr'),
+}
+
+# 숫자가 아닌 형식으로 저장된 컬럼의 변환 (bone_age는 '13세 5개월' 같은 VARCHAR)
+_COLUMN_PARSERS = {
+    'bone_age': convert_korean_age_to_decimal,
+}
+
+
+def _float_or_nan(value):
+    if value is None:
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _series_value(row, column):
+    """이력 행의 지표 값 (없거나 변환할 수 없으면 NaN)"""
+    value = row.get(column)
+    parse = _COLUMN_PARSERS.get(column)
+    if parse is not None and value is not None:
+        value = parse(value)
+    return _float_or_nan(value)
+
+
+def _round(value, digits=3):
+    if value is None or not np.isfinite(value):
+        return None
+    return round(float(value), digits)
+
+
+def _as_date(value):
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value))
+
+
+class SeriesTrend:
+    """
+    지표 하나의 시계열 요약
+
+    최소제곱 기울기는 합계(n, Σt, Σy, Σt², Σty)만으로 계산되므로 값 하나를 추가할 때 O(1)로 갱신됩니다.
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.sum_t = 0.0
+        self.sum_y = 0.0
+        self.sum_tt = 0.0
+        self.sum_ty = 0.0
+        self.first = None      # (t, y, report_id)
+        self.last = None
+        self.intervals = []    # [(from_report_id, to_report_id, years, change)]
+
+    @classmethod
+    def from_arrays(cls, t, y, report_ids):
+        """값이 없는(NaN) 검사를 제외하고 전체 이력을 한 번에 계산"""
+        trend = cls()
+        valid = ~np.isnan(y)
+        if not valid.any():
+            return trend
+        t, y = t[valid], y[valid]
+        ids = np.asarray(report_ids)[valid]
+
+        trend.n = int(t.size)
+        trend.sum_t = float(t.sum())
+        trend.sum_y = float(y.sum())
+        trend.sum_tt = float(np.dot(t, t))
+        trend.sum_ty = float(np.dot(t, y))
+        trend.first = (float(t[0]), float(y[0]), int(ids[0]))
+        trend.last = (float(t[-1]), float(y[-1]), int(ids[-1]))
+        years = np.diff(t)
+        changes = np.diff(y)
+        trend.intervals = list(zip(ids[:-1].tolist(), ids[1:].tolist(), years.tolist(), changes.tolist()))
+        return trend
+
+    def append(self, t, y, report_id):
+        """검사 하나 추가 (마지막 검사보다 뒤의 검사여야 함)"""
+        if np.isnan(y):
+            return
+        if self.last is not None:
+            self.intervals.append((self.last[2], report_id, t - self.last[0], y - self.last[1]))
+        else:
+            self.first = (t, y, report_id)
+        self.last = (t, y, report_id)
+        self.n += 1
+        self.sum_t += t
+        self.sum_y += y
+        self.sum_tt += t * t
+        self.sum_ty += t * y
+
+    def slope(self):
+        """전체 검사의 최소제곱 기울기 (검사가 2회 미만이거나 같은 날이면 None)"""
+        if self.n < 2:
+            return None
+        denominator = self.n * self.sum_tt - self.sum_t ** 2
+        if denominator <= 1e-12:
+            return None
+        return (self.n * self.sum_ty - self.sum_t * self.sum_y) / denominator
+
+    def to_dict(self, unit):
+        intervals = []
+        for from_id, to_id, years, change in self.intervals:
+            intervals.append({
+                'from_report_id': from_id,
+                'to_report_id': to_id,
+                'years': _round(years),
+                'change': _round(change, 2),
+                # 같은 날 검사는 변화율을 계산하지 않음
+                'rate': _round(change / years) if years > 0 else None,
+            })
+        latest = next((item['rate'] for item in reversed(intervals) if item['rate'] is not None), None)
+        return {
+            'unit': unit,
+            'measurements': self.n,
+            'overall': _round(self.slope()),
+            'latest': latest,
+            'total_change': _round(self.last[1] - self.first[1], 2) if self.n >= 2 else None,
+            'intervals': intervals,
+        }
+
+
+class PatientTrend:
+    """
+    환자 한 명의 성장 추이
+
+    version(검사 수, 마지막 보고서 ID, 내용이 마지막으로 바뀐 시각)으로 캐시된 결과가 최신인지 확인합니다.
+    """
+
+    def __init__(self, patient_id, origin):
+        self.patient_id = patient_id
+        self.origin = origin            # 첫 검사일 (t = 0)
+        self.exams = 0
+        self.last_report_id = 0
+        self.last_exam_date = None
+        self.updated_at = None
+        self.series = {name: SeriesTrend() for name in TREND_SERIES}
+        self.lock = threading.Lock()
+
+    def _years(self, exam_dates):
+        return np.array([(_as_date(d) - self.origin).days for d in exam_dates], dtype=float) / DAYS_PER_YEAR
+
+    @classmethod
+    def from_rows(cls, patient_id, rows):
+        """
+        검사 이력 전체로 계산
+
+        Args:
+            rows: 검사일, 보고서 ID 순으로 정렬된 get_patient_trend_rows 결과 (1건 이상)
+        """
+        trend = cls(patient_id, _as_date(rows[0]['exam_date']))
+        t = trend._years([row['exam_date'] for row in rows])
+        report_ids = [row['report_id'] for row in rows]
+        for name, (column, _) in TREND_SERIES.items():
+            y = np.array([_series_value(row, column) for row in rows], dtype=float)
+            trend.series[name] = SeriesTrend.from_arrays(t, y, report_ids)
+        trend._advance(rows)
+        return trend
+
+    def can_append(self, rows):
+        """새 검사들이 모두 마지막 검사 이후인지 (아니면 전체를 다시 계산해야 함)"""
+        return bool(rows) and _as_date(rows[0]['exam_date']) >= self.last_exam_date
+
+    def append_rows(self, rows):
+        """마지막 검사 이후의 새 검사 추가 (can_append가 True일 때만)"""
+        t = self._years([row['exam_date'] for row in rows])
+        for i, row in enumerate(rows):
+            for name, (column, _) in TREND_SERIES.items():
+                self.series[name].append(float(t[i]), _series_value(row, column), row['report_id'])
+        self._advance(rows)
+
+    def _advance(self, rows):
+        self.exams += len(rows)
+        self.last_report_id = max(self.last_report_id, max(row['report_id'] for row in rows))
+        self.last_exam_date = _as_date(rows[-1]['exam_date'])
+        stamps = [row['updated_at'] for row in rows if row.get('updated_at') is not None]
+        if stamps and (self.updated_at is None or max(stamps) > self.updated_at):
+            self.updated_at = max(stamps)
+
+    def to_dict(self):
+        return {
+            'patient_id': self.patient_id,
+            'exams': self.exams,
+            'first_exam_date': str(self.origin),
+            'last_exam_date': str(self.last_exam_date),
+            **{name: self.series[name].to_dict(unit) for name, (_, unit) in TREND_SERIES.items()},
+        }
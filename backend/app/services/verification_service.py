@@ -0,0 +1,195 @@
+"""
+보고서 열람 본인 확인 - (환자 코드, 생년월일) 검증과 실패 횟수 제한
+
+보고서 페이지(/)는 전체 보고서를 불러오기 전에 여기서 먼저 생년월일을 확인합니다.
+    1. 실패 횟수 제한: 환자 코드별로 일정 시간(window) 안에 max_failures번 틀리면 잠금 (DB 조회 없음)
+    2. 검증: 환자 코드 → 생년월일 캐시, 없으면 patient_code 고유 인덱스로 생년월일만 조회 (주 서버)
+
+잘못되었거나 추측한 생년월일은 1~2단계만 거치므로 전체 보고서 조인과 직렬화를 실행하지 않습니다.
+실패 기록과 캐시는 프로세스마다 따로 유지되므로, 워커가 여러 개면 실제 허용 횟수는 워커 수만큼 늘어납니다.
+"""
+import hmac
+import threading
+import time
+from collections import OrderedDict, deque
+
+from flask import current_app
+
+from app.db.database import Database
+from app.db.models import QUERIES
+from app.services.cache import MemoryCache
+
+# 검증 결과
+VERIFIED = 'verified'
+MISMATCH = 'mismatch'
+LOCKED = 'locked'
+
+# 없는 환자 코드도 캐시해 반복 조회를 막음 (MemoryCache는 None을 '없음'으로 취급)
+_UNKNOWN = ''
+
+
+class FailureLimiter:
+    """
+    키별 실패 횟수 제한 (슬라이딩 윈도)
+
+    - window(초) 안의 실패가 max_failures번 이상이면 가장 오래된 실패가 window를 벗어날 때까지 잠금
+    - 기록하는 키는 max_keys개까지 (잠기지 않은 키를 가장 오래 사용되지 않은 것부터 제거)
+      잠긴 키는 잠금이 풀릴 때까지 제거하지 않으므로, 잠긴 키가 많으면 잠시 max_keys를 넘을 수 있음
+    """
+
+    def __init__(self, max_failures=5, window=300, max_keys=10000):
+        self.max_failures = max_failures
+        self.window = window
+        self.max_keys = max_keys
+        self._failures = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _recent(self, key, now):
+        failures = self._failures.get(key)
+        if failures is None:
+            return None
+        while failures and failures[0] <= now - self.window:
+            failures.popleft()
+        if not failures:
+            del self._failures[key]
+            return None
+        return failures
+
+    def _locked(self, failures):
+        return self.max_failures > 0 and len(failures) >= self.max_failures
+
+    def _evict(self, keep, now):
+        # 앞쪽(오래 사용되지 않은 쪽)부터 확인, 잠긴 키는 뒤로 보내고 방금 기록한 키는 남김
+        for _ in range(len(self._failures)):
+            if len(self._failures) <= self.max_keys:
+                return
+            key = next(iter(self._failures))
+            if key == keep:
+                return
+            failures = self._recent(key, now)
+            if failures is None:
+                continue
+            if self._locked(failures):
+                self._failures.move_to_end(key)
+            else:
+                del self._failures[key]
+
+    def retry_after(self, key):
+        """잠겨 있으면 다시 시도할 수 있을 때까지 남은 초, 아니면 0"""
+        if self.max_failures <= 0:
+            return 0
+        now = time.monotonic()
+        with self._lock:
+            failures = self._recent(key, now)
+            if failures is None or not self._locked(failures):
+                return 0
+            return max(1, int(failures[-self.max_failures] + self.window - now + 0.999))
+
+    def record_failure(self, key):
+        now = time.monotonic()
+        with self._lock:
+            failures = self._recent(key, now)
+            if failures is None:
+                failures = self._failures[key] = deque(maxlen=max(self.max_failures, 1))
+            failures.append(now)
+            self._failures.move_to_end(key)
+            if len(self._failures) > self.max_keys:
+                self._evict(key, now)
+
+    def reset(self, key):
+        with self._lock:
+            self._failures.pop(key, None)
+
+    def locked_keys(self):
+        now = time.monotonic()
+        with self._lock:
+            return sum(1 for key in list(self._failures)
+                       if (failures := self._recent(key, now)) is not None
+                       and self._locked(failures))
+
+
+class PatientVerifier:
+    """환자 코드 + 생년월일 확인"""
+
+    def __init__(self, cache, limiter):
+        self.cache = cache
+        self.limiter = limiter
+        self._lock = threading.Lock()
+        self._stats = {'verified': 0, 'mismatches': 0, 'locked': 0, 'lookups': 0}
+
+    def _count(self, key):
+        with self._lock:
+            self._stats[key] += 1
+
+    def _birth_date(self, patient_code):
+        birth_date = self.cache.get(patient_code)
+        if birth_date is not None:
+            return birth_date
+        self._count('lookups')
+        # 결과(없는 환자 포함)를 캐시하고 실패 횟수에도 반영하므로 복제 지연 없이 주 서버에서 확인
+        with Database.primary_reads():
+            row = Database.fetch_one(QUERIES['get_patient_birth_date'], (patient_code,))
+        birth_date = str(row['birth_date']) if row and row.get('birth_date') else _UNKNOWN
+        self.cache.set(patient_code, birth_date)
+        return birth_date
+
+    def verify(self, patient_code, birth_date):
+        """
+        Args:
+            patient_code: 환자 코드
+            birth_date: 입력한 생년월일 ('YYYY-MM-DD')
+
+        Returns:
+            tuple: (VERIFIED | MISMATCH | LOCKED, 잠금 해제까지 남은 초)
+        """
+        retry_after = self.limiter.retry_after(patient_code)
+        if retry_after:
+            self._count('locked')
+            return LOCKED, retry_after
+
+        expected = self._birth_date(patient_code)
+        # 없는 환자 코드와 틀린 생년월일을 구분하지 않고, 비교 시간으로 생년월일을 추측할 수 없도록 비교
+        if expected and hmac.compare_digest(expected.encode('utf-8'), birth_date.encode('utf-8')):
+            self.limiter.reset(patient_code)
+            self._count('verified')
+            return VERIFIED, 0
+
+        self.limiter.record_failure(patient_code)
+        self._count('mismatches')
+        return MISMATCH, 0
+
+    def forget(self, patient_code):
+        """환자 정보가 바뀌었을 때 캐시된 생년월일 제거"""
+        self.cache.delete(patient_code)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats['locked_codes'] = self.limiter.locked_keys()
+        stats['max_failures'] = self.limiter.max_failures
+        stats['failure_window'] = self.limiter.window
+        stats['cache'] = self.cache.stats()
+        return stats
+
+
+_verifier_lock = threading.Lock()
+
+
+def get_patient_verifier():
+    """현재 앱의 본인 확인 서비스 (없으면 생성)"""
+    verifier = current_app.extensions.get('patient_verifier')
+    if verifier is not None:
+        return verifier
+    with _verifier_lock:
+        verifier = current_app.extensions.get('patient_verifier')
+        if verifier is None:
+            config = current_app.config
+            max_entries = config.get('VERIFY_CACHE_MAX_ENTRIES', 10000)
+            verifier = PatientVerifier(
+                MemoryCache(max_entries=max_entries, ttl=config.get('VERIFY_CACHE_TTL', 300)),
+                FailureLimiter(max_failures=config.get('VERIFY_MAX_FAILURES', 5),
+                               window=config.get('VERIFY_FAILURE_WINDOW', 300),
+                               max_keys=max_entries),
+            )
+            current_app.extensions['patient_verifier'] = verifier
+        return verifier
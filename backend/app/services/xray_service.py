@@ -0,0 +1,277 @@
+"""
+X-ray 이미지 제공 - 썸네일/표시용 축소본 생성과 디스크 캐시
+
+원본은 xray_analysis.image_path가 가리키는 파일이며, 축소본은 처음 요청될 때 워커 스레드에서 만들어
+XRAY_CACHE_DIR에 저장합니다. 요청 스레드는 생성을 기다리지 않고, 만들어지기 전에는 원본을 제공합니다. 캐시는 전체 크기가 XRAY_CACHE_MAX_BYTES를 넘으면
+가장 오래 사용하지 않은 파일부터 지웁니다.
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from flask import current_app
+
+from app.db.database import Database
+from app.db.models import QUERIES
+
+# 크기 이름 → 긴 변의 최대 픽셀 (original은 원본 그대로)
+XRAY_SIZES = {
+    'thumb': 256,
+    'display': 1024,
+    'original': None,
+}
+
+# 축소본 형식 (Accept에 image/webp가 있으면 webp)
+DERIVATIVE_FORMATS = {
+    'webp': ('WEBP', 'image/webp', {'quality': 85, 'method': 4}),
+    'jpeg': ('JPEG', 'image/jpeg', {'quality': 85, 'optimize': True}),
+}
+
+_TMP_SUFFIX = '.tmp'
+# 생성에 실패한 축소본 이름을 기억하는 개수 (이름에 원본 mtime/크기가 들어가므로 원본을 고치면 다시 생성)
+_FAILED_LIMIT = 4096
+
+
+class DerivativeCache:
+    """
+    크기 제한이 있는 디스크 LRU 캐시
+
+    파일의 atime을 마지막 사용 시각으로 사용하므로(적중 시 갱신) 재시작 후에도 순서가 유지됩니다.
+    mtime은 ETag에 쓰이므로 건드리지 않습니다.
+    """
+
+    def __init__(self, root, max_bytes):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # name -> size (오래된 것부터)
+        self._total = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(root, exist_ok=True)
+        self._scan()
+
+    def _scan(self):
+        files = []
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            if name.endswith(_TMP_SUFFIX):
+                # 쓰다가 중단된 파일
+                os.remove(path)
+                continue
+            stat = os.stat(path)
+            files.append((stat.st_atime, name, stat.st_size))
+        for _, name, size in sorted(files):
+            self._entries[name] = size
+            self._total += size
+        self._evict()
+
+    def path(self, name):
+        return os.path.join(self.root, name)
+
+    def get(self, name):
+        """캐시된 파일 경로 (없으면 None)"""
+        with self._lock:
+            if name not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(name)
+            self.hits += 1
+        path = self.path(name)
+        try:
+            stat = os.stat(path)
+            os.utime(path, ns=(time.time_ns(), stat.st_mtime_ns))
+        except FileNotFoundError:
+            # 다른 프로세스가 지운 경우
+            with self._lock:
+                size = self._entries.pop(name, None)
+                if size is not None:
+                    self._total -= size
+            return None
+        return path
+
+    def put(self, name, data):
+        """파일을 원자적으로 저장하고 경로 반환"""
+        path = self.path(name)
+        tmp = f'{path}.{threading.get_ident()}{_TMP_SUFFIX}'
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+        with self._lock:
+            previous = self._entries.pop(name, None)
+            if previous is not None:
+                self._total -= previous
+            self._entries[name] = len(data)
+            self._total += len(data)
+            self._evict()
+        return path
+
+    def _evict(self):
+        while self._total > self.max_bytes and len(self._entries) > 1:
+            name, size = self._entries.popitem(last=False)
+            self._total -= size
+            self.evictions += 1
+            try:
+                os.remove(self.path(name))
+            except FileNotFoundError:
+                pass
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._total,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+
+def render_derivative(source_path, max_side, fmt):
+    """원본을 긴 변 max_side 이하로 줄여 인코딩 (워커 스레드에서 실행)"""
+    from PIL import Image
+
+    pil_format, _, options = DERIVATIVE_FORMATS[fmt]
+    with Image.open(source_path) as image:
+        # JPEG는 축소 디코딩을 지원하므로 필요한 만큼만 읽음
+        image.draft('L' if image.mode == 'L' else 'RGB', (max_side, max_side))
+        if image.mode in ('I', 'I;16', 'I;16B'):
+            # 16비트 흑백 영상은 8비트 흑백으로 변환 (RGB로 바꾸면 밝은 값이 잘림)
+            image = image.point(lambda value: value * (1 / 256)).convert('L')
+        image.thumbnail((max_side, max_side), Image.LANCZOS)
+        if image.mode not in ('L', 'RGB'):
+            image = image.convert('RGB')
+        buffer = BytesIO()
+        image.save(buffer, format=pil_format, **options)
+    return buffer.getvalue()
+
+
+class XrayImageService:
+    """보고서 ID → X-ray 원본/축소본 파일"""
+
+    def __init__(self, image_root, static_root, cache, workers=2):
+        """
+        Args:
+            image_root: image_path(상대 경로)의 기준 폴더
+            static_root: '/static/...' 형식 image_path의 기준 폴더
+            cache: DerivativeCache
+            workers: 축소본 생성 스레드 수
+        """
+        self.image_root = os.path.realpath(image_root)
+        self.static_root = os.path.realpath(static_root)
+        self.cache = cache
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='xray-resize')
+        self._pending = {}
+        self._failed = OrderedDict()
+        self._pending_lock = threading.Lock()
+        try:
+            import PIL  # noqa: F401
+            self.resize_available = True
+        except ImportError:
+            self.resize_available = False
+
+    def resolve_source(self, image_path):
+        """
+        image_path → 실제 파일 경로 (허용된 폴더 밖이거나 없으면 None)
+
+        '/static/image/x-ray.png' 처럼 /static/ 으로 시작하면 정적 파일 폴더,
+        그 외 상대 경로는 XRAY_IMAGE_ROOT 기준입니다.
+        """
+        if not image_path or '://' in image_path:
+            return None
+        if image_path.startswith('/static/'):
+            root, relative = self.static_root, image_path[len('/static/'):]
+        else:
+            root, relative = self.image_root, image_path.lstrip('/')
+        path = os.path.realpath(os.path.join(root, relative))
+        if os.path.commonpath([root, path]) != root or not os.path.isfile(path):
+            return None
+        return path
+
+    def get_source(self, report_id):
+        """보고서의 X-ray 원본 경로 (보고서/이미지가 없으면 None)"""
+        row = Database.fetch_one(QUERIES['get_xray_image'], (report_id,))
+        if not row:
+            return None
+        return self.resolve_source(row.get('image_path'))
+
+    def _key(self, source_path, size, fmt):
+        stat = os.stat(source_path)
+        # 원본이 바뀌면(mtime/크기) 다른 키가 되어 새로 생성됨
+        digest = hashlib.sha256(
+            f'{source_path}:{stat.st_mtime_ns}:{stat.st_size}:{size}'.encode('utf-8')
+        ).hexdigest()[:32]
+        return f'{digest}.{size}.{fmt}'
+
+    def get_derivative(self, source_path, size, fmt):
+        """
+        축소본 파일 경로
+
+        캐시에 없으면 워커 풀에 생성을 맡기고 기다리지 않습니다. 같은 축소본은 한 번만 만들고,
+        생성에 실패한 축소본은 원본이 바뀌기 전까지 다시 시도하지 않습니다.
+
+        Returns:
+            str: 축소본 경로 (Pillow가 없거나 아직 만들어지지 않았으면 None → 원본 제공)
+        """
+        if not self.resize_available:
+            return None
+        name = self._key(source_path, size, fmt)
+        cached = self.cache.get(name)
+        if cached:
+            return cached
+
+        with self._pending_lock:
+            if name not in self._pending and name not in self._failed:
+                # 생성이 끝나면 다음 요청부터 캐시에서 제공됨
+                self._pending[name] = self._executor.submit(
+                    self._build, name, source_path, XRAY_SIZES[size], fmt
+                )
+        return None
+
+    def _build(self, name, source_path, max_side, fmt):
+        try:
+            return self.cache.put(name, render_derivative(source_path, max_side, fmt))
+        except Exception as e:
+            # 원본을 읽을 수 없는 형식 등은 계속 원본을 제공
+            print(f"X-ray derivative error ({source_path}): {e}")
+            with self._pending_lock:
+                self._failed[name] = True
+                while len(self._failed) > _FAILED_LIMIT:
+                    self._failed.popitem(last=False)
+            return None
+        finally:
+            with self._pending_lock:
+                self._pending.pop(name, None)
+
+    def stats(self):
+        return {**self.cache.stats(), 'resize_available': self.resize_available,
+                'pending': len(self._pending), 'failed': len(self._failed)}
+
+
+_service_lock = threading.Lock()
+
+
+def get_xray_service():
+    """현재 앱의 X-ray 이미지 서비스 (없으면 생성)"""
+    service = current_app.extensions.get('xray_images')
+    if service is not None:
+        return service
+    with _service_lock:
+        service = current_app.extensions.get('xray_images')
+        if service is None:
+            config = current_app.config
+            cache_dir = config.get('XRAY_CACHE_DIR') or os.path.join(current_app.instance_path, 'xray_cache')
+            service = XrayImageService(
+                image_root=config.get('XRAY_IMAGE_ROOT') or current_app.static_folder,
+                static_root=current_app.static_folder,
+                cache=DerivativeCache(cache_dir, config.get('XRAY_CACHE_MAX_BYTES', 512 * 1024 * 1024)),
+                workers=config.get('XRAY_RESIZE_WORKERS', 2),
+            )
+            current_app.extensions['xray_images'] = service
+        return service
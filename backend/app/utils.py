@@ -1,8 +1,22 @@
 """
 유틸리티 함수 모음
 """
+import base64
+import json
+import re
 from datetime import datetime
 
+# 검사 이력이 없는 환자의 정렬용 날짜 (SQL의 COALESCE 값과 동일해야 함)
+NO_EXAM_SORT_DATE = '1000-01-01'
+
+# 성별 코드 → 한글 (convert_gender_to_korean)
+GENDER_KOREAN = {
+    'M': '남자',
+    'F': '여자',
+    'm': '남자',
+    'f': '여자'
+}
+
 def calculate_age_months(birth_date):
     """
     생년월일로부터 현재 나이를 월 단위로 계산
@@ -155,11 +169,69 @@ def convert_gender_to_korean(gender):
     if gender is None:
         return None
     
-    gender_map = {
-        'M': '남자',
-        'F': '여자',
-        'm': '남자',
-        'f': '여자'
-    }
+    return GENDER_KOREAN.get(gender, gender)
+
+def encode_patient_cursor(latest_exam_date, patient_id):
+    """
+    환자 목록 커서 생성 (마지막 행의 정렬 키를 불투명한 문자열로 인코딩)
+    
+    Args:
+        latest_exam_date: 최근 검사일 (date, 문자열 또는 None)
+        patient_id: 환자 ID
+    
+    Returns:
+        str: URL-safe base64 커서
+    """
+    sort_date = str(latest_exam_date) if latest_exam_date else NO_EXAM_SORT_DATE
+    raw = json.dumps([sort_date, int(patient_id)], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+def decode_patient_cursor(cursor):
+    """
+    환자 목록 커서 해석
+    
+    Args:
+        cursor: encode_patient_cursor()로 만든 문자열
+    
+    Returns:
+        tuple: (정렬 날짜 'YYYY-MM-DD', 환자 ID)
+    
+    Raises:
+        ValueError: 형식이 잘못된 커서
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        sort_date, patient_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        datetime.strptime(sort_date, '%Y-%m-%d')
+        return sort_date, int(patient_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f'Invalid cursor: {cursor}') from e
+
+def convert_korean_age_to_decimal(age_text):
+    """
+    "n세 n개월" 형식의 나이를 소수점 나이로 변환 (convert_decimal_age_to_korean의 역변환)
+    
+    예: "11세 9개월" → 11.75
+    예: "2세" → 2.0
     
-    return gender_map.get(gender, gender)
+    Args:
+        age_text: "n세 n개월" 문자열 또는 숫자
+        
+    Returns:
+        float: 소수점 나이, 또는 None
+    """
+    if age_text is None:
+        return None
+    if isinstance(age_text, (int, float)):
+        return float(age_text)
+    
+    text = str(age_text).strip()
+    match = re.match(r'^(\d+)\s*[세년]\s*(?:(\d+)\s*개월)?$', text)
+    if match:
+        years = int(match.group(1))
+        months = int(match.group(2) or 0)
+        return years + months / 12
+    try:
+        return float(text)
+    except ValueError:
+        return None
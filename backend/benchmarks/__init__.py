@@ -0,0 +1,3 @@
+"""
+보고서 API 벤치마크 - 합성 데이터 시드, HTTP 부하 테스트, 결과 비교
+"""
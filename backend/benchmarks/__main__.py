@@ -0,0 +1,122 @@
+"""
+벤치마크 실행 - backend 폴더에서 `python -m benchmarks <명령>`
+
+    python -m benchmarks seed --patients 100000 --reports 5 --database bone_report_bench --reset
+    python -m benchmarks run --base-url http://localhost:5000 --patients 100000 --concurrency 16
+    python -m benchmarks compare benchmarks/results/a.json benchmarks/results/b.json
+    python -m benchmarks serialize --rows 5000
+"""
+import os
+from datetime import datetime
+
+import click
+
+from benchmarks.compare import compare_results, format_comparison, load_results
+from benchmarks.loadtest import SCENARIOS, run_benchmark, write_results
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'results')
+
+# 비교 결과가 의미 있으려면 같아야 하는 실행 조건
+COMPARABLE_KEYS = ('patients', 'seed', 'concurrency', 'requests', 'duration')
+
+
+@click.group()
+def cli():
+    """보고서 API 벤치마크"""
+
+
+@cli.command('seed')
+@click.option('--patients', type=int, default=100000, show_default=True, help='환자 수')
+@click.option('--reports', 'reports_per_patient', type=int, default=5, show_default=True,
+              help='환자당 평균 보고서 수')
+@click.option('--seed', 'seed_value', type=int, default=42, show_default=True, help='난수 seed')
+@click.option('--database', default=None, help='적재할 DB 이름 (기본: MYSQL_DB)')
+@click.option('--chunk-size', type=int, default=1000, show_default=True, help='커밋 단위 환자 수')
+@click.option('--reset', is_flag=True, help='기존 데이터를 지우고 적재')
+def seed_command(patients, reports_per_patient, seed_value, database, chunk_size, reset):
+    """합성 환자/보고서를 DB에 적재 (setup.sql로 스키마를 먼저 만들어 두세요)"""
+    from app.config.settings import get_config
+    from benchmarks.seed import connect, seed
+
+    connection = connect(get_config(), database)
+    try:
+        if reset:
+            from benchmarks.seed import reset as reset_tables
+            reset_tables(connection)
+        result = seed(
+            connection, patients, reports_per_patient, seed_value, chunk_size,
+            progress=lambda done, total: click.echo(f'\r  {done}/{total} patients', nl=False),
+        )
+    finally:
+        connection.close()
+    click.echo()
+    for table, count in result['rows'].items():
+        click.echo(f'  {table}: {count} rows')
+    click.echo(f"Seeded in {result['seconds']}s")
+
+
+@cli.command('run')
+@click.option('--base-url', default='http://localhost:5000', show_default=True, help='서버 주소')
+@click.option('--scenario', 'scenarios', type=click.Choice(SCENARIOS), multiple=True,
+              help='실행할 시나리오 (여러 번 지정 가능, 기본: 전체)')
+@click.option('--patients', type=int, default=100000, show_default=True, help='시드한 환자 수')
+@click.option('--seed', 'seed_value', type=int, default=42, show_default=True, help='시드에 사용한 seed')
+@click.option('--concurrency', type=int, default=16, show_default=True, help='동시 연결 수')
+@click.option('--requests', type=int, default=2000, show_default=True, help='시나리오별 측정 요청 수')
+@click.option('--duration', type=float, default=None, help='시나리오별 측정 시간 (초, 지정 시 우선)')
+@click.option('--warmup', type=int, default=200, show_default=True, help='측정 전 버리는 요청 수')
+@click.option('--output', default=None, help='결과 JSON 경로 (기본: benchmarks/results/<시각>-<커밋>.json)')
+def run_command(base_url, scenarios, patients, seed_value, concurrency, requests, duration, warmup, output):
+    """엔드포인트별 처리량과 지연 시간 측정"""
+    def report(scenario, stats):
+        latency = stats['latency_ms']
+        click.echo(f"{scenario:<15} {stats['throughput_rps']:>9.1f} req/s  "
+                   f"p50 {latency['p50']}ms  p95 {latency['p95']}ms  p99 {latency['p99']}ms  "
+                   f"errors {stats['errors']}  non-2xx {stats['non_2xx']}")
+
+    results = run_benchmark(
+        base_url, scenarios or SCENARIOS, patients, seed_value, concurrency,
+        requests=None if duration else requests, duration=duration, warmup=warmup, progress=report,
+    )
+    if output is None:
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        output = os.path.join(RESULTS_DIR, f"{stamp}-{results['meta']['commit'] or 'nogit'}.json")
+    write_results(results, output)
+    click.echo(f'Results written to {output}')
+
+
+@cli.command('compare')
+@click.argument('baseline', type=click.Path(exists=True, dir_okay=False))
+@click.argument('current', type=click.Path(exists=True, dir_okay=False))
+@click.option('--threshold', type=float, default=10.0, show_default=True,
+              help='이 비율(%) 이상 나빠지면 회귀로 표시')
+def compare_command(baseline, current, threshold):
+    """두 결과 JSON 비교 (회귀가 있으면 종료 코드 1)"""
+    baseline = load_results(baseline)
+    current = load_results(current)
+    for key in COMPARABLE_KEYS:
+        if baseline['meta'].get(key) != current['meta'].get(key):
+            click.echo(f"warning: {key} differs ({baseline['meta'].get(key)} vs "
+                       f"{current['meta'].get(key)}), results may not be comparable")
+
+    rows = compare_results(baseline, current, threshold)
+    click.echo(format_comparison(rows, baseline['meta'], current['meta']))
+    regressions = [row for row in rows if row['regression']]
+    if regressions:
+        click.echo(f'{len(regressions)} regression(s) over {threshold}%')
+        raise SystemExit(1)
+    click.echo('No regressions')
+
+
+@cli.command('serialize')
+@click.option('--rows', type=int, default=5000, show_default=True, help='행 수')
+@click.option('--repeat', type=int, default=20, show_default=True, help='반복 횟수 (가장 빠른 값 사용)')
+def serialize_command(rows, repeat):
+    """스키마 변환 + JSON 인코딩 마이크로벤치마크 (DB/서버 불필요)"""
+    from benchmarks.serialization import format_results, run_serialization_benchmark
+
+    click.echo(format_results(run_serialization_benchmark(rows, repeat), rows))
+
+
+if __name__ == '__main__':
+    cli()
@@ -0,0 +1,83 @@
+"""
+벤치마크 결과 비교 - 기준 실행 대비 지연 시간 증가/처리량 감소를 회귀로 표시
+"""
+import json
+
+# 비교하는 지표와 "나빠지는" 방향 (+1: 커지면 나쁨, -1: 작아지면 나쁨)
+COMPARED_METRICS = (
+    ('throughput_rps', -1),
+    ('p50', +1),
+    ('p95', +1),
+    ('p99', +1),
+)
+
+
+def load_results(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _value(stats, metric):
+    if metric in stats:
+        return stats[metric]
+    return stats.get('latency_ms', {}).get(metric)
+
+
+def compare_results(baseline, current, threshold=10.0):
+    """
+    시나리오별 지표 변화율 계산
+
+    Args:
+        baseline, current: run_benchmark() 결과
+        threshold: 이 비율(%) 이상 나빠지면 회귀로 표시
+
+    Returns:
+        list: [{'scenario', 'metric', 'baseline', 'current', 'change_pct', 'regression'}]
+    """
+    rows = []
+    for scenario, base_stats in baseline.get('scenarios', {}).items():
+        stats = current.get('scenarios', {}).get(scenario)
+        if stats is None:
+            continue
+        for metric, worse in COMPARED_METRICS:
+            before = _value(base_stats, metric)
+            after = _value(stats, metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before * 100.0
+            rows.append({
+                'scenario': scenario,
+                'metric': metric,
+                'baseline': before,
+                'current': after,
+                'change_pct': round(change, 1),
+                'regression': change * worse >= threshold,
+            })
+        # 기준 실행보다 실패가 늘었으면 지연 시간과 관계없이 회귀
+        failures_before = base_stats.get('errors', 0) + base_stats.get('non_2xx', 0)
+        failures_after = stats.get('errors', 0) + stats.get('non_2xx', 0)
+        if failures_after > failures_before:
+            rows.append({
+                'scenario': scenario,
+                'metric': 'failures',
+                'baseline': failures_before,
+                'current': failures_after,
+                'change_pct': None,
+                'regression': True,
+            })
+    return rows
+
+
+def format_comparison(rows, baseline_meta=None, current_meta=None):
+    """터미널 출력용 표"""
+    lines = []
+    if baseline_meta and current_meta:
+        lines.append(f"baseline {baseline_meta.get('commit')} ({baseline_meta.get('started_at')})"
+                     f" → current {current_meta.get('commit')} ({current_meta.get('started_at')})")
+    lines.append(f"{'scenario':<15} {'metric':<15} {'baseline':>12} {'current':>12} {'change':>9}")
+    for row in rows:
+        change = f"{row['change_pct']:+.1f}%" if row['change_pct'] is not None else ''
+        flag = '  REGRESSION' if row['regression'] else ''
+        lines.append(f"{row['scenario']:<15} {row['metric']:<15} {row['baseline']:>12} "
+                     f"{row['current']:>12} {change:>9}{flag}")
+    return '\n'.join(lines)
@@ -0,0 +1,233 @@
+"""
+HTTP 부하 테스트 - 엔드포인트별 처리량과 p50/p95/p99 지연 시간 측정
+
+실행 중인 서버(Flask 또는 ASGI)에 동시 요청을 보냅니다. 요청 대상(환자 코드, ID, 검색어)은
+population.py에서 seed로 결정되므로 같은 설정이면 어느 커밋에서나 같은 요청 순서가 재현됩니다.
+"""
+import http.client
+import json
+import os
+import platform
+import random
+import subprocess
+import threading
+import time
+from datetime import datetime
+from urllib.parse import quote, urlsplit
+
+from benchmarks.population import patient_code, search_keywords, synthetic_patient
+
+SCENARIOS = ('report', 'history', 'patients_page', 'search', 'report_page')
+
+
+def _report_path(rng, patients, seed):
+    return f'/api/reports/patient/{patient_code(rng.randint(1, patients))}'
+
+
+def _history_path(rng, patients, seed):
+    return f'/api/reports/patient/{rng.randint(1, patients)}/history'
+
+
+def _patients_page_path(rng, patients, seed):
+    # 앞쪽 페이지가 많이 조회되는 실제 사용 패턴을 흉내 냄 (가끔 깊은 페이지)
+    pages = max(patients // 20, 1)
+    page = rng.randint(1, min(pages, 10)) if rng.random() < 0.9 else rng.randint(1, pages)
+    return f'/api/reports/patients?page={page}&per_page=20'
+
+
+def _report_page_path(rng, patients, seed):
+    patient = synthetic_patient(rng.randint(1, patients), seed, 0)['patient']
+    birth = patient[4].strftime('%Y%m%d')
+    return f'/?patient_code={patient[1]}&birth_date={birth}'
+
+
+def build_paths(scenario, patients, seed=42, count=1000):
+    """시나리오의 요청 경로 목록 (seed가 같으면 항상 같은 목록)"""
+    rng = random.Random(f'{scenario}:{seed}')
+    if scenario == 'search':
+        keywords = search_keywords(patients, seed)
+        return [f'/api/reports/patients/search?keyword={quote(rng.choice(keywords))}'
+                for _ in range(count)]
+    make = {
+        'report': _report_path,
+        'history': _history_path,
+        'patients_page': _patients_page_path,
+        'report_page': _report_page_path,
+    }[scenario]
+    return [make(rng, patients, seed) for _ in range(count)]
+
+
+def percentile(sorted_values, p):
+    """정렬된 값의 p 백분위 (nearest-rank)"""
+    if not sorted_values:
+        return None
+    rank = max(int(round(p / 100.0 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+class _Worker(threading.Thread):
+    """연결 하나를 유지하며(keep-alive) 공유 목록의 경로를 차례로 요청"""
+
+    def __init__(self, base_url, paths, cursor, deadline, timeout):
+        super().__init__(daemon=True)
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme
+        self.netloc = parts.netloc
+        self.paths = paths
+        self.cursor = cursor
+        self.deadline = deadline
+        self.timeout = timeout
+        self.latencies = []
+        self.statuses = {}
+        self.errors = 0
+        self._connection = None
+
+    def _connect(self):
+        cls = http.client.HTTPSConnection if self.scheme == 'https' else http.client.HTTPConnection
+        self._connection = cls(self.netloc, timeout=self.timeout)
+
+    def run(self):
+        self._connect()
+        while True:
+            index = self.cursor.next()
+            if index is None or (self.deadline and time.perf_counter() >= self.deadline):
+                break
+            path = self.paths[index % len(self.paths)]
+            started = time.perf_counter()
+            try:
+                self._connection.request('GET', path)
+                response = self._connection.getresponse()
+                response.read()
+                status = response.status
+            except (OSError, http.client.HTTPException):
+                self.errors += 1
+                self._connection.close()
+                self._connect()
+                continue
+            self.latencies.append(time.perf_counter() - started)
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+        self._connection.close()
+
+
+class _SharedCursor:
+    """워커들이 나눠 가지는 요청 번호 (total에 도달하면 None)"""
+
+    def __init__(self, total):
+        self.total = total
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def next(self):
+        with self._lock:
+            if self.total is not None and self._next >= self.total:
+                return None
+            value = self._next
+            self._next += 1
+            return value
+
+
+def run_scenario(base_url, paths, concurrency, requests=None, duration=None, warmup=0, timeout=30):
+    """
+    경로 목록을 concurrency개의 연결로 요청하고 통계 반환
+
+    Args:
+        requests: 측정할 총 요청 수 (duration과 함께 지정하면 먼저 도달한 쪽에서 종료)
+        duration: 측정 시간 (초)
+        warmup: 측정 전에 보내고 버릴 요청 수
+    """
+    if warmup:
+        _run_workers(base_url, paths, concurrency, warmup, None, timeout)
+
+    started = time.perf_counter()
+    workers = _run_workers(base_url, paths, concurrency, requests, duration, timeout)
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for worker in workers for latency in worker.latencies)
+    statuses = {}
+    for worker in workers:
+        for status, count in worker.statuses.items():
+            statuses[str(status)] = statuses.get(str(status), 0) + count
+    completed = len(latencies)
+    errors = sum(worker.errors for worker in workers)
+    non_2xx = sum(count for status, count in statuses.items() if not status.startswith('2'))
+
+    def ms(value):
+        return round(value * 1000, 3) if value is not None else None
+
+    return {
+        'requests': completed,
+        'errors': errors,
+        'non_2xx': non_2xx,
+        'status_counts': statuses,
+        'seconds': round(elapsed, 3),
+        'throughput_rps': round(completed / elapsed, 2) if elapsed else 0.0,
+        'latency_ms': {
+            'mean': ms(sum(latencies) / completed) if completed else None,
+            'p50': ms(percentile(latencies, 50)),
+            'p95': ms(percentile(latencies, 95)),
+            'p99': ms(percentile(latencies, 99)),
+            'max': ms(latencies[-1]) if latencies else None,
+        },
+    }
+
+
+def _run_workers(base_url, paths, concurrency, requests, duration, timeout):
+    if requests is None and duration is None:
+        raise ValueError('requests or duration is required')
+    cursor = _SharedCursor(requests)
+    deadline = time.perf_counter() + duration if duration else None
+    workers = [_Worker(base_url, paths, cursor, deadline, timeout) for _ in range(concurrency)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return workers
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(base_url, scenarios=SCENARIOS, patients=100000, seed=42, concurrency=16,
+                  requests=2000, duration=None, warmup=200, progress=None):
+    """
+    여러 시나리오를 차례로 실행
+
+    Returns:
+        dict: JSON으로 저장할 결과 (meta + 시나리오별 통계)
+    """
+    results = {
+        'meta': {
+            'commit': _git_commit(),
+            'started_at': datetime.now().isoformat(timespec='seconds'),
+            'base_url': base_url,
+            'patients': patients,
+            'seed': seed,
+            'concurrency': concurrency,
+            'requests': requests,
+            'duration': duration,
+            'warmup': warmup,
+            'python': platform.python_version(),
+            'host': platform.node(),
+            'cpu_count': os.cpu_count(),
+        },
+        'scenarios': {},
+    }
+    for scenario in scenarios:
+        paths = build_paths(scenario, patients, seed, count=max(requests or 0, warmup, 1000))
+        stats = run_scenario(base_url, paths, concurrency, requests, duration, warmup)
+        results['scenarios'][scenario] = stats
+        if progress:
+            progress(scenario, stats)
+    return results
+
+
+def write_results(results, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,98 @@
+"""
+합성 환자 데이터 생성 - 같은 seed면 항상 같은 환자/보고서가 만들어집니다.
+
+시드 적재(seed.py)와 부하 테스트(loadtest.py)가 같은 함수를 사용하므로
+부하 테스트는 DB를 조회하지 않고도 존재하는 환자 코드, 생년월일, ID를 알 수 있습니다.
+"""
+import random
+from datetime import date, timedelta
+
+SURNAMES = '김이박최정강조윤장임한오서신권황안송류홍'
+GIVEN_SYLLABLES = '민서지준현우예도윤하은수연채영시주아건유진성원재혜'
+DOCTORS = ['김영희', '박민수', '이순신', '정다은', '최현우']
+STATUSES = ['completed'] * 8 + ['in_progress', 'pending']
+
+# 기존 샘플 데이터(2024-001234 등)와 겹치지 않는 코드 형식
+CODE_PREFIX = 'BN'
+
+
+def patient_code(patient_id):
+    return f'{CODE_PREFIX}{patient_id:08d}'
+
+
+def _rng(seed, patient_id):
+    return random.Random(seed * 1_000_003 + patient_id)
+
+
+def _korean_age(months):
+    return f'{months // 12}세 {months % 12}개월'
+
+
+def synthetic_patient(patient_id, seed=42, reports_per_patient=5):
+    """
+    환자 한 명과 보고서 목록 생성
+
+    Returns:
+        dict: {'patient': (...), 'reports': [{'report': (...), 'bone_age': (...), ...}]}
+              각 튜플은 해당 테이블의 INSERT 컬럼 순서를 따름 (seed.TABLE_COLUMNS)
+    """
+    rng = _rng(seed, patient_id)
+    gender = rng.choice('MF')
+    name = rng.choice(SURNAMES) + ''.join(rng.choice(GIVEN_SYLLABLES) for _ in range(2))
+    birth = date(2008, 1, 1) + timedelta(days=rng.randrange(365 * 10))
+    patient = (patient_id, patient_code(patient_id), name, gender, birth)
+
+    # 보고서 수는 평균이 reports_per_patient가 되도록 ±2 범위에서 선택
+    count = max(0, reports_per_patient + rng.randint(-2, 2)) if reports_per_patient else 0
+    first_report_id = (patient_id - 1) * (reports_per_patient + 2) + 1
+    base_height = rng.uniform(120, 150)
+    father = round(rng.uniform(160, 185), 1)
+    mother = round(rng.uniform(150, 170), 1)
+    genetic = round((father + mother + (13 if gender == 'M' else -13)) / 2, 1)
+
+    reports = []
+    exam = birth + timedelta(days=365 * 6 + rng.randrange(365 * 3))
+    for n in range(count):
+        report_id = first_report_id + n
+        exam = exam + timedelta(days=120 + rng.randrange(240))
+        age_months = (exam - birth).days * 12 // 365
+        bone_months = age_months + rng.randint(-18, 24)
+        height = round(base_height + n * rng.uniform(2.0, 4.0), 1)
+        percentile = rng.randint(1, 99)
+        weight = round(height * rng.uniform(0.22, 0.32), 1)
+        bmi = round(weight / (height / 100) ** 2, 1)
+        reports.append({
+            'reports': (report_id, patient_id, exam, rng.choice(DOCTORS), rng.choice(STATUSES)),
+            'bone_ages': (report_id, _korean_age(age_months), _korean_age(bone_months),
+                          _korean_age(abs(bone_months - age_months)), height,
+                          round(genetic + rng.uniform(-4, 4), 1)),
+            'genetic_info': (report_id, father, mother, genetic),
+            'height_percentiles': (report_id, gender, percentile, f'상위 {100 - percentile}%',
+                                   '저신장' if percentile <= 5 else '고신장' if percentile > 95 else '정상'),
+            'weight_info': (report_id, weight, rng.randint(1, 99), bmi,
+                            '저체중' if bmi < 18.5 else '정상' if bmi < 25 else '과체중' if bmi < 30 else '비만'),
+            'xray_analysis': (report_id, f'/static/images/xray/{report_id}.png',
+                              '골연령 분석 완료', round(rng.uniform(0.80, 0.99), 2)),
+        })
+    return {'patient': patient, 'reports': reports}
+
+
+def search_keywords(patients, seed=42, count=200):
+    """검색 시나리오용 키워드 (코드 앞부분, 이름, 이름 일부, 초성이 섞이도록)"""
+    from app.services.search import to_choseong
+
+    rng = random.Random(seed)
+    keywords = []
+    for _ in range(count):
+        patient_id = rng.randint(1, patients)
+        name = synthetic_patient(patient_id, seed, 0)['patient'][2]
+        kind = rng.randrange(4)
+        if kind == 0:
+            keywords.append(patient_code(patient_id)[:-2])
+        elif kind == 1:
+            keywords.append(name)
+        elif kind == 2:
+            keywords.append(name[1:])
+        else:
+            keywords.append(to_choseong(name))
+    return keywords
@@ -0,0 +1,96 @@
+"""
+벤치마크용 DB 시드 - 합성 환자/보고서를 7개 테이블에 적재
+
+setup.sql로 스키마(트리거 포함)를 만든 MySQL 호환 DB에 적재합니다.
+운영 데이터와 섞이지 않도록 별도 DB(예: bone_report_bench)를 사용하세요.
+"""
+import time
+
+import pymysql
+
+from benchmarks.population import synthetic_patient
+
+TABLE_COLUMNS = {
+    'patients': ('id', 'patient_code', 'name', 'gender', 'birth_date'),
+    'reports': ('id', 'patient_id', 'exam_date', 'requested_doctor', 'status'),
+    'bone_ages': ('report_id', 'chronological_age', 'bone_age', 'age_difference',
+                  'current_height', 'predicted_height_ai'),
+    'genetic_info': ('report_id', 'father_height', 'mother_height', 'predicted_height_genetic'),
+    'height_percentiles': ('report_id', 'gender', 'percentile', 'percentile_rank', 'assessment'),
+    'weight_info': ('report_id', 'weight', 'percentile', 'bmi', 'bmi_category'),
+    'xray_analysis': ('report_id', 'image_path', 'analysis_result', 'confidence_score'),
+}
+
+# 적재 순서 (외래 키 순서) 및 초기화 대상
+SEED_TABLES = list(TABLE_COLUMNS)
+RESET_TABLES = SEED_TABLES + ['patient_summaries']
+
+
+def connect(config, database=None):
+    """설정 클래스(get_config())의 MYSQL_* 값으로 연결"""
+    return pymysql.connect(
+        host=config.MYSQL_HOST,
+        user=config.MYSQL_USER,
+        password=config.MYSQL_PASSWORD or '',
+        database=database or config.MYSQL_DB,
+        port=config.MYSQL_PORT,
+        charset='utf8mb4',
+        autocommit=False,
+    )
+
+
+def _insert_sql(table):
+    columns = TABLE_COLUMNS[table]
+    return (f"INSERT INTO {table} ({', '.join(columns)}) "
+            f"VALUES ({', '.join(['%s'] * len(columns))})")
+
+
+def reset(connection):
+    """시드 대상 테이블 비우기"""
+    with connection.cursor() as cursor:
+        cursor.execute('SET FOREIGN_KEY_CHECKS = 0')
+        for table in RESET_TABLES:
+            cursor.execute(f'TRUNCATE TABLE {table}')
+        cursor.execute('SET FOREIGN_KEY_CHECKS = 1')
+    connection.commit()
+
+
+def seed(connection, patients, reports_per_patient=5, seed_value=42, chunk_size=1000, progress=None):
+    """
+    환자 1..patients 와 보고서를 적재
+
+    chunk_size명씩 모아 테이블별 다중 행 INSERT(executemany)로 넣고 청크마다 커밋합니다.
+    patient_summaries는 트리거가 채웁니다.
+
+    Returns:
+        dict: 테이블별 적재 행 수와 소요 시간
+    """
+    counts = dict.fromkeys(SEED_TABLES, 0)
+    started = time.perf_counter()
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT COUNT(*) FROM patients')
+        if cursor.fetchone()[0]:
+            raise RuntimeError('patients is not empty; run with --reset to reseed')
+
+        for start in range(1, patients + 1, chunk_size):
+            rows = {table: [] for table in SEED_TABLES}
+            for patient_id in range(start, min(start + chunk_size, patients + 1)):
+                generated = synthetic_patient(patient_id, seed_value, reports_per_patient)
+                rows['patients'].append(generated['patient'])
+                for report in generated['reports']:
+                    for table in SEED_TABLES[1:]:
+                        rows[table].append(report[table])
+            for table in SEED_TABLES:
+                if rows[table]:
+                    # PyMySQL은 INSERT ... VALUES 의 executemany를 다중 행 INSERT로 묶어 보냄
+                    cursor.executemany(_insert_sql(table), rows[table])
+                    counts[table] += len(rows[table])
+            connection.commit()
+            if progress:
+                progress(min(start + chunk_size - 1, patients), patients)
+
+        # 적재 직후 통계를 갱신해 실행 계획이 매번 같도록 함
+        cursor.execute(f"ANALYZE TABLE {', '.join(RESET_TABLES)}")
+        cursor.fetchall()
+
+    return {'rows': counts, 'seconds': round(time.perf_counter() - started, 2)}
@@ -0,0 +1,182 @@
+"""
+직렬화 마이크로벤치마크 - 스키마 변환 + JSON 인코딩 (DB/HTTP 없이 CPU 시간만 측정)
+
+    baseline   dict 행 + 필드마다 row.get()을 호출하는 기존 스키마 함수 + Flask 기본 provider(json)
+    compiled   dict 행 + 컴파일된 스키마 + FastJSONProvider 인코더
+    tuples     튜플 행(Database.fetch_rows) + 컴파일된 스키마 + FastJSONProvider 인코더
+"""
+import json
+import random
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from flask.json.provider import DefaultJSONProvider
+
+from app.json_provider import dumps_bytes, orjson
+from app.schemas.report_schema import FULL_REPORT, PATIENT_LIST
+from app.utils import convert_decimal_age_to_korean, convert_gender_to_korean
+
+PATIENT_LIST_COLUMNS = ('id', 'patient_code', 'name', 'gender', 'birth_date', 'latest_exam_date', 'total_reports')
+FULL_REPORT_COLUMNS = (
+    'id', 'patient_code', 'name', 'gender', 'birth_date',
+    'report_id', 'exam_date', 'requested_doctor', 'status',
+    'chronological_age', 'bone_age', 'age_difference', 'current_height', 'predicted_height_ai',
+    'father_height', 'mother_height', 'predicted_height_genetic',
+    'percentile', 'percentile_rank', 'assessment',
+    'weight', 'weight_percentile', 'bmi', 'bmi_category', 'obesity_rate', 'obesity_grade',
+    'image_path', 'analysis_result', 'confidence_score',
+)
+
+
+# --- 컴파일 전 스키마 (비교 기준) ---
+
+def _legacy_patient_list(patient):
+    return {
+        'id': patient.get('id'),
+        'patient_code': patient.get('patient_code'),
+        'name': patient.get('name'),
+        'gender': convert_gender_to_korean(patient.get('gender')),
+        'birth_date': str(patient.get('birth_date')) if patient.get('birth_date') else None,
+        'latest_exam_date': str(patient.get('latest_exam_date')) if patient.get('latest_exam_date') else None,
+        'total_reports': patient.get('total_reports', 0),
+    }
+
+
+def _legacy_full_report(report):
+    has_image = report.get('image_path') and report.get('report_id')
+    return {
+        'patient': {
+            'id': report.get('id'),
+            'patient_code': report.get('patient_code'),
+            'name': report.get('name'),
+            'gender': convert_gender_to_korean(report.get('gender')),
+            'birth_date': str(report.get('birth_date')) if report.get('birth_date') else None,
+        },
+        'report': {
+            'report_id': report.get('report_id'),
+            'exam_date': str(report.get('exam_date')) if report.get('exam_date') else None,
+            'requested_doctor': report.get('requested_doctor'),
+            'status': report.get('status'),
+        },
+        'bone_age': {
+            'chronological_age': convert_decimal_age_to_korean(report.get('chronological_age')),
+            'bone_age': convert_decimal_age_to_korean(report.get('bone_age')),
+            'age_difference': convert_decimal_age_to_korean(report.get('age_difference')),
+            'current_height': report.get('current_height'),
+            'predicted_height_ai': report.get('predicted_height_ai'),
+        },
+        'genetic_info': {
+            'father_height': report.get('father_height'),
+            'mother_height': report.get('mother_height'),
+            'predicted_height_genetic': report.get('predicted_height_genetic'),
+        },
+        'height_percentile': {
+            'percentile': report.get('percentile'),
+            'percentile_rank': report.get('percentile_rank'),
+            'assessment': report.get('assessment'),
+            'gender': convert_gender_to_korean(report.get('gender')),
+        },
+        'weight_info': {
+            'weight': report.get('weight'),
+            'percentile': report.get('weight_percentile'),
+            'bmi': report.get('bmi'),
+            'bmi_category': report.get('bmi_category'),
+            'obesity_rate': report.get('obesity_rate'),
+            'obesity_grade': report.get('obesity_grade'),
+        },
+        'xray': {
+            'image_path': report.get('image_path'),
+            'image_url': f"/api/reports/report/{report['report_id']}/xray?size=display" if has_image else None,
+            'analysis_result': report.get('analysis_result'),
+            'confidence_score': report.get('confidence_score'),
+        },
+    }
+
+
+def _flask_default_dumps(obj):
+    """Flask 2.3 DefaultJSONProvider.response()와 같은 인코딩"""
+    return json.dumps(obj, default=DefaultJSONProvider.default, ensure_ascii=True, sort_keys=True).encode('utf-8')
+
+
+# --- 합성 데이터 ---
+
+def _money(rng, low, high):
+    return Decimal(f'{rng.uniform(low, high):.2f}')
+
+
+def make_rows(count, seed=42):
+    """DB에서 읽은 것과 같은 타입(date, Decimal)의 환자 목록/보고서 튜플 행"""
+    rng = random.Random(seed)
+    patients, reports = [], []
+    for i in range(1, count + 1):
+        birth = date(2008, 1, 1) + timedelta(days=rng.randrange(3650))
+        exam = date(2024, 1, 1) + timedelta(days=rng.randrange(365))
+        gender = rng.choice('MF')
+        age = Decimal(f'{(exam - birth).days / 365.25:.2f}')
+        patients.append((i, f'2024-{i:06d}', f'환자{i}', gender, birth, exam, rng.randint(1, 9)))
+        reports.append((
+            i, f'2024-{i:06d}', f'환자{i}', gender, birth,
+            i, exam, '김영희', 'completed',
+            age, age + _money(rng, -1, 1), _money(rng, -1, 1), _money(rng, 120, 170), _money(rng, 150, 190),
+            _money(rng, 160, 185), _money(rng, 150, 170), _money(rng, 150, 185),
+            rng.randint(1, 100), f'상위 {rng.randint(1, 99)}%', '정상',
+            _money(rng, 20, 70), rng.randint(1, 100), _money(rng, 14, 28), '정상', _money(rng, -10, 30), '정상',
+            f'xray/{i}.png', '분석 결과', Decimal('0.93'),
+        ))
+    return patients, reports
+
+
+def _measure(fn, repeat):
+    fn()  # 워밍업 (스키마 컴파일 포함)
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def run_serialization_benchmark(rows=5000, repeat=20, seed=42):
+    """
+    Returns:
+        dict: {케이스: {'baseline_ms', 'compiled_ms', 'tuples_ms', 'speedup'}}
+    """
+    patients, reports = make_rows(rows, seed)
+    cases = {
+        'patient_list': (PATIENT_LIST, PATIENT_LIST_COLUMNS, patients, _legacy_patient_list),
+        'full_report': (FULL_REPORT, FULL_REPORT_COLUMNS, reports, _legacy_full_report),
+    }
+    results = {}
+    for name, (schema, columns, tuple_rows, legacy) in cases.items():
+        dict_rows = [dict(zip(columns, row)) for row in tuple_rows]
+
+        def baseline():
+            return _flask_default_dumps({'success': True, 'data': [legacy(row) for row in dict_rows]})
+
+        def compiled():
+            return dumps_bytes({'success': True, 'data': [schema.dump(row) for row in dict_rows]})
+
+        def tuples():
+            return dumps_bytes({'success': True, 'data': schema.dump_rows(columns, tuple_rows)})
+
+        # 같은 응답인지 확인 (키 순서와 문자 이스케이프만 다름)
+        assert json.loads(baseline()) == json.loads(compiled()) == json.loads(tuples())
+
+        timings = {key: _measure(fn, repeat) * 1000 for key, fn in
+                   (('baseline_ms', baseline), ('compiled_ms', compiled), ('tuples_ms', tuples))}
+        results[name] = {
+            **{key: round(value, 2) for key, value in timings.items()},
+            'speedup': round(timings['baseline_ms'] / timings['tuples_ms'], 1),
+        }
+    return results
+
+
+def format_results(results, rows):
+    encoder = 'orjson' if orjson is not None else 'json (orjson 미설치)'
+    lines = [f'{rows} rows, encoder: {encoder} (best of N, ms)',
+             f"{'case':<14} {'baseline':>10} {'compiled':>10} {'tuples':>10} {'speedup':>8}"]
+    for name, stats in results.items():
+        lines.append(f"{name:<14} {stats['baseline_ms']:>10} {stats['compiled_ms']:>10} "
+                     f"{stats['tuples_ms']:>10} {stats['speedup']:>7}x")
+    return '\n'.join(lines)
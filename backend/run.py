@@ -1,5 +1,8 @@
 """
 Flask 서버 실행 파일
+
+FLASK_ENV=production이면 여러 워커 프로세스의 운영 서버(app/server.py)로,
+아니면 Flask 개발 서버(디버그, 자동 재시작)로 실행합니다.
 """
 import os
 from app import create_app
@@ -9,6 +12,11 @@ if __name__ == '__main__':
     os.environ.setdefault('FLASK_ENV', 'development')
     os.environ.setdefault('FLASK_APP', 'app.main')
     
+    if os.environ['FLASK_ENV'] == 'production':
+        from app.server import run
+        run()
+        raise SystemExit(0)
+    
     # Flask 앱 생성 및 실행
     app = create_app()
     
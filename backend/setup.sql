@@ -1,4 +1,6 @@
 -- 데이터베이스 생성
+-- 스키마는 app/db/schema.py의 MIGRATIONS가 기준이며 이 파일은 최신 버전과 같은 상태로 유지합니다.
+-- 기존 데이터베이스는 `flask db migrate`로 업그레이드하세요.
 CREATE DATABASE IF NOT EXISTS bone_report;
 USE bone_report;
 
@@ -12,7 +14,8 @@ CREATE TABLE IF NOT EXISTS patients (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     INDEX idx_patient_code (patient_code),
-    INDEX idx_name (name)
+    INDEX idx_name (name),
+    INDEX idx_updated_at (updated_at)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- 2. 검사 보고서 테이블
@@ -26,7 +29,8 @@ CREATE TABLE IF NOT EXISTS reports (
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     FOREIGN KEY (patient_id) REFERENCES patients(id) ON DELETE CASCADE,
     INDEX idx_patient_id (patient_id),
-    INDEX idx_exam_date (exam_date)
+    INDEX idx_exam_date (exam_date),
+    INDEX idx_patient_exam (patient_id, exam_date)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- 3. 골연령 정보 테이블
@@ -41,7 +45,8 @@ CREATE TABLE IF NOT EXISTS bone_ages (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     FOREIGN KEY (report_id) REFERENCES reports(id) ON DELETE CASCADE,
-    INDEX idx_report_id (report_id)
+    INDEX idx_report_id (report_id),
+    INDEX idx_report_history (report_id, chronological_age, bone_age, current_height, predicted_height_ai, updated_at)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- 4. 유전 정보 테이블
@@ -79,6 +84,8 @@ CREATE TABLE IF NOT EXISTS weight_info (
     percentile INT COMMENT '백분위 순위',
     bmi DECIMAL(5, 2) COMMENT '체질량 지수',
     bmi_category VARCHAR(50) COMMENT '저체중/정상/과체중/비만',
+    obesity_rate DECIMAL(5, 2) COMMENT '비만도 (%)',
+    obesity_grade VARCHAR(50) COMMENT '비만 등급 (예: 경도, 중등도)',
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     FOREIGN KEY (report_id) REFERENCES reports(id) ON DELETE CASCADE,
@@ -98,6 +105,79 @@ CREATE TABLE IF NOT EXISTS xray_analysis (
     INDEX idx_report_id (report_id)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
+-- 8. 환자 요약 테이블 (환자 목록/검색용, 아래 트리거로 자동 갱신)
+CREATE TABLE IF NOT EXISTS patient_summaries (
+    patient_id INT PRIMARY KEY,
+    latest_exam_date DATE NULL COMMENT '최근 검사 일자',
+    total_reports INT NOT NULL DEFAULT 0 COMMENT '검사 보고서 수',
+    latest_report_id INT NULL COMMENT '최신 보고서 ID',
+    sort_exam_date DATE AS (COALESCE(latest_exam_date, '1000-01-01')) STORED COMMENT '목록 정렬용 (검사 없음은 가장 뒤)',
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    FOREIGN KEY (patient_id) REFERENCES patients(id) ON DELETE CASCADE,
+    INDEX idx_list (sort_exam_date, patient_id, latest_exam_date, total_reports, latest_report_id),
+    INDEX idx_updated_at (updated_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- 환자 요약 자동 갱신 트리거
+-- 보고서가 바뀐 환자 한 명의 요약만 다시 계산하므로 비용은 그 환자의 보고서 수에 비례합니다.
+DELIMITER $$
+
+DROP TRIGGER IF EXISTS trg_patients_after_insert $$
+CREATE TRIGGER trg_patients_after_insert AFTER INSERT ON patients
+FOR EACH ROW
+BEGIN
+    INSERT IGNORE INTO patient_summaries (patient_id, total_reports) VALUES (NEW.id, 0);
+END $$
+
+DROP PROCEDURE IF EXISTS refresh_patient_summary $$
+CREATE PROCEDURE refresh_patient_summary(IN in_patient_id INT)
+BEGIN
+    INSERT INTO patient_summaries (patient_id, latest_exam_date, total_reports, latest_report_id)
+    SELECT
+        in_patient_id,
+        MAX(r.exam_date),
+        COUNT(r.id),
+        (SELECT r2.id FROM reports r2
+         WHERE r2.patient_id = in_patient_id
+         ORDER BY r2.exam_date DESC, r2.id DESC
+         LIMIT 1)
+    FROM reports r
+    WHERE r.patient_id = in_patient_id
+    ON DUPLICATE KEY UPDATE
+        latest_exam_date = VALUES(latest_exam_date),
+        total_reports = VALUES(total_reports),
+        latest_report_id = VALUES(latest_report_id);
+END $$
+
+DROP TRIGGER IF EXISTS trg_reports_after_insert $$
+CREATE TRIGGER trg_reports_after_insert AFTER INSERT ON reports
+FOR EACH ROW
+BEGIN
+    CALL refresh_patient_summary(NEW.patient_id);
+END $$
+
+DROP TRIGGER IF EXISTS trg_reports_after_update $$
+CREATE TRIGGER trg_reports_after_update AFTER UPDATE ON reports
+FOR EACH ROW
+BEGIN
+    IF NEW.patient_id <> OLD.patient_id THEN
+        CALL refresh_patient_summary(OLD.patient_id);
+    END IF;
+    IF NEW.patient_id <> OLD.patient_id OR NOT (NEW.exam_date <=> OLD.exam_date) THEN
+        CALL refresh_patient_summary(NEW.patient_id);
+    END IF;
+END $$
+
+DROP TRIGGER IF EXISTS trg_reports_after_delete $$
+CREATE TRIGGER trg_reports_after_delete AFTER DELETE ON reports
+FOR EACH ROW
+BEGIN
+    -- 환자 삭제로 인한 CASCADE 삭제에서는 트리거가 실행되지 않지만 요약 행도 함께 삭제됩니다.
+    CALL refresh_patient_summary(OLD.patient_id);
+END $$
+
+DELIMITER ;
+
 -- 샘플 데이터 삽입
 INSERT INTO patients (patient_code, name, gender, birth_date) VALUES
 ('2024-001234', '홍길동', 'M', '2012-05-15'),
@@ -0,0 +1,118 @@
+"""
+테스트 공통 fixture - MySQL 없이 읽기 전용 SQLite 스냅샷(DB_BACKEND=sqlite)으로 앱 실행
+
+스냅샷 파일은 schema.TABLES의 DDL과 setup.sql의 샘플 데이터로 만듭니다.
+테이블은 내보내기와 같은 table_ddl로 만들므로 `flask db export-sqlite`가 만드는 파일과 같은 형식입니다.
+"""
+import os
+import re
+import sqlite3
+
+import pytest
+
+from app import create_app
+from app.config.settings import Config
+from app.db.schema import TABLES
+from app.db.sqlite_export import table_ddl
+
+SETUP_SQL = os.path.join(os.path.dirname(__file__), '..', 'setup.sql')
+
+# 샘플 데이터의 생성/수정 시각 (ETag/Last-Modified가 실행할 때마다 바뀌지 않도록 고정)
+FIXED_TIMESTAMP = '2024-12-01 09:00:00'
+
+_COLUMN = re.compile(r'^\s*(\w+)\s+(INT|VARCHAR|TEXT|DATE|TIMESTAMP|ENUM|DECIMAL)\b(?:\s*\(\s*\d+\s*,\s*(\d+)\s*\))?(.*)$',
+                     re.IGNORECASE)
+_INDEX = re.compile(r'^\s*(UNIQUE\s+)?INDEX\s+(\w+)\s*\(([^)]*)\)', re.IGNORECASE)
+_INSERT = re.compile(r'^INSERT INTO \w+ \([^)]*\) VALUES\s.*?;$', re.MULTILINE | re.DOTALL)
+
+
+def _information_schema(ddl):
+    """CREATE TABLE 문 → (information_schema.COLUMNS 형식 행, {인덱스 이름: (unique, 컬럼 튜플)})"""
+    columns = []
+    indexes = {}
+    for line in ddl.splitlines():
+        index = _INDEX.match(line)
+        if index:
+            names = tuple(name.strip() for name in index.group(3).split(','))
+            indexes[index.group(2)] = (bool(index.group(1)), names)
+            continue
+        column = _COLUMN.match(line)
+        if not column or column.group(1).upper() in ('CREATE', 'FOREIGN', 'PRIMARY'):
+            continue
+        name, data_type, scale, rest = column.groups()
+        rest = rest.upper()
+        columns.append({
+            'COLUMN_NAME': name,
+            'DATA_TYPE': data_type.lower(),
+            'NUMERIC_SCALE': int(scale) if scale else None,
+            'IS_NULLABLE': 'NO' if 'NOT NULL' in rest or 'PRIMARY KEY' in rest else 'YES',
+        })
+        if 'PRIMARY KEY' in rest:
+            indexes['PRIMARY'] = (True, (name,))
+        elif 'UNIQUE' in rest:
+            indexes[name] = (True, (name,))
+    return columns, indexes
+
+
+def build_snapshot(path):
+    """setup.sql의 샘플 데이터로 SQLite 스냅샷 파일 생성"""
+    connection = sqlite3.connect(path)
+    for table, ddl in TABLES.items():
+        create_table, create_indexes = table_ddl(table, *_information_schema(ddl))
+        connection.execute(create_table)
+        for statement in create_indexes:
+            connection.execute(statement)
+
+    with open(SETUP_SQL, encoding='utf-8') as f:
+        for statement in _INSERT.findall(f.read()):
+            connection.execute(statement)
+    for table in TABLES:
+        connection.execute(f'UPDATE "{table}" SET updated_at = ?', (FIXED_TIMESTAMP,))
+        if table != 'patient_summaries':
+            connection.execute(f'UPDATE "{table}" SET created_at = ?', (FIXED_TIMESTAMP,))
+
+    # MySQL에서는 트리거(refresh_patient_summary)가 채우는 요약 테이블
+    connection.execute("""
+        INSERT INTO patient_summaries (patient_id, latest_exam_date, total_reports, latest_report_id,
+                                       sort_exam_date, updated_at)
+        SELECT p.id,
+               (SELECT MAX(exam_date) FROM reports WHERE patient_id = p.id),
+               (SELECT COUNT(*) FROM reports WHERE patient_id = p.id),
+               (SELECT id FROM reports WHERE patient_id = p.id ORDER BY exam_date DESC, id DESC LIMIT 1),
+               COALESCE((SELECT MAX(exam_date) FROM reports WHERE patient_id = p.id), '1000-01-01'),
+               ?
+        FROM patients p
+    """, (FIXED_TIMESTAMP,))
+    connection.commit()
+    connection.close()
+
+
+@pytest.fixture(scope='session')
+def snapshot_path(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('snapshot') / 'bone_report.sqlite3')
+    build_snapshot(path)
+    return path
+
+
+def create_test_app(snapshot_path, tmp_path):
+    """snapshot_path의 SQLite 스냅샷을 읽는 앱"""
+    config = type('SQLiteTestConfig', (Config,), {
+        'TESTING': True,
+        'DB_BACKEND': 'sqlite',
+        'SQLITE_PATH': snapshot_path,
+        # 스냅샷 생성 워커는 환경 변수로 자체 앱을 만들므로(spawn) 테스트에서는 끔
+        'SNAPSHOT_ENABLED': False,
+        'SNAPSHOT_DIR': str(tmp_path / 'snapshots'),
+        'MYSQL_REPLICAS': '',
+    })
+    return create_app(config)
+
+
+@pytest.fixture
+def app(snapshot_path, tmp_path):
+    return create_test_app(snapshot_path, tmp_path)
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
@@ -0,0 +1,58 @@
+"""
+정적 파일 빌드 (app/assets.py)와 서버 렌더링 조각의 srcset
+"""
+import pytest
+from jinja2 import Environment
+
+from app.assets import AssetManifest, build_assets
+from app.rendering import compile_fragment, report_field_src
+
+Image = pytest.importorskip('PIL.Image')
+
+FRAGMENT = '<img src="../static/image/chart.png" sizes="334px" alt="">' \
+           '<img src="../static/image/chart.png" alt="" data-field="xray.image_url">'
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    (tmp_path / 'image').mkdir()
+    Image.new('RGB', (1200, 900), color=(200, 200, 200)).save(tmp_path / 'image' / 'chart.png')
+    build_assets(str(tmp_path), widths=(480, 960))
+    return AssetManifest(str(tmp_path))
+
+
+def test_srcset_lists_resized_and_full_size_variants(manifest):
+    srcset = manifest.srcset('image/chart.png')
+
+    widths = [entry.rsplit(' ', 1)[1] for entry in srcset.split(', ')]
+    assert widths == ['480w', '960w', '1200w']
+    assert all(entry.startswith('/static/dist/image/chart.') for entry in srcset.split(', '))
+
+
+def test_prerendered_static_image_gets_srcset(manifest):
+    env = Environment()
+    env.globals.update(
+        url_for=lambda endpoint, filename: f'/static/{manifest.resolve(filename)}',
+        asset_srcset=lambda filename, fmt='webp': manifest.srcset(filename, fmt),
+        report_field_src=report_field_src,
+    )
+
+    html = env.from_string(compile_fragment(FRAGMENT)).render(report={'xray': {'image_url': '/xray/1.png'}})
+
+    static_img, field_img = html.split('><img')
+    assert f'srcset="{manifest.srcset("image/chart.png")}"' in static_img
+    assert 'sizes="334px"' in static_img
+    # 보고서 값으로 바뀌는 이미지에는 붙이지 않음
+    assert 'srcset' not in field_img
+    assert 'src="/xray/1.png"' in field_img
+
+
+def test_no_srcset_without_build():
+    env = Environment()
+    env.globals.update(url_for=lambda endpoint, filename: f'/static/{filename}',
+                       asset_srcset=lambda filename, fmt='webp': '')
+
+    html = env.from_string(compile_fragment(FRAGMENT.split('><img')[0] + '>')).render()
+
+    assert html == '<img src="/static/image/chart.png" sizes="334px" alt="">'
+
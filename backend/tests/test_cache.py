@@ -0,0 +1,23 @@
+"""
+보고서 캐시 (app/services/cache.py)
+"""
+import pytest
+
+from app.services.cache import RedisCache
+
+pytest.importorskip('redis')
+
+
+def test_unreachable_redis_is_a_miss():
+    # 열려 있지 않은 포트 - 모든 명령이 ConnectionError
+    cache = RedisCache('redis://127.0.0.1:1/0', ttl=60)
+
+    assert cache.get('P1@1:2024-12-01T09:00:00') is None
+    cache.set('P1@1:2024-12-01T09:00:00', {'patient': {'patient_code': 'P1'}})
+    cache.delete('P1@1:2024-12-01T09:00:00')
+    cache.clear()
+
+    stats = cache.stats()
+    assert stats['errors'] == 4
+    assert stats['misses'] == 1
+    assert stats['sets'] == 0
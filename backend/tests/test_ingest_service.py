@@ -0,0 +1,128 @@
+"""
+보고서 일괄 적재 (app/services/ingest_service.py) - Database의 쓰기 메서드를 메모리 저장소로 바꿔 실행
+"""
+from contextlib import contextmanager
+
+import pymysql
+import pytest
+
+from app.db.database import Database
+from app.db.models import QUERIES
+from app.services import ingest_service
+from app.services.ingest_service import IngestService
+
+
+class FakeDatabase:
+    """트랜잭션 단위로 반영되는 메모리 저장소 (xray.image_path가 'BOOM'인 행은 DataError)"""
+
+    def __init__(self):
+        self.patients = {'P1': {'id': 1, 'patient_code': 'P1', 'name': '홍길동', 'gender': 'M'}}
+        self.reports = []
+        self.sections = {}
+        self.commits = 0
+        self.rollbacks = 0
+
+    @contextmanager
+    def transaction(self):
+        staged = {'patients': {}, 'reports': [], 'sections': {}}
+        try:
+            yield staged
+        except BaseException:
+            self.rollbacks += 1
+            raise
+        self.patients.update(staged['patients'])
+        self.reports.extend(staged['reports'])
+        for table, rows in staged['sections'].items():
+            self.sections.setdefault(table, []).extend(rows)
+        self.commits += 1
+
+    def fetch_all(self, query, args=None, connection=None):
+        if query == QUERIES['get_inserted_reports']:
+            return [row for row in connection['reports'] if args[0] <= row['id'] <= args[1]]
+        patients = {**self.patients, **connection['patients']}
+        return [patients[code] for code in args if code in patients]
+
+    def execute_query(self, query, args=None, connection=None):
+        first_id = 100 + len(self.reports) + len(connection['reports'])
+        for offset in range(len(args) // 4):
+            patient_id, exam_date = args[offset * 4:offset * 4 + 2]
+            connection['reports'].append({'id': first_id + offset, 'patient_id': patient_id,
+                                          'exam_date': exam_date})
+        return first_id
+
+    def execute_many(self, query, args_list, connection=None):
+        if query == QUERIES['insert_patients']:
+            for code, name, gender, _ in args_list:
+                connection['patients'][code] = {'id': 1000 + len(connection['patients']),
+                                                'patient_code': code, 'name': name, 'gender': gender}
+            return len(args_list)
+        table = query.split()[2]
+        for row in args_list:
+            if table == 'xray_analysis' and row[1] == 'BOOM':
+                raise pymysql.err.DataError(1406, 'Data too long for column image_path')
+        connection['sections'].setdefault(table, []).extend(args_list)
+        return len(args_list)
+
+
+@pytest.fixture
+def fake_db(app, monkeypatch):
+    db = FakeDatabase()
+    for name in ('transaction', 'fetch_all', 'execute_query', 'execute_many'):
+        monkeypatch.setattr(Database, name, getattr(db, name))
+    with app.app_context():
+        yield db
+
+
+def _report(code='P1', image_path='/static/image/xray.png', **extra):
+    return {'patient_code': code, 'exam_date': '2024-11-20', 'status': 'completed',
+            'bone_age': {'bone_age': '13세 5개월'}, 'xray': {'image_path': image_path}, **extra}
+
+
+def test_chunk_is_committed_in_one_transaction(fake_db):
+    new_patient = {'name': '김철수', 'gender': 'M', 'birth_date': '2010-03-21'}
+    items = [_report(), _report('N1', patient=new_patient), _report()]
+
+    results = IngestService.ingest_reports(items, chunk_size=10)
+
+    assert [result['success'] for result in results] == [True, True, True]
+    assert [result['report_id'] for result in results] == [100, 101, 102]
+    assert fake_db.commits == 1
+    assert len(fake_db.sections['bone_ages']) == 3
+    assert 'N1' in fake_db.patients
+
+
+def test_failed_chunk_is_retried_row_by_row(fake_db):
+    items = [_report(), _report(image_path='BOOM'), _report()]
+
+    results = IngestService.ingest_reports(items, chunk_size=10)
+
+    assert [result['success'] for result in results] == [True, False, True]
+    assert 'Database error' in results[1]['message']
+    # 청크 전체(롤백) 후 성공한 두 건만 각각 커밋
+    assert fake_db.rollbacks == 2
+    assert fake_db.commits == 2
+    assert len(fake_db.reports) == 2
+
+
+def test_unknown_patient_and_invalid_input(fake_db):
+    results = IngestService.ingest_reports([_report('NOPE'), {'patient_code': 'P1'}, _report()])
+
+    assert [result['success'] for result in results] == [False, False, True]
+    assert 'not found' in results[0]['message']
+    assert results[1]['message'] == 'exam_date is required'
+    assert [result['index'] for result in results] == [0, 1, 2]
+
+
+@pytest.mark.parametrize('error', [OSError('cache unavailable'), pymysql.err.OperationalError(2013, 'lost')])
+def test_post_commit_errors_keep_committed_results(fake_db, monkeypatch, error):
+    def fail(patient_code):
+        raise error
+
+    monkeypatch.setattr(ingest_service.ReportService, 'invalidate_patient_report', fail)
+
+    results = IngestService.ingest_reports([_report(), _report()], chunk_size=10)
+
+    assert [result['success'] for result in results] == [True, True]
+    # 한 건씩 다시 적재하지 않음 (중복 보고서 없음)
+    assert fake_db.commits == 1
+    assert len(fake_db.reports) == 2
@@ -0,0 +1,59 @@
+"""
+스키마 마이그레이션 (app/db/schema.py) - 실행한 SQL을 기록하는 커서로 migrate 실행
+"""
+from contextlib import contextmanager
+
+from app.db import schema
+from app.db.database import Database
+from app.db.models import QUERIES
+
+
+class RecordingCursor:
+    def __init__(self, applied):
+        self.applied = applied
+        self.statements = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, args=None):
+        self.statements.append(sql)
+        return 0
+
+    def fetchone(self):
+        return {'locked': 1}
+
+    def fetchall(self):
+        return [{'version': version} for version in self.applied]
+
+
+class RecordingConnection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def cursor(self):
+        return self._cursor
+
+    def commit(self):
+        pass
+
+
+def test_summary_migration_backfills_existing_patients(monkeypatch):
+    cursor = RecordingCursor(applied={1})
+
+    @contextmanager
+    def connection():
+        yield RecordingConnection(cursor)
+
+    monkeypatch.setattr(Database, 'connection', connection)
+
+    applied = schema.migrate(target=2)
+
+    assert [migration.version for migration in applied] == [2]
+    statements = cursor.statements
+    backfill = statements.index(QUERIES['rebuild_patient_summaries'])
+    # 트리거를 만든 뒤에 채워야 그 사이에 들어온 보고서도 요약에 반영됨
+    assert backfill > max(i for i, sql in enumerate(statements) if 'CREATE TRIGGER' in sql)
@@ -0,0 +1,156 @@
+"""
+동시 요청 합치기 (app/services/single_flight.py) - 여러 스레드에서 같은 키로 do() 호출
+"""
+import threading
+import time
+
+import pytest
+
+from app.services.single_flight import SingleFlight
+
+THREADS = 8
+
+
+def _wait_for(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError('condition not reached')
+        time.sleep(0.001)
+
+
+def _start(flights, fn, count):
+    """count개 스레드에서 flights.do('key', fn) 실행, 스레드별 결과/예외를 results에 기록"""
+    results = [None] * count
+
+    def call(index):
+        try:
+            results[index] = ('ok', flights.do('key', fn))
+        except Exception as e:
+            results[index] = ('error', e)
+
+    threads = [threading.Thread(target=call, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+def _join(threads):
+    for thread in threads:
+        thread.join(timeout=5)
+        assert not thread.is_alive()
+
+
+def test_concurrent_calls_run_once():
+    flights = SingleFlight(timeout=5)
+    release = threading.Event()
+    runs = []
+
+    def load():
+        runs.append(1)
+        release.wait(5)
+        return {'report_id': 1}
+
+    threads, results = _start(flights, load, THREADS)
+    # 리더가 실행 중일 때 나머지가 모두 기다리기 시작한 뒤 결과를 돌려줌
+    _wait_for(lambda: flights.stats()['collapsed'] == THREADS - 1)
+    release.set()
+    _join(threads)
+
+    assert len(runs) == 1
+    assert all(result == ('ok', {'report_id': 1}) for result in results)
+    stats = flights.stats()
+    assert stats['calls'] == THREADS
+    assert stats['executions'] == 1
+    assert stats['collapsed'] == THREADS - 1
+    assert stats['retries'] == 0
+    assert stats['in_flight'] == 0
+
+
+def test_leader_error_is_retried_once_by_followers():
+    flights = SingleFlight(timeout=5)
+    first_release = threading.Event()
+    second_release = threading.Event()
+    runs = []
+
+    def load():
+        runs.append(1)
+        if len(runs) == 1:
+            first_release.wait(5)
+            raise ConnectionError('lost connection')
+        second_release.wait(5)
+        return 'report'
+
+    threads, results = _start(flights, load, THREADS)
+    _wait_for(lambda: flights.stats()['collapsed'] == THREADS - 1)
+    first_release.set()
+    # 팔로워 중 한 명만 다시 실행하고 나머지는 그 결과를 기다림
+    _wait_for(lambda: flights.stats()['collapsed'] == (THREADS - 1) + (THREADS - 2))
+    second_release.set()
+    _join(threads)
+
+    assert len(runs) == 2
+    errors = [result for result in results if result[0] == 'error']
+    assert len(errors) == 1 and isinstance(errors[0][1], ConnectionError)
+    assert results.count(('ok', 'report')) == THREADS - 1
+    stats = flights.stats()
+    assert stats['executions'] == 2
+    assert stats['errors'] == 1
+    assert stats['retries'] == THREADS - 1
+    assert stats['timeouts'] == 0
+
+
+def test_retry_failure_is_raised():
+    flights = SingleFlight(timeout=5)
+    release = threading.Event()
+
+    def load():
+        release.wait(5)
+        raise ConnectionError('database down')
+
+    threads, results = _start(flights, load, 2)
+    _wait_for(lambda: flights.stats()['collapsed'] == 1)
+    release.set()
+    _join(threads)
+
+    # 다시 실행해도 실패하면 더 반복하지 않고 예외 전달
+    assert [result[0] for result in results] == ['error', 'error']
+    assert flights.stats()['retries'] == 1
+
+
+def test_follower_timeout_runs_fn_itself():
+    flights = SingleFlight(timeout=0.05)
+    release = threading.Event()
+
+    def slow_load():
+        release.wait(5)
+        return 'leader'
+
+    threads, results = _start(flights, slow_load, 1)
+    _wait_for(lambda: flights.stats()['in_flight'] == 1)
+
+    # 멈춘 리더를 timeout까지만 기다리고 직접 실행
+    assert flights.do('key', lambda: 'follower') == 'follower'
+
+    release.set()
+    _join(threads)
+    assert results == [('ok', 'leader')]
+    stats = flights.stats()
+    assert stats['calls'] == 2
+    assert stats['collapsed'] == 1
+    assert stats['timeouts'] == 1
+    assert stats['executions'] == 2
+
+
+def test_different_keys_are_not_collapsed():
+    flights = SingleFlight()
+
+    assert flights.do('a', lambda: 1) == 1
+    assert flights.do('b', lambda: 2) == 2
+    with pytest.raises(ValueError):
+        flights.do('a', lambda: int('x'))
+
+    stats = flights.stats()
+    assert stats['executions'] == 3
+    assert stats['collapsed'] == 0
+    assert stats['in_flight'] == 0
@@ -0,0 +1,23 @@
+"""
+보고서 스냅샷 서비스 (app/services/snapshot_service.py)
+"""
+import threading
+
+from app.services.snapshot_service import SnapshotService, SnapshotStore
+
+
+def test_record_fallback_counts_concurrent_calls(tmp_path):
+    # workers=0이면 예약은 하지 않고 횟수만 기록
+    service = SnapshotService(SnapshotStore(str(tmp_path)), 'v1', workers=0)
+
+    def fallback():
+        for report_id in range(1000):
+            service.record_fallback(report_id)
+
+    threads = [threading.Thread(target=fallback) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert service.stats()['fallbacks'] == 8000
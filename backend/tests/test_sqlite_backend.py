@@ -0,0 +1,153 @@
+"""
+SQLite 스냅샷 백엔드로 API 라우트 실행 (tests/conftest.py의 setup.sql 샘플 데이터)
+"""
+import sqlite3
+
+import pytest
+
+from conftest import FIXED_TIMESTAMP, build_snapshot, create_test_app
+
+PATIENT_CODE = '2024-001234'
+
+
+def test_health(client):
+    response = client.get('/api/reports/health')
+
+    assert response.status_code == 200
+    assert response.get_json()['success'] is True
+
+
+def test_patient_report(client):
+    response = client.get(f'/api/reports/patient/{PATIENT_CODE}')
+
+    assert response.status_code == 200
+    data = response.get_json()['data']
+    assert data['patient']['patient_code'] == PATIENT_CODE
+    assert data['patient']['birth_date'] == '2012-05-15'
+    assert data['bone_age']['bone_age'] == '13세 5개월'
+    assert response.headers.get('ETag')
+
+
+def test_patient_report_not_modified(client):
+    etag = client.get(f'/api/reports/patient/{PATIENT_CODE}').headers['ETag']
+
+    response = client.get(f'/api/reports/patient/{PATIENT_CODE}', headers={'If-None-Match': etag})
+
+    assert response.status_code == 304
+
+
+def test_unknown_patient(client):
+    response = client.get('/api/reports/patient/UNKNOWN')
+
+    assert response.status_code == 404
+    assert response.get_json()['success'] is False
+
+
+def test_patient_reports_batch(client):
+    response = client.post('/api/reports/patients/batch', json={'patient_codes': [PATIENT_CODE, 'UNKNOWN']})
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert [item['success'] for item in body['data']] == [True, False]
+
+
+def test_patient_list(client):
+    response = client.get('/api/reports/patients')
+
+    assert response.status_code == 200
+    codes = [patient['patient_code'] for patient in response.get_json()['data']]
+    assert sorted(codes) == ['2024-001234', '2024-005678', '2024-009012', '2096361']
+
+
+def test_patient_search(client):
+    response = client.get('/api/reports/patients/search', query_string={'keyword': '홍길'})
+
+    assert response.status_code == 200
+    assert [patient['patient_code'] for patient in response.get_json()['data']] == [PATIENT_CODE]
+
+
+def test_patient_history_and_trends(client):
+    history = client.get('/api/reports/patient/1/history')
+    trends = client.get('/api/reports/patient/1/trends')
+
+    assert history.status_code == 200
+    assert [item['report_id'] for item in history.get_json()['data']] == [1]
+    assert trends.status_code == 200
+    assert trends.get_json()['data']['bone_age_rate']['measurements'] == 1
+
+
+@pytest.mark.parametrize('fmt', ['csv', 'ndjson'])
+def test_export(client, fmt):
+    response = client.get('/api/reports/export', query_string={'format': fmt})
+
+    assert response.status_code == 200
+    assert PATIENT_CODE in response.get_data(as_text=True)
+
+
+def test_report_page(client):
+    verified = client.get('/', query_string={'patient_code': PATIENT_CODE, 'birth_date': '20120515'})
+    wrong = client.get('/', query_string={'patient_code': PATIENT_CODE, 'birth_date': '20120516'})
+
+    assert verified.status_code == 200
+    assert '홍길동' in verified.get_data(as_text=True)
+    assert '홍길동' not in wrong.get_data(as_text=True)
+
+
+def test_metrics_with_sqlite_pool(client):
+    # 풀은 첫 조회에서 만들어지므로 조회 후 스크랩
+    client.get(f'/api/reports/patient/{PATIENT_CODE}')
+
+    response = client.get('/metrics')
+
+    assert response.status_code == 200
+    text = response.get_data(as_text=True)
+    assert 'db_pool_in_use 0' in text
+    assert 'db_pool_max_size' not in text
+    assert '# TYPE db_pool_checkouts_total counter' in text
+    assert '# TYPE db_pool_timeouts_total counter' in text
+    assert '# TYPE report_cache_misses_total counter' in text
+    assert 'report_cache_misses_total 1' in text
+    assert '# TYPE report_cache_entries gauge' in text
+
+
+def test_same_day_reports_use_one_latest_report(tmp_path):
+    # 같은 검사일의 보고서가 둘이면 ID가 큰 보고서가 최신 (patient_summaries.latest_report_id)
+    path = str(tmp_path / 'same_day.sqlite3')
+    build_snapshot(path)
+    connection = sqlite3.connect(path)
+    connection.execute("""
+        INSERT INTO reports (id, patient_id, exam_date, requested_doctor, status, created_at, updated_at)
+        VALUES (5, 3, '2024-10-15', '이순신', 'completed', ?, ?)
+    """, (FIXED_TIMESTAMP, FIXED_TIMESTAMP))
+    connection.execute("""
+        INSERT INTO bone_ages (report_id, bone_age, updated_at) VALUES (5, '14세 1개월', ?)
+    """, (FIXED_TIMESTAMP,))
+    connection.execute('UPDATE patient_summaries SET latest_report_id = 5, total_reports = 2 WHERE patient_id = 3')
+    connection.commit()
+    connection.close()
+    client = create_test_app(path, tmp_path).test_client()
+
+    response = client.get('/api/reports/patient/2024-005678')
+
+    data = response.get_json()['data']
+    assert data['report']['report_id'] == 5
+    assert data['bone_age']['bone_age'] == '14세 1개월'
+
+
+def test_changed_report_is_not_served_from_cache(tmp_path):
+    # 보고서 캐시 키가 버전(code@token)이므로 수정된 보고서는 TTL을 기다리지 않고 바로 반영
+    path = str(tmp_path / 'changed.sqlite3')
+    build_snapshot(path)
+    client = create_test_app(path, tmp_path).test_client()
+    page = {'patient_code': PATIENT_CODE, 'birth_date': '20120515'}
+    batch = {'patient_codes': [PATIENT_CODE]}
+    assert '13세 5개월' in client.get('/', query_string=page).get_data(as_text=True)
+    assert client.post('/api/reports/patients/batch', json=batch).get_json()['data'][0]['data']['bone_age']['bone_age'] == '13세 5개월'
+
+    connection = sqlite3.connect(path)
+    connection.execute("UPDATE bone_ages SET bone_age = '13세 7개월', updated_at = '2024-12-02 09:00:00' WHERE report_id = 1")
+    connection.commit()
+    connection.close()
+
+    assert '13세 7개월' in client.get('/', query_string=page).get_data(as_text=True)
+    assert client.post('/api/reports/patients/batch', json=batch).get_json()['data'][0]['data']['bone_age']['bone_age'] == '13세 7개월'
@@ -0,0 +1,51 @@
+"""
+성장 추이 계산 (app/services/trends.py) - setup.sql과 같은 형식의 이력 행으로 확인
+"""
+from datetime import date, datetime
+
+import pytest
+
+from app.services.trends import PatientTrend
+
+
+def _row(report_id, exam_date, bone_age, height, predicted):
+    # bone_ages.bone_age는 '13세 5개월' 형식의 VARCHAR, 키는 DECIMAL
+    return {
+        'report_id': report_id,
+        'exam_date': exam_date,
+        'bone_age': bone_age,
+        'current_height': height,
+        'predicted_height_ai': predicted,
+        'updated_at': datetime(2024, 1, 1),
+    }
+
+
+ROWS = [
+    _row(1, date(2022, 1, 1), '10세 0개월', 140.0, 170.0),
+    _row(2, date(2023, 1, 1), '11세 6개월', 146.0, 171.0),
+    _row(3, date(2024, 1, 1), '12세', 151.0, 171.5),
+]
+
+
+def test_bone_age_rate_parses_korean_age_text():
+    result = PatientTrend.from_rows(7, ROWS).to_dict()
+
+    bone_age = result['bone_age_rate']
+    assert bone_age['measurements'] == 3
+    assert len(bone_age['intervals']) == 2
+    assert bone_age['overall'] == pytest.approx(1.0, abs=0.01)
+
+
+def test_append_rows_parses_korean_age_text():
+    trend = PatientTrend.from_rows(7, ROWS[:2])
+    assert trend.can_append(ROWS[2:])
+    trend.append_rows(ROWS[2:])
+
+    assert trend.to_dict() == PatientTrend.from_rows(7, ROWS).to_dict()
+
+
+def test_unparseable_bone_age_is_skipped():
+    rows = [dict(ROWS[0]), dict(ROWS[1], bone_age='측정 불가'), dict(ROWS[2])]
+    bone_age = PatientTrend.from_rows(7, rows).to_dict()['bone_age_rate']
+
+    assert bone_age['measurements'] == 2
@@ -0,0 +1,83 @@
+"""
+보고서 열람 실패 횟수 제한 (app/services/verification_service.py)
+"""
+import pytest
+
+from app.services import verification_service
+from app.services.verification_service import FailureLimiter
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(verification_service, 'time', clock)
+    return clock
+
+
+def _fail(limiter, key, times):
+    for _ in range(times):
+        limiter.record_failure(key)
+
+
+def test_locks_after_max_failures_until_window_passes(clock):
+    limiter = FailureLimiter(max_failures=3, window=300)
+
+    _fail(limiter, 'P1', 2)
+    assert limiter.retry_after('P1') == 0
+
+    clock.now += 10
+    limiter.record_failure('P1')
+    # 가장 오래된 실패(1000초)가 window를 벗어날 때까지
+    assert limiter.retry_after('P1') == 290
+    assert limiter.locked_keys() == 1
+
+    clock.now += 290
+    assert limiter.retry_after('P1') == 0
+    assert limiter.locked_keys() == 0
+
+
+def test_reset_clears_failures(clock):
+    limiter = FailureLimiter(max_failures=2, window=300)
+    _fail(limiter, 'P1', 2)
+
+    limiter.reset('P1')
+
+    assert limiter.retry_after('P1') == 0
+
+
+def test_eviction_keeps_locked_keys(clock):
+    limiter = FailureLimiter(max_failures=2, window=300, max_keys=3)
+    _fail(limiter, 'locked', 2)
+    for key in ('a', 'b', 'c', 'd'):
+        limiter.record_failure(key)
+
+    # 가장 오래 사용되지 않은 키는 잠긴 'locked'지만 잠기지 않은 'a', 'b'가 대신 제거됨
+    assert limiter.retry_after('locked') > 0
+    assert set(limiter._failures) == {'c', 'd', 'locked'}
+
+
+def test_eviction_with_only_locked_keys_keeps_new_key(clock):
+    limiter = FailureLimiter(max_failures=2, window=300, max_keys=2)
+    _fail(limiter, 'L1', 2)
+    _fail(limiter, 'L2', 2)
+
+    _fail(limiter, 'new', 2)
+
+    # 잠긴 키를 밀어내지 않고 잠시 max_keys를 넘김 (새 키도 계속 제한)
+    assert limiter.retry_after('L1') > 0
+    assert limiter.retry_after('L2') > 0
+    assert limiter.retry_after('new') > 0
+
+    # 잠금이 풀린 뒤에는 다시 max_keys 이하로 줄어듦
+    clock.now += 300
+    limiter.record_failure('later')
+    assert len(limiter._failures) <= 2
+    assert 'later' in limiter._failures
@@ -0,0 +1,64 @@
+"""
+X-ray 축소본 생성 (app/services/xray_service.py)
+"""
+import pytest
+
+from app.services.xray_service import DerivativeCache, XrayImageService
+
+Image = pytest.importorskip('PIL.Image')
+
+
+@pytest.fixture
+def service(tmp_path):
+    image_root = tmp_path / 'images'
+    image_root.mkdir()
+    Image.new('L', (2048, 1536), color=128).save(image_root / 'xray.png')
+    cache = DerivativeCache(str(tmp_path / 'cache'), max_bytes=16 * 1024 * 1024)
+    return XrayImageService(str(image_root), str(image_root), cache, workers=1)
+
+
+def test_derivative_is_built_without_blocking(service):
+    source = service.resolve_source('xray.png')
+
+    # 첫 요청은 생성을 기다리지 않고 None (원본 제공)
+    assert service.get_derivative(source, 'thumb', 'jpeg') is None
+    for future in list(service._pending.values()):
+        future.result(timeout=10)
+
+    path = service.get_derivative(source, 'thumb', 'jpeg')
+    assert path is not None
+    with Image.open(path) as image:
+        assert max(image.size) == 256
+    assert service.stats()['pending'] == 0
+
+
+def test_unreadable_source_keeps_serving_original(service, tmp_path):
+    broken = tmp_path / 'images' / 'broken.png'
+    broken.write_bytes(b'not an image')
+    source = service.resolve_source('broken.png')
+
+    assert service.get_derivative(source, 'display', 'webp') is None
+    for future in list(service._pending.values()):
+        assert future.result(timeout=10) is None
+
+    # 실패한 축소본은 다시 생성하지 않음
+    assert service.get_derivative(source, 'display', 'webp') is None
+    assert service._pending == {}
+    assert service.stats()['failed'] == 1
+
+
+def test_fixed_source_is_rendered_again(service, tmp_path):
+    broken = tmp_path / 'images' / 'broken.png'
+    broken.write_bytes(b'not an image')
+    source = service.resolve_source('broken.png')
+    service.get_derivative(source, 'thumb', 'jpeg')
+    for future in list(service._pending.values()):
+        future.result(timeout=10)
+
+    # 원본을 고치면(크기/mtime 변경) 다른 이름이 되어 다시 생성
+    Image.new('L', (512, 512), color=64).save(broken, format='PNG')
+    assert service.get_derivative(source, 'thumb', 'jpeg') is None
+    for future in list(service._pending.values()):
+        future.result(timeout=10)
+
+    assert service.get_derivative(source, 'thumb', 'jpeg') is not None
@@ -125,20 +125,24 @@ function updateRankPointer(rankBars, bucket) {
 }
 
 window.addEventListener('DOMContentLoaded', async () => {
-  // 1️⃣ 모든 페이지 HTML 로드
-  await Promise.all([
-    loadHTML('#page-cover', 'page_cover.html'),
-    loadHTML('#page-summary', 'page_summary.html'),
-    loadHTML('#page-height', 'page_height.html'),
-    loadHTML('#page-weight', 'page_weight.html'),
-    loadHTML('#page-bodymass', 'page_bodymass.html'),
-    loadHTML('#page-expected-height', 'page_expected_height.html'),
-    loadHTML('#page-xray', 'page_xray.html')
-  ]);
+  // 1️⃣ 모든 페이지 HTML 로드 (서버에서 이미 조립된 경우 생략)
+  if (!window.REPORT_PRERENDERED) {
+    await Promise.all([
+      loadHTML('#page-cover', 'page_cover.html'),
+      loadHTML('#page-summary', 'page_summary.html'),
+      loadHTML('#page-height', 'page_height.html'),
+      loadHTML('#page-weight', 'page_weight.html'),
+      loadHTML('#page-bodymass', 'page_bodymass.html'),
+      loadHTML('#page-expected-height', 'page_expected_height.html'),
+      loadHTML('#page-xray', 'page_xray.html')
+    ]);
+  }
 
   // 서버에서 전달된 데이터로 로드된 조각들 채우기
   if (window.REPORT_DATA) {
-    populateReportFromData(window.REPORT_DATA);
+    if (!window.REPORT_PRERENDERED) {
+      populateReportFromData(window.REPORT_DATA);
+    }
     // BMI 지표 위치 업데이트
     positionBMIIndicator(window.REPORT_DATA);
     // 차트 모듈 동적 임포트 및 렌더링